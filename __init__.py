@@ -6,8 +6,16 @@ et les conversions entre devises.
 
 Classes principales:
 - Currency: Représente une devise
+- CurrencyRegistry: Registre ISO 4217 des devises (instance globale: registry)
 - Money: Représente une somme d'argent dans une devise
+- MoneyAccumulator: Totalise des montants par devise sans objet intermédiaire
+- MoneyArray: Tableau de montants en colonnes pour les traitements par lots
 - CurrencyConverter: Effectue les conversions entre devises
+- RateSnapshot: Version figée des taux d'un convertisseur
+- PairConverter: Conversion liée à une paire de devises (CurrencyConverter.pair)
+- check_rate_consistency: Contrôle de cohérence et d'arbitrage des taux
+- RateSnapshotFile: Fichier binaire de taux projeté en mémoire (write_rate_snapshot)
+- FloatConverter: Conversions approchées en float64 pour l'analyse
 - ExchangeRate: Représente un taux de change entre deux devises
 
 Exemple d'utilisation:
@@ -24,9 +32,13 @@ Exemple d'utilisation:
     print(f"{euros} = {dollars}")
 """
 
-from currency import Currency, EUR, USD, GBP, JPY, CHF, CAD, AUD
-from money import Money
-from currency_converter import CurrencyConverter, ExchangeRate
+from currency import Currency, CurrencyRegistry, registry, EUR, USD, GBP, JPY, CHF, CAD, AUD
+from money import Money, MoneyAccumulator
+from money_array import MoneyArray
+from currency_converter import CurrencyConverter, ExchangeRate, PairConverter, RateSnapshot
+from rate_consistency import ConsistencyReport, RateInconsistency, check_rate_consistency
+from rate_snapshot import RateSnapshotFile, write_rate_snapshot
+from float_converter import FloatConverter
 
 __version__ = "1.0.0"
 __author__ = "Currency Converter"
@@ -35,11 +47,23 @@ __email__ = "contact@example.com"
 __all__ = [
     # Classes principales
     "Currency",
+    "CurrencyRegistry",
     "Money", 
+    "MoneyAccumulator",
+    "MoneyArray",
     "CurrencyConverter",
     "ExchangeRate",
+    "RateSnapshot",
+    "PairConverter",
+    "ConsistencyReport",
+    "RateInconsistency",
+    "check_rate_consistency",
+    "RateSnapshotFile",
+    "write_rate_snapshot",
+    "FloatConverter",
     
-    # Devises prédéfinies
+    # Registre et devises prédéfinies
+    "registry",
     "EUR",
     "USD", 
     "GBP",
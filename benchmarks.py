@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks du convertisseur de devise.
+
+Usage:
+    python benchmarks.py
+"""
+
+import timeit
+from decimal import Decimal
+
+from currency import Currency, registry, EUR, USD, GBP, JPY
+from money import Money
+from currency_converter import CurrencyConverter
+from rate_consistency import check_rate_consistency
+from float_converter import FloatConverter
+from money_array import MoneyArray
+
+
+def _measure(label: str, func, number: int = 200_000) -> float:
+    """
+    Mesure le temps moyen d'un appel et l'affiche.
+    
+    Args:
+        label: Libellé de la mesure
+        func: Fonction sans argument à chronométrer
+        number: Nombre d'appels par mesure
+    
+    Returns:
+        Temps moyen par appel en nanosecondes
+    """
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    per_call = best / number * 1e9
+    print(f"   {label:<45} {per_call:8.1f} ns/appel")
+    return per_call
+
+
+def _compare(cases, number: int = 20_000, rounds: int = 50) -> list:
+    """
+    Mesure plusieurs fonctions en alternance et affiche leurs temps.
+    
+    Les mesures sont entrelacées (une série de chaque fonction par tour) et
+    le meilleur tour est retenu: les variations de charge de la machine
+    touchent toutes les fonctions comparées de la même façon.
+    
+    Args:
+        cases: Liste de couples (libellé, fonction sans argument)
+        number: Nombre d'appels par série
+        rounds: Nombre de tours
+    
+    Returns:
+        Temps moyens par appel en nanosecondes, dans l'ordre de cases
+    """
+    timers = [timeit.Timer(func) for _, func in cases]
+    best = [float('inf')] * len(cases)
+    for _ in range(rounds):
+        for index, timer in enumerate(timers):
+            best[index] = min(best[index], timer.timeit(number))
+    per_call = [elapsed / number * 1e9 for elapsed in best]
+    for (label, _), elapsed in zip(cases, per_call):
+        print(f"   {label:<45} {elapsed:8.1f} ns/appel")
+    return per_call
+
+
+class _LegacyMoney:
+    """Reproduction de l'ancienne implémentation de Money (référence)."""
+    
+    def __init__(self, amount, currency):
+        if not isinstance(currency, Currency):
+            raise TypeError("currency doit être une instance de Currency")
+        self._amount = Decimal(str(amount))
+        self._currency = currency
+    
+    def __add__(self, other):
+        return _LegacyMoney(self._amount + other._amount, self._currency)
+    
+    def __mul__(self, factor):
+        return _LegacyMoney(self._amount * Decimal(str(factor)), self._currency)
+
+
+def bench_money_constructors():
+    """Compare les constructeurs de Money."""
+    print("Constructeurs Money:")
+    # Les unités entières imposent de décomposer un Decimal: Money(Decimal)
+    # et from_decimal coûtent au moins autant que l'ancien Decimal(str()).
+    # Le constructeur rapide est from_minor_units (et _new, en interne).
+    amount = Decimal('1234.56')
+    legacy, _, _, minor = _compare([
+        ("ancien Money(Decimal)", lambda: _LegacyMoney(amount, EUR)),
+        ("Money(Decimal)", lambda: Money(amount, EUR)),
+        ("Money.from_decimal(Decimal)", lambda: Money.from_decimal(amount, EUR)),
+        ("Money.from_minor_units(int)", lambda: Money.from_minor_units(123456, EUR)),
+    ])
+    print(f"   Gain from_minor_units: x{legacy / minor:.2f}")
+    print()
+    
+    print("Opérations Money:")
+    a, b = Money("1234.56", EUR), Money("0.99", EUR)
+    old_a, old_b = _LegacyMoney("1234.56", EUR), _LegacyMoney("0.99", EUR)
+    rate = Decimal('1.085')
+    
+    old_add, new_add = _compare([
+        ("ancien a + b", lambda: old_a + old_b),
+        ("a + b", lambda: a + b),
+    ])
+    old_mul, new_mul = _compare([
+        ("ancien a * Decimal", lambda: old_a * rate),
+        ("a * Decimal", lambda: a * rate),
+    ])
+    _measure("a / 3", lambda: a / 3)
+    _measure("a.round(1)", lambda: a.round(1))
+    print(f"   Gain addition: x{old_add / new_add:.2f}")
+    print(f"   Gain multiplication: x{old_mul / new_mul:.2f}")
+    print()
+
+
+def bench_money_sum():
+    """Compare les façons de totaliser une liste de Money."""
+    print("Totalisation de 10 000 montants:")
+    ledger = [Money.from_minor_units(i, EUR) for i in range(10_000)]
+    zero = Money(0, EUR)
+    
+    naive = _measure("sum(ledger, Money(0))", lambda: sum(ledger, zero), number=20)
+    fast = _measure("Money.sum(ledger)", lambda: Money.sum(ledger), number=20)
+    print(f"   Gain: x{naive / fast:.2f}")
+    print()
+
+
+def bench_rate_lookup():
+    """Compare l'indexation des taux par chaîne et par numéro interne."""
+    print("Recherche de taux (CurrencyConverter):")
+    _measure("CurrencyConverter() (table par défaut partagée)", CurrencyConverter,
+             number=20_000)
+    converter = CurrencyConverter()
+    legacy_rates = {
+        f"{rate.from_currency.code}_{rate.to_currency.code}": rate
+        for rate in converter._iter_rates()
+    }
+    
+    def legacy_get_exchange_rate(from_currency, to_currency):
+        key = f"{from_currency.code}_{to_currency.code}"
+        return legacy_rates.get(key)
+    
+    legacy = _measure("dict de chaînes (f-string)",
+                      lambda: legacy_get_exchange_rate(EUR, USD))
+    ordinal = _measure("get_exchange_rate (matrice par numéros)",
+                       lambda: converter.get_exchange_rate(EUR, USD))
+    print(f"   Gain: x{legacy / ordinal:.2f}")
+    
+    money = Money(100, GBP)
+    _measure("convert direct (EUR -> USD)", lambda: converter.convert(Money(100, EUR), USD))
+    _measure("convert via pivot (GBP -> JPY)", lambda: converter.convert(money, JPY))
+    gbp_to_jpy = converter.pair(GBP, JPY)
+    _measure("pair(GBP, JPY)(money)", lambda: gbp_to_jpy(money))
+    print()
+    
+    print("Conversion de 10 000 montants (GBP, EUR -> JPY):")
+    ledger = [Money.from_minor_units(i % 500, GBP if i % 2 else EUR) for i in range(10_000)]
+    loop = _measure("[convert(m) for m in ledger]",
+                    lambda: [converter.convert(m, JPY) for m in ledger], number=20)
+    many = _measure("list(convert_many(ledger))",
+                    lambda: list(converter.convert_many(ledger, JPY)), number=20)
+    print(f"   Gain: x{loop / many:.2f}")
+    
+    engine = FloatConverter(converter)
+    column = MoneyArray.from_money(ledger)
+    exact = _measure("MoneyArray.convert (Decimal)",
+                     lambda: column.convert(converter, JPY), number=20)
+    approx = _measure("FloatConverter.convert_money_array (float64)",
+                      lambda: engine.convert_money_array(column, JPY), number=20)
+    print(f"   Gain float64: x{exact / approx:.2f}")
+    print()
+
+
+def bench_consistency_check():
+    """Mesure le contrôle de cohérence sur une matrice complète de taux."""
+    codes = list(registry)[:160]
+    print(f"Contrôle de cohérence ({len(codes)} devises, toutes les paires):")
+    converter = CurrencyConverter()
+    base = {code: Decimal(i + 1) / 7 for i, code in enumerate(codes)}
+    converter.add_exchange_rates({
+        (registry[a], registry[b]): base[b] / base[a]
+        for a in codes for b in codes if a != b
+    })
+    _measure("check_rate_consistency(converter)",
+             lambda: check_rate_consistency(converter), number=5)
+    print()
+
+
+def main():
+    """Lance tous les benchmarks."""
+    print("=== Benchmarks du convertisseur de devise ===\n")
+    bench_money_constructors()
+    bench_money_sum()
+    bench_rate_lookup()
+    bench_consistency_check()
+
+
+if __name__ == "__main__":
+    main()
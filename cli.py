@@ -4,6 +4,7 @@ Interface CLI pour le convertisseur de devise.
 """
 
 import click
+import sqlite3
 import sys
 from datetime import datetime
 from colorama import init, Fore, Style
@@ -12,16 +13,14 @@ from decimal import Decimal, InvalidOperation
 # Initialiser colorama pour Windows
 init()
 
-from currency import Currency, EUR, USD, GBP, JPY, CHF, CAD, AUD
+from currency import registry
 from money import Money
 from enhanced_currency_converter import EnhancedCurrencyConverter
+from rate_cache import SQLiteRateCache, default_cache_path
 
 
-# Mapping des devises disponibles
-CURRENCIES = {
-    'EUR': EUR, 'USD': USD, 'GBP': GBP, 'JPY': JPY,
-    'CHF': CHF, 'CAD': CAD, 'AUD': AUD
-}
+# Mapping des devises disponibles (registre ISO 4217)
+CURRENCIES = registry
 
 
 def print_header():
@@ -63,12 +62,28 @@ def format_currency_list():
 @click.group()
 @click.option('--api-key', envvar='EXCHANGE_API_KEY', 
               help='Clé API pour les services premium')
+@click.option('--cache-file', envvar='EXCHANGE_CACHE_FILE', default=default_cache_path,
+              show_default='~/.cache/currency_converter/rates.sqlite3',
+              help='Fichier du cache des taux partagé entre les exécutions')
+@click.option('--no-disk-cache', is_flag=True,
+              help='Garder le cache des taux en mémoire uniquement')
+@click.option('--single-base', envvar='EXCHANGE_SINGLE_BASE', metavar='CODE',
+              help='Une seule requête (base CODE) pour toutes les devises')
 @click.pass_context
-def cli(ctx, api_key):
+def cli(ctx, api_key, cache_file, no_disk_cache, single_base):
     """Convertisseur de devise avec taux en temps réel."""
     ctx.ensure_object(dict)
     ctx.obj['api_key'] = api_key
-    ctx.obj['converter'] = EnhancedCurrencyConverter(api_key)
+    # Sans cache disque, ExchangeRateAPI garde les taux en mémoire (RateCache)
+    cache = None
+    if not no_disk_cache:
+        try:
+            cache = SQLiteRateCache(cache_file)
+            # Écrit les lectures accumulées à la fin de la commande
+            ctx.call_on_close(cache.close)
+        except (OSError, sqlite3.Error) as e:
+            print_warning(f"Cache disque indisponible ({e}), taux gardés en mémoire")
+    ctx.obj['converter'] = EnhancedCurrencyConverter(api_key, cache, single_base)
 
 
 @cli.command()
@@ -200,7 +215,14 @@ def cache(ctx):
         print_header()
         print_info("État du cache:")
         print()
-        print(f"  • Entrées en cache: {cache_info['entries']}")
+        print(f"  • Entrées en cache: {cache_info['entries']} / {cache_info['max_entries']}"
+              f" (dont {cache_info['expired_entries']} expirées)")
+        print(f"  • Succès / échecs: {cache_info['hits']} / {cache_info['misses']}")
+        print(f"  • Évictions: {cache_info['evictions']}")
+        print(f"  • Taux périmés servis: {cache_info['stale_serves']}")
+        
+        if cache_info.get('path'):
+            print(f"  • Fichier: {cache_info['path']}")
         
         if cache_info['oldest_entry']:
             oldest = cache_info['oldest_entry'].strftime('%H:%M:%S le %d/%m/%Y')
@@ -209,7 +231,9 @@ def cache(ctx):
         if cache_info['keys']:
             print(f"  • Clés en cache:")
             for key in cache_info['keys']:
-                print(f"    - {key}")
+                age = int(cache_info['ages'].get(key, 0))
+                stale = " (expirée)" if key in cache_info['stale_keys'] else ""
+                print(f"    - {key}: {age // 60} min {age % 60} s{stale}")
         
     except Exception as e:
         print_error(f"Erreur lors de la récupération du cache: {e}")
@@ -4,11 +4,11 @@ Interface CLI simple pour le convertisseur de devise avec taux en temps réel.
 """
 
 import sys
-import requests
 from decimal import Decimal
 from datetime import datetime
 
-from currency import EUR, USD, GBP, JPY, CHF, CAD, AUD
+from currency import registry
+from http_client import default_client
 from money import Money
 
 
@@ -16,19 +16,14 @@ class SimpleCurrencyConverter:
     """Convertisseur simple avec API en temps réel."""
     
     def __init__(self):
-        self.currencies = {
-            'EUR': EUR, 'USD': USD, 'GBP': GBP, 'JPY': JPY,
-            'CHF': CHF, 'CAD': CAD, 'AUD': AUD
-        }
+        self.currencies = registry
+        self.http = default_client()
     
     def get_rate(self, from_code, to_code):
         """Récupère un taux de change depuis l'API."""
         try:
             url = f"https://open.er-api.com/v6/latest/{from_code}"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self.http.get_json(url)
             if data.get('result') == 'success' and 'rates' in data:
                 rates = data['rates']
                 if to_code in rates:
@@ -68,7 +63,7 @@ Exemples:
   python converter_cli.py rates EUR
   python converter_cli.py interactive
 
-Devises supportées: EUR, USD, GBP, JPY, CHF, CAD, AUD
+Devises supportées: toutes les devises ISO 4217 (voir 'currencies')
     """)
 
 
@@ -128,10 +123,7 @@ def cmd_rates(converter, args):
     
     try:
         url = f"https://open.er-api.com/v6/latest/{base_code}"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = converter.http.get_json(url)
         if data.get('result') == 'success' and 'rates' in data:
             rates = data['rates']
             
@@ -180,7 +172,7 @@ def cmd_interactive(converter):
             if user_input.lower() in ['help', 'h']:
                 print("\nFormat: <montant> <devise_source> <devise_cible>")
                 print("Exemple: 100 EUR USD")
-                print("Devises: EUR, USD, GBP, JPY, CHF, CAD, AUD")
+                print("Devises: codes ISO 4217 (ex: EUR, USD, GBP, JPY)")
                 print("Commandes: quit, help")
                 continue
             
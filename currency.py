@@ -1,15 +1,27 @@
-from dataclasses import dataclass
-from typing import Optional
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional
 
 
-@dataclass(frozen=True)
+# Code ISO -> numéro interne (attribué à la première création d'une devise)
+_ORDINALS: Dict[str, int] = {}
+
+
+@dataclass(frozen=True, eq=False)
 class Currency:
     """
     Représente une devise avec son code ISO, son nom et son symbole.
+    
+    Deux devises sont égales si elles ont le même code ISO. Les instances
+    du registre (voir CurrencyRegistry) sont uniques par code, ce qui
+    ramène la plupart des comparaisons à un test d'identité.
     """
     code: str  # Code ISO 4217 (ex: EUR, USD, GBP)
     name: str  # Nom complet (ex: "Euro", "US Dollar")
     symbol: Optional[str] = None  # Symbole (ex: "€", "$", "£")
+    minor_unit: int = 2  # Nombre de décimales de l'unité mineure (ex: 2 pour les centimes)
+    numeric: Optional[int] = None  # Code numérique ISO 4217 (ex: 978 pour EUR)
+    ordinal: int = field(init=False, repr=False)  # Numéro interne unique par code
     
     def __post_init__(self):
         """Validation des données après initialisation."""
@@ -19,8 +31,30 @@ class Currency:
         if not self.name:
             raise ValueError("Le nom de devise ne peut pas être vide")
         
+        if not isinstance(self.minor_unit, int) or self.minor_unit < 0:
+            raise ValueError("L'unité mineure doit être un entier positif ou nul")
+        
         # Conversion en majuscules pour standardisation
         object.__setattr__(self, 'code', self.code.upper())
+        
+        # Numéro interne stable pour un même code, utilisable comme index
+        ordinal = _ORDINALS.setdefault(self.code, len(_ORDINALS))
+        object.__setattr__(self, 'ordinal', ordinal)
+    
+    def __reduce__(self):
+        # Le numéro interne est propre au processus: il est recalculé à
+        # partir du code au dépicklage (__post_init__), jamais transmis
+        return (Currency, (self.code, self.name, self.symbol, self.minor_unit, self.numeric))
+    
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Currency):
+            return NotImplemented
+        return self.code == other.code
+    
+    def __hash__(self) -> int:
+        return hash(self.code)
     
     def __str__(self) -> str:
         if self.symbol:
@@ -31,11 +65,264 @@ class Currency:
         return f"Currency(code='{self.code}', name='{self.name}', symbol='{self.symbol}')"
 
 
+class CurrencyRegistry(Mapping):
+    """
+    Registre des devises connues, indexé par code alphabétique et numérique.
+    
+    Chaque code n'a qu'une seule instance de Currency (internement): les
+    recherches renvoient toujours le même objet, en temps constant.
+    """
+    
+    def __init__(self):
+        """Initialise un registre vide."""
+        self._by_code: Dict[str, Currency] = {}
+        self._by_number: Dict[int, Currency] = {}
+    
+    def intern(self, currency: Currency) -> Currency:
+        """
+        Enregistre une devise ou renvoie l'instance déjà connue pour son code.
+        
+        Args:
+            currency: Devise à enregistrer
+            
+        Returns:
+            Instance canonique de la devise
+        """
+        existing = self._by_code.get(currency.code)
+        if existing is not None:
+            return existing
+        
+        self._by_code[currency.code] = currency
+        if currency.numeric is not None:
+            self._by_number.setdefault(currency.numeric, currency)
+        return currency
+    
+    def get(self, code: str, default: Optional[Currency] = None) -> Optional[Currency]:
+        """
+        Récupère une devise par son code alphabétique.
+        
+        Args:
+            code: Code ISO 4217 (ex: "EUR")
+            default: Valeur renvoyée si le code est inconnu
+            
+        Returns:
+            Instance de Currency ou default
+        """
+        return self._by_code.get(code, default)
+    
+    def get_by_number(self, number: int) -> Optional[Currency]:
+        """
+        Récupère une devise par son code numérique.
+        
+        Args:
+            number: Code numérique ISO 4217 (ex: 978)
+            
+        Returns:
+            Instance de Currency ou None
+        """
+        return self._by_number.get(number)
+    
+    def __getitem__(self, code: str) -> Currency:
+        return self._by_code[code]
+    
+    def __contains__(self, code) -> bool:
+        return code in self._by_code
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._by_code)
+    
+    def __len__(self) -> int:
+        return len(self._by_code)
+
+
+# Table ISO 4217: (code, code numérique, unité mineure, nom)
+_ISO_4217 = (
+    ("AED", 784, 2, "UAE Dirham"),
+    ("AFN", 971, 2, "Afghani"),
+    ("ALL",   8, 2, "Lek"),
+    ("AMD",  51, 2, "Armenian Dram"),
+    ("ANG", 532, 2, "Netherlands Antillean Guilder"),
+    ("AOA", 973, 2, "Kwanza"),
+    ("ARS",  32, 2, "Argentine Peso"),
+    ("AUD",  36, 2, "Australian Dollar"),
+    ("AWG", 533, 2, "Aruban Florin"),
+    ("AZN", 944, 2, "Azerbaijan Manat"),
+    ("BAM", 977, 2, "Convertible Mark"),
+    ("BBD",  52, 2, "Barbados Dollar"),
+    ("BDT",  50, 2, "Taka"),
+    ("BGN", 975, 2, "Bulgarian Lev"),
+    ("BHD",  48, 3, "Bahraini Dinar"),
+    ("BIF", 108, 0, "Burundi Franc"),
+    ("BMD",  60, 2, "Bermudian Dollar"),
+    ("BND",  96, 2, "Brunei Dollar"),
+    ("BOB",  68, 2, "Boliviano"),
+    ("BOV", 984, 2, "Mvdol"),
+    ("BRL", 986, 2, "Brazilian Real"),
+    ("BSD",  44, 2, "Bahamian Dollar"),
+    ("BTN",  64, 2, "Ngultrum"),
+    ("BWP",  72, 2, "Pula"),
+    ("BYN", 933, 2, "Belarusian Ruble"),
+    ("BZD",  84, 2, "Belize Dollar"),
+    ("CAD", 124, 2, "Canadian Dollar"),
+    ("CDF", 976, 2, "Congolese Franc"),
+    ("CHE", 947, 2, "WIR Euro"),
+    ("CHF", 756, 2, "Swiss Franc"),
+    ("CHW", 948, 2, "WIR Franc"),
+    ("CLF", 990, 4, "Unidad de Fomento"),
+    ("CLP", 152, 0, "Chilean Peso"),
+    ("CNY", 156, 2, "Yuan Renminbi"),
+    ("COP", 170, 2, "Colombian Peso"),
+    ("COU", 970, 2, "Unidad de Valor Real"),
+    ("CRC", 188, 2, "Costa Rican Colon"),
+    ("CUP", 192, 2, "Cuban Peso"),
+    ("CVE", 132, 2, "Cabo Verde Escudo"),
+    ("CZK", 203, 2, "Czech Koruna"),
+    ("DJF", 262, 0, "Djibouti Franc"),
+    ("DKK", 208, 2, "Danish Krone"),
+    ("DOP", 214, 2, "Dominican Peso"),
+    ("DZD",  12, 2, "Algerian Dinar"),
+    ("EGP", 818, 2, "Egyptian Pound"),
+    ("ERN", 232, 2, "Nakfa"),
+    ("ETB", 230, 2, "Ethiopian Birr"),
+    ("EUR", 978, 2, "Euro"),
+    ("FJD", 242, 2, "Fiji Dollar"),
+    ("FKP", 238, 2, "Falkland Islands Pound"),
+    ("GBP", 826, 2, "British Pound"),
+    ("GEL", 981, 2, "Lari"),
+    ("GHS", 936, 2, "Ghana Cedi"),
+    ("GIP", 292, 2, "Gibraltar Pound"),
+    ("GMD", 270, 2, "Dalasi"),
+    ("GNF", 324, 0, "Guinean Franc"),
+    ("GTQ", 320, 2, "Quetzal"),
+    ("GYD", 328, 2, "Guyana Dollar"),
+    ("HKD", 344, 2, "Hong Kong Dollar"),
+    ("HNL", 340, 2, "Lempira"),
+    ("HTG", 332, 2, "Gourde"),
+    ("HUF", 348, 2, "Forint"),
+    ("IDR", 360, 2, "Rupiah"),
+    ("ILS", 376, 2, "New Israeli Sheqel"),
+    ("INR", 356, 2, "Indian Rupee"),
+    ("IQD", 368, 3, "Iraqi Dinar"),
+    ("IRR", 364, 2, "Iranian Rial"),
+    ("ISK", 352, 0, "Iceland Krona"),
+    ("JMD", 388, 2, "Jamaican Dollar"),
+    ("JOD", 400, 3, "Jordanian Dinar"),
+    ("JPY", 392, 0, "Japanese Yen"),
+    ("KES", 404, 2, "Kenyan Shilling"),
+    ("KGS", 417, 2, "Som"),
+    ("KHR", 116, 2, "Riel"),
+    ("KMF", 174, 0, "Comorian Franc"),
+    ("KPW", 408, 2, "North Korean Won"),
+    ("KRW", 410, 0, "Won"),
+    ("KWD", 414, 3, "Kuwaiti Dinar"),
+    ("KYD", 136, 2, "Cayman Islands Dollar"),
+    ("KZT", 398, 2, "Tenge"),
+    ("LAK", 418, 2, "Lao Kip"),
+    ("LBP", 422, 2, "Lebanese Pound"),
+    ("LKR", 144, 2, "Sri Lanka Rupee"),
+    ("LRD", 430, 2, "Liberian Dollar"),
+    ("LSL", 426, 2, "Loti"),
+    ("LYD", 434, 3, "Libyan Dinar"),
+    ("MAD", 504, 2, "Moroccan Dirham"),
+    ("MDL", 498, 2, "Moldovan Leu"),
+    ("MGA", 969, 2, "Malagasy Ariary"),
+    ("MKD", 807, 2, "Denar"),
+    ("MMK", 104, 2, "Kyat"),
+    ("MNT", 496, 2, "Tugrik"),
+    ("MOP", 446, 2, "Pataca"),
+    ("MRU", 929, 2, "Ouguiya"),
+    ("MUR", 480, 2, "Mauritius Rupee"),
+    ("MVR", 462, 2, "Rufiyaa"),
+    ("MWK", 454, 2, "Malawi Kwacha"),
+    ("MXN", 484, 2, "Mexican Peso"),
+    ("MXV", 979, 2, "Mexican Unidad de Inversion (UDI)"),
+    ("MYR", 458, 2, "Malaysian Ringgit"),
+    ("MZN", 943, 2, "Mozambique Metical"),
+    ("NAD", 516, 2, "Namibia Dollar"),
+    ("NGN", 566, 2, "Naira"),
+    ("NIO", 558, 2, "Cordoba Oro"),
+    ("NOK", 578, 2, "Norwegian Krone"),
+    ("NPR", 524, 2, "Nepalese Rupee"),
+    ("NZD", 554, 2, "New Zealand Dollar"),
+    ("OMR", 512, 3, "Rial Omani"),
+    ("PAB", 590, 2, "Balboa"),
+    ("PEN", 604, 2, "Sol"),
+    ("PGK", 598, 2, "Kina"),
+    ("PHP", 608, 2, "Philippine Peso"),
+    ("PKR", 586, 2, "Pakistan Rupee"),
+    ("PLN", 985, 2, "Zloty"),
+    ("PYG", 600, 0, "Guarani"),
+    ("QAR", 634, 2, "Qatari Rial"),
+    ("RON", 946, 2, "Romanian Leu"),
+    ("RSD", 941, 2, "Serbian Dinar"),
+    ("RUB", 643, 2, "Russian Ruble"),
+    ("RWF", 646, 0, "Rwanda Franc"),
+    ("SAR", 682, 2, "Saudi Riyal"),
+    ("SBD",  90, 2, "Solomon Islands Dollar"),
+    ("SCR", 690, 2, "Seychelles Rupee"),
+    ("SDG", 938, 2, "Sudanese Pound"),
+    ("SEK", 752, 2, "Swedish Krona"),
+    ("SGD", 702, 2, "Singapore Dollar"),
+    ("SHP", 654, 2, "Saint Helena Pound"),
+    ("SLE", 925, 2, "Leone"),
+    ("SLL", 694, 2, "Leone (ancien)"),
+    ("SOS", 706, 2, "Somali Shilling"),
+    ("SRD", 968, 2, "Surinam Dollar"),
+    ("SSP", 728, 2, "South Sudanese Pound"),
+    ("STN", 930, 2, "Dobra"),
+    ("SVC", 222, 2, "El Salvador Colon"),
+    ("SYP", 760, 2, "Syrian Pound"),
+    ("SZL", 748, 2, "Lilangeni"),
+    ("THB", 764, 2, "Baht"),
+    ("TJS", 972, 2, "Somoni"),
+    ("TMT", 934, 2, "Turkmenistan New Manat"),
+    ("TND", 788, 3, "Tunisian Dinar"),
+    ("TOP", 776, 2, "Pa'anga"),
+    ("TRY", 949, 2, "Turkish Lira"),
+    ("TTD", 780, 2, "Trinidad and Tobago Dollar"),
+    ("TWD", 901, 2, "New Taiwan Dollar"),
+    ("TZS", 834, 2, "Tanzanian Shilling"),
+    ("UAH", 980, 2, "Hryvnia"),
+    ("UGX", 800, 0, "Uganda Shilling"),
+    ("USD", 840, 2, "US Dollar"),
+    ("USN", 997, 2, "US Dollar (Next day)"),
+    ("UYI", 940, 0, "Uruguay Peso en Unidades Indexadas (UI)"),
+    ("UYU", 858, 2, "Peso Uruguayo"),
+    ("UYW", 927, 4, "Unidad Previsional"),
+    ("UZS", 860, 2, "Uzbekistan Sum"),
+    ("VED", 926, 2, "Bolivar Soberano (VED)"),
+    ("VES", 928, 2, "Bolivar Soberano"),
+    ("VND", 704, 0, "Dong"),
+    ("VUV", 548, 0, "Vatu"),
+    ("WST", 882, 2, "Tala"),
+    ("XAF", 950, 0, "CFA Franc BEAC"),
+    ("XCD", 951, 2, "East Caribbean Dollar"),
+    ("XOF", 952, 0, "CFA Franc BCEAO"),
+    ("XPF", 953, 0, "CFP Franc"),
+    ("YER", 886, 2, "Yemeni Rial"),
+    ("ZAR", 710, 2, "Rand"),
+    ("ZMW", 967, 2, "Zambian Kwacha"),
+    ("ZWG", 924, 2, "Zimbabwe Gold"),
+    ("ZWL", 932, 2, "Zimbabwe Dollar"),
+)
+
+# Symboles des devises courantes
+_SYMBOLS = {
+    'EUR': '€', 'USD': '$', 'GBP': '£', 'JPY': '¥',
+    'CHF': 'CHF', 'CAD': 'C$', 'AUD': 'A$',
+}
+
+# Registre global des devises
+registry = CurrencyRegistry()
+for _code, _number, _minor_unit, _name in _ISO_4217:
+    registry.intern(Currency(_code, _name, _SYMBOLS.get(_code), _minor_unit, _number))
+
+
 # Devises courantes prédéfinies
-EUR = Currency("EUR", "Euro", "€")
-USD = Currency("USD", "US Dollar", "$")
-GBP = Currency("GBP", "British Pound", "£")
-JPY = Currency("JPY", "Japanese Yen", "¥")
-CHF = Currency("CHF", "Swiss Franc", "CHF")
-CAD = Currency("CAD", "Canadian Dollar", "C$")
-AUD = Currency("AUD", "Australian Dollar", "A$") 
\ No newline at end of file
+EUR = registry['EUR']
+USD = registry['USD']
+GBP = registry['GBP']
+JPY = registry['JPY']
+CHF = registry['CHF']
+CAD = registry['CAD']
+AUD = registry['AUD']
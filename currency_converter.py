@@ -1,8 +1,33 @@
+from bisect import bisect_right
+from collections import deque
+from collections.abc import Mapping as AbcMapping, Set as AbcSet
+from contextlib import contextmanager
 from decimal import Decimal
-from typing import Dict, Optional
+from types import MappingProxyType
+from itertools import islice
+from typing import AbstractSet, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
 from datetime import datetime
-from currency import Currency
-from money import Money
+from threading import RLock
+from currency import Currency, registry
+from money import Money, _decimal_digits
+
+
+def _local_time(timestamp: datetime) -> datetime:
+    """
+    Ramène un horodatage à l'heure locale naïve, comme datetime.now().
+    
+    Les horodatages sont comparés entre eux dans les historiques: un
+    horodatage avec fuseau horaire y est converti pour rester comparable.
+    
+    Args:
+        timestamp: Horodatage naïf (heure locale) ou avec fuseau horaire
+        
+    Returns:
+        Horodatage naïf en heure locale
+    """
+    if timestamp.tzinfo is None:
+        return timestamp
+    return timestamp.astimezone().replace(tzinfo=None)
 
 
 class ExchangeRate:
@@ -23,8 +48,8 @@ class ExchangeRate:
         """
         self.from_currency = from_currency
         self.to_currency = to_currency
-        self.rate = Decimal(str(rate))
-        self.timestamp = timestamp or datetime.now()
+        self.rate = rate if isinstance(rate, Decimal) else Decimal(str(rate))
+        self.timestamp = _local_time(timestamp) if timestamp else datetime.now()
     
     def __str__(self) -> str:
         return f"{self.from_currency.code} → {self.to_currency.code}: {self.rate}"
@@ -34,88 +59,411 @@ class ExchangeRate:
                 f"{self.rate}, {self.timestamp})")
 
 
-class CurrencyConverter:
+# Vue vide renvoyée pour une devise sans taux
+_NO_RATES: Mapping = MappingProxyType({})
+
+
+class _CrossRates:
     """
-    Convertisseur de devises gérant les taux de change.
+    Taux croisés depuis une devise source vers toutes les devises atteignables.
+    
+    Calculés par parcours en largeur du graphe des taux: chaque devise est
+    atteinte par un chemin de longueur minimale, dont le taux composé est
+    mémorisé avec son prédécesseur et sa profondeur.
     """
     
-    def __init__(self):
-        """Initialise le convertisseur avec des taux par défaut."""
-        self._exchange_rates: Dict[str, ExchangeRate] = {}
-        self._load_default_rates()
+    __slots__ = ('rates', 'parent', 'depth')
     
-    def _load_default_rates(self) -> None:
-        """Charge des taux de change par défaut (simulés)."""
-        # Taux par rapport à l'EUR (1 EUR = X devise)
-        default_rates = {
-            ('EUR', 'USD'): '1.0850',
-            ('EUR', 'GBP'): '0.8320',
-            ('EUR', 'JPY'): '163.50',
-            ('EUR', 'CHF'): '0.9280',
-            ('EUR', 'CAD'): '1.4780',
-            ('EUR', 'AUD'): '1.6420',
-        }
+    def __init__(self, source: int, rate_matrix: List[Sequence[Optional[ExchangeRate]]]):
+        """
+        Calcule les taux croisés depuis une devise source.
+        
+        Args:
+            source: Numéro interne de la devise source
+            rate_matrix: Matrice des taux directs
+        """
+        self.rates: Dict[int, Decimal] = {}
+        self.parent: Dict[int, int] = {}
+        self.depth: Dict[int, int] = {source: 0}
+        
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            if node >= len(rate_matrix):
+                continue
+            node_rate = self.rates.get(node)
+            node_depth = self.depth[node] + 1
+            for target, exchange_rate in enumerate(rate_matrix[node]):
+                if exchange_rate is None or target in self.depth:
+                    continue
+                self.depth[target] = node_depth
+                self.parent[target] = node
+                self.rates[target] = (exchange_rate.rate if node_rate is None 
+                                      else node_rate * exchange_rate.rate)
+                queue.append(target)
+    
+    def is_affected_by(self, source: int, target: int, existed: bool) -> bool:
+        """
+        Indique si la modification d'un taux direct invalide ces taux croisés.
         
-        # Ajouter les taux directs et inverses
-        for (from_code, to_code), rate_str in default_rates.items():
-            rate = Decimal(rate_str)
+        Args:
+            source: Numéro interne de la devise source du taux modifié
+            target: Numéro interne de la devise cible du taux modifié
+            existed: True si le taux existait déjà (mise à jour)
             
-            # Import dynamique pour éviter les imports circulaires
-            from currency import EUR, USD, GBP, JPY, CHF, CAD, AUD
+        Returns:
+            True si les taux croisés doivent être recalculés
+        """
+        if existed:
+            # Mise à jour: seuls les chemins empruntant ce taux changent
+            return self.parent.get(target) == source
+        
+        # Nouveau taux: il compte s'il raccourcit un chemin, ou en ouvre un
+        # de même longueur (le parcours complet pourrait alors le préférer
+        # selon l'ordre de visite: les taux ne dépendraient plus de
+        # l'historique des requêtes)
+        source_depth = self.depth.get(source)
+        if source_depth is None:
+            return False
+        target_depth = self.depth.get(target)
+        return target_depth is None or source_depth + 1 <= target_depth
+
+
+class _RateHistory:
+    """
+    Historique des taux d'une paire de devises, trié par horodatage.
+    """
+    
+    __slots__ = ('timestamps', 'rates')
+    
+    def __init__(self, timestamps: Optional[List[datetime]] = None, 
+                 rates: Optional[List[ExchangeRate]] = None):
+        """
+        Initialise l'historique.
+        
+        Args:
+            timestamps: Horodatages triés
+            rates: Taux correspondant à chaque horodatage
+        """
+        self.timestamps = timestamps if timestamps is not None else []
+        self.rates = rates if rates is not None else []
+    
+    def copy(self) -> '_RateHistory':
+        """Copie l'historique pour le modifier sans affecter l'original."""
+        return _RateHistory(list(self.timestamps), list(self.rates))
+    
+    def insert(self, exchange_rate: ExchangeRate, limit: Optional[int]) -> bool:
+        """
+        Insère un taux à sa place dans l'historique.
+        
+        Un taux de même horodatage qu'un taux existant est placé après lui.
+        
+        Args:
+            exchange_rate: Taux à insérer
+            limit: Nombre maximal de taux conservés (les plus anciens sont
+                supprimés), ou None pour ne pas limiter
             
-            currency_map = {
-                'EUR': EUR, 'USD': USD, 'GBP': GBP, 
-                'JPY': JPY, 'CHF': CHF, 'CAD': CAD, 'AUD': AUD
-            }
+        Returns:
+            True si le taux est désormais le plus récent de l'historique
+        """
+        position = bisect_right(self.timestamps, exchange_rate.timestamp)
+        self.timestamps.insert(position, exchange_rate.timestamp)
+        self.rates.insert(position, exchange_rate)
+        if limit is not None and len(self.rates) > limit:
+            del self.timestamps[:-limit]
+            del self.rates[:-limit]
+        return self.rates[-1] is exchange_rate
+    
+    def at(self, timestamp: datetime) -> Optional[ExchangeRate]:
+        """
+        Retourne le taux applicable à une date (recherche dichotomique).
+        
+        Args:
+            timestamp: Date de valeur
             
-            from_currency = currency_map[from_code]
-            to_currency = currency_map[to_code]
+        Returns:
+            Dernier taux publié à cette date, ou None si aucun
+        """
+        position = bisect_right(self.timestamps, _local_time(timestamp))
+        if not position:
+            return None
+        return self.rates[position - 1]
+    
+    def prune(self, before: datetime) -> None:
+        """
+        Supprime les taux antérieurs à une date, sauf celui applicable à cette date.
+        
+        Args:
+            before: Date limite
+        """
+        position = bisect_right(self.timestamps, _local_time(before)) - 1
+        if position > 0:
+            del self.timestamps[:position]
+            del self.rates[:position]
+
+
+class _RateTable:
+    """
+    Version immuable de la table des taux de change et de ses index dérivés.
+    
+    Regroupe la matrice des taux directs (le plus récent de chaque paire),
+    l'historique des taux par paire, les index inverses et le cache des
+    taux croisés. Une table publiée n'est plus modifiée: une mise à jour
+    prépare une copie (copy) puis la publie en remplaçant la référence, ce
+    qui permet aux lecteurs de l'utiliser sans verrou. Seul le cache des
+    taux croisés est complété à la demande, avec des valeurs qui ne
+    dépendent que de la table.
+    """
+    
+    __slots__ = ('matrix', 'history', 'rates_by_source', 'currencies', 'cross_rates',
+                 'version', '_owned')
+    
+    def __init__(self, version: int = 0):
+        """
+        Initialise une table vide.
+        
+        Args:
+            version: Numéro de version de la table
+        """
+        # Matrice dense des taux: matrix[source.ordinal][cible.ordinal]
+        self.matrix: List[Sequence[Optional[ExchangeRate]]] = []
+        # Historique des taux par paire: history[source.ordinal][cible.ordinal]
+        self.history: Dict[int, Dict[int, _RateHistory]] = {}
+        # Index inverses: taux par devise source et ensemble des devises
+        self.rates_by_source: Dict[int, Dict[Currency, ExchangeRate]] = {}
+        self.currencies: Dict[Currency, None] = {}
+        # Taux croisés calculés à la demande, par devise source
+        self.cross_rates: Dict[int, _CrossRates] = {}
+        self.version = version
+        # Lignes et historiques déjà copiés dans cette version (modifiables)
+        self._owned = None
+    
+    def copy(self) -> '_RateTable':
+        """
+        Prépare la version suivante de la table.
+        
+        Les lignes de la matrice, les historiques et les index par devise
+        source sont partagés avec la version courante et ne sont copiés
+        qu'à leur première modification. Les objets ExchangeRate et les taux croisés
+        déjà calculés, qui ne sont jamais modifiés, sont partagés. La copie
+        est proportionnelle au nombre de devises, pas au nombre de paires.
+        """
+        table = _RateTable(self.version + 1)
+        table.matrix = list(self.matrix)
+        table.history = dict(self.history)
+        table.rates_by_source = dict(self.rates_by_source)
+        table.currencies = dict(self.currencies)
+        table.cross_rates = dict(self.cross_rates)
+        table._owned = set()
+        return table
+    
+    def store(self, exchange_rate: ExchangeRate, 
+              history_limit: Optional[int] = None, 
+              dated: bool = True) -> Optional[Tuple[int, int, bool]]:
+        """
+        Enregistre un taux dans l'historique de sa paire et dans les index.
+        
+        Le taux ne devient le taux courant de la paire que s'il est le plus
+        récent de son historique. Un taux non daté (taux par défaut) n'entre
+        pas dans l'historique: il est le taux courant jusqu'au premier taux
+        enregistré pour la paire, quelle que soit la date de celui-ci, et ne
+        s'applique à aucune date de valeur.
+        
+        Args:
+            exchange_rate: Taux à enregistrer
+            history_limit: Nombre maximal de taux conservés pour la paire
+            dated: Enregistrer le taux dans l'historique de la paire
             
-            # Taux direct
-            self.add_exchange_rate(from_currency, to_currency, rate)
+        Returns:
+            Tuple (source, cible, taux déjà existant) décrivant la modification
+            du taux courant, ou None si seul l'historique a changé
+        """
+        from_currency = exchange_rate.from_currency
+        to_currency = exchange_rate.to_currency
+        source, target = from_currency.ordinal, to_currency.ordinal
+        pair = (source, target)
+        
+        matrix = self.matrix
+        if source >= len(matrix):
+            matrix.extend([()] * (source + 1 - len(matrix)))
+        self._own_row(source)
+        
+        if dated:
+            histories = self.history.setdefault(source, {})
+            history = histories.get(target)
+            if history is None:
+                history = histories[target] = _RateHistory()
+            elif self._owned is not None and pair not in self._owned:
+                self._owned.add(pair)
+                history = histories[target] = history.copy()
+            if not history.insert(exchange_rate, history_limit):
+                return None
+        
+        row = matrix[source]
+        if target >= len(row):
+            if not isinstance(row, list):
+                row = matrix[source] = list(row)
+            row.extend([None] * (target + 1 - len(row)))
+        existed = row[target] is not None
+        row[target] = exchange_rate
+        
+        self.rates_by_source.setdefault(source, {})[to_currency] = exchange_rate
+        self.currencies.setdefault(from_currency)
+        self.currencies.setdefault(to_currency)
+        return source, target, existed
+    
+    def _own_row(self, source: int) -> None:
+        """
+        Copie la ligne d'une devise source à sa première modification dans
+        cette version (ligne de la matrice, index et historiques).
+        
+        Args:
+            source: Ordinal de la devise source
+        """
+        if self._owned is None or source in self._owned:
+            return
+        self._owned.add(source)
+        if source < len(self.matrix):
+            self.matrix[source] = list(self.matrix[source])
+        self.rates_by_source[source] = dict(self.rates_by_source.get(source, ()))
+        self.history[source] = dict(self.history.get(source, ()))
+    
+    def prune(self, before: datetime) -> None:
+        """
+        Supprime l'historique antérieur à une date.
+        
+        Args:
+            before: Date limite (le taux applicable à cette date est conservé)
+        """
+        before = _local_time(before)
+        for source, histories in list(self.history.items()):
+            for target, history in list(histories.items()):
+                if bisect_right(history.timestamps, before) <= 1:
+                    continue
+                self._own_row(source)
+                histories = self.history[source]
+                pair = (source, target)
+                if self._owned is not None and pair not in self._owned:
+                    self._owned.add(pair)
+                    history = histories[target] = history.copy()
+                history.prune(before)
+    
+    def matrix_at(self, timestamp: datetime) -> List[List[Optional[ExchangeRate]]]:
+        """
+        Construit la matrice des taux applicables à une date.
+        
+        Args:
+            timestamp: Date de valeur
             
-            # Taux inverse
-            if rate != 0:
-                inverse_rate = Decimal('1') / rate
-                self.add_exchange_rate(to_currency, from_currency, inverse_rate)
+        Returns:
+            Matrice des taux directs à cette date
+        """
+        matrix: List[List[Optional[ExchangeRate]]] = [[] for _ in self.matrix]
+        for source, histories in self.history.items():
+            row = matrix[source]
+            for target, history in histories.items():
+                exchange_rate = history.at(timestamp)
+                if exchange_rate is None:
+                    continue
+                if target >= len(row):
+                    row.extend([None] * (target + 1 - len(row)))
+                row[target] = exchange_rate
+        return matrix
     
-    def add_exchange_rate(self, from_currency: Currency, to_currency: Currency, 
-                         rate: Decimal, timestamp: Optional[datetime] = None) -> None:
+    def invalidate(self, changes: List[Tuple[int, int, bool]]) -> None:
         """
-        Ajoute ou met à jour un taux de change.
+        Invalide uniquement les taux croisés concernés par des modifications.
         
         Args:
-            from_currency: Devise source
-            to_currency: Devise cible
-            rate: Taux de change
-            timestamp: Horodatage (optionnel)
+            changes: Modifications (source, cible, taux déjà existant)
         """
-        key = self._get_rate_key(from_currency, to_currency)
-        exchange_rate = ExchangeRate(from_currency, to_currency, rate, timestamp)
-        self._exchange_rates[key] = exchange_rate
+        if not self.cross_rates or not changes:
+            return
+        
+        self.cross_rates = {
+            origin: cross for origin, cross in self.cross_rates.items()
+            if not any(cross.is_affected_by(*change) for change in changes)
+        }
+
+
+# Taux par défaut (simulés), par rapport à l'EUR (1 EUR = X devise)
+_DEFAULT_RATES = {
+    ('EUR', 'USD'): '1.0850',
+    ('EUR', 'GBP'): '0.8320',
+    ('EUR', 'JPY'): '163.50',
+    ('EUR', 'CHF'): '0.9280',
+    ('EUR', 'CAD'): '1.4780',
+    ('EUR', 'AUD'): '1.6420',
+}
+
+
+def _build_default_table() -> _RateTable:
+    """
+    Construit la table des taux par défaut, directs et inverses.
+    
+    Returns:
+        Table partagée par tous les convertisseurs
+    """
+    table = _RateTable()
+    timestamp = datetime.now()
+    for (from_code, to_code), rate_str in _DEFAULT_RATES.items():
+        rate = Decimal(rate_str)
+        from_currency = registry[from_code]
+        to_currency = registry[to_code]
+        table.store(ExchangeRate(from_currency, to_currency, rate, timestamp), dated=False)
+        table.store(ExchangeRate(to_currency, from_currency, Decimal('1') / rate, timestamp), 
+                    dated=False)
+    return table
+
+
+class _RateQueries:
+    """
+    Requêtes de taux et conversions sur la table courante (self._table).
+    
+    Chaque appel public lit self._table une seule fois: tous les taux qu'il
+    utilise proviennent de la même version de la table.
+    """
+    
+    __slots__ = ()
     
-    def get_exchange_rate(self, from_currency: Currency, 
-                         to_currency: Currency) -> Optional[ExchangeRate]:
+    _table: _RateTable
+    
+    @property
+    def version(self) -> int:
+        """Numéro de version de la table des taux."""
+        return self._table.version
+    
+    def get_exchange_rate(self, from_currency: Currency, to_currency: Currency, 
+                          at: Optional[datetime] = None) -> Optional[ExchangeRate]:
         """
         Récupère le taux de change entre deux devises.
         
         Args:
             from_currency: Devise source
             to_currency: Devise cible
+            at: Date de valeur (défaut: taux le plus récent)
             
         Returns:
             Taux de change ou None si non trouvé
         """
-        key = self._get_rate_key(from_currency, to_currency)
-        return self._exchange_rates.get(key)
+        if at is not None:
+            history = self._table.history.get(from_currency.ordinal, _NO_RATES).get(
+                to_currency.ordinal)
+            return history.at(at) if history is not None else None
+        try:
+            return self._table.matrix[from_currency.ordinal][to_currency.ordinal]
+        except IndexError:
+            return None
     
-    def convert(self, money: Money, target_currency: Currency) -> Money:
+    def convert(self, money: Money, target_currency: Currency, 
+                at: Optional[datetime] = None) -> Money:
         """
         Convertit une somme d'argent vers une devise cible.
         
         Args:
             money: Somme d'argent à convertir
             target_currency: Devise cible
+            at: Date de valeur (défaut: taux les plus récents)
             
         Returns:
             Nouvelle instance Money dans la devise cible
@@ -124,85 +472,535 @@ class CurrencyConverter:
             ValueError: Si la conversion n'est pas possible
         """
         if money.currency == target_currency:
-            return Money(money.amount, target_currency)
+            return Money._new(money._units, money._exp, target_currency)
         
-        # Chercher le taux de change direct
-        exchange_rate = self.get_exchange_rate(money.currency, target_currency)
-        
-        if exchange_rate is None:
-            # Essayer la conversion via une devise pivot (EUR)
-            from currency import EUR
-            
-            if money.currency != EUR and target_currency != EUR:
-                # Convertir d'abord vers EUR puis vers la devise cible
-                eur_money = self._convert_via_pivot(money, EUR)
-                if eur_money:
-                    return self.convert(eur_money, target_currency)
-            
+        rate = self._resolve_rate(money.currency, target_currency, at)
+        if rate is None:
             raise ValueError(
                 f"Impossible de convertir {money.currency.code} vers {target_currency.code}. "
                 f"Taux de change non disponible."
             )
         
-        converted_amount = money.amount * exchange_rate.rate
-        return Money(converted_amount, target_currency)
+        digits, places = _decimal_digits(rate)
+        return money._times(digits, places, target_currency)
     
-    def _convert_via_pivot(self, money: Money, pivot_currency: Currency) -> Optional[Money]:
+    def pair(self, from_currency: Currency, to_currency: Currency) -> 'PairConverter':
         """
-        Convertit via une devise pivot.
+        Crée un convertisseur dédié à une paire de devises.
+        
+        Le taux (direct ou croisé) est résolu une fois; il est résolu à
+        nouveau automatiquement quand une nouvelle version des taux est
+        publiée.
         
         Args:
-            money: Somme à convertir
-            pivot_currency: Devise pivot
+            from_currency: Devise source
+            to_currency: Devise cible
             
         Returns:
-            Somme convertie vers la devise pivot ou None
+            Fonction convertissant un Money de from_currency vers to_currency
+            
+        Raises:
+            ValueError: Si la conversion n'est pas possible
+            
+        Exemple:
+            eur_to_usd = converter.pair(EUR, USD)
+            dollars = [eur_to_usd(price) for price in prices]
         """
-        exchange_rate = self.get_exchange_rate(money.currency, pivot_currency)
-        if exchange_rate is None:
-            return None
+        return PairConverter(self, from_currency, to_currency)
+    
+    def convert_many(self, items: Iterable[Money], target_currency: Currency, 
+                     chunk_size: int = 1024) -> Iterator[Money]:
+        """
+        Convertit une suite de montants vers une même devise cible.
+        
+        Voir convert_pairs.
+        
+        Args:
+            items: Montants à convertir (liste ou générateur)
+            target_currency: Devise cible
+            chunk_size: Nombre de montants traités par lot
+            
+        Returns:
+            Générateur des montants convertis, dans l'ordre des entrées
+        """
+        return self.convert_pairs(((money, target_currency) for money in items), chunk_size)
+    
+    def convert_pairs(self, items: Iterable[Tuple[Money, Currency]], 
+                      chunk_size: int = 1024) -> Iterator[Money]:
+        """
+        Convertit une suite de (montant, devise cible).
+        
+        Les entrées sont lues par lots de chunk_size, ce qui borne la mémoire
+        utilisée pour un générateur. Le taux de chaque paire de devises n'est
+        résolu qu'une fois, et les montants identiques d'un même lot ne sont
+        convertis qu'une fois. Toutes les conversions utilisent la version
+        des taux courante au premier résultat.
+        
+        Args:
+            items: Couples (montant, devise cible) (liste ou générateur)
+            chunk_size: Nombre de couples traités par lot
+            
+        Returns:
+            Générateur des montants convertis, dans l'ordre des entrées
+            
+        Raises:
+            ValueError: Au moment de produire un montant dont la conversion
+                n'est pas possible
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size doit être au moins 1")
+        return self._convert_pairs(iter(items), chunk_size)
+    
+    def _convert_pairs(self, iterator: Iterator[Tuple[Money, Currency]], 
+                       chunk_size: int) -> Iterator[Money]:
+        """Générateur de convert_pairs (taux figés au premier résultat)."""
+        snapshot = RateSnapshot(self._table)
+        # Paire de numéros -> taux décomposé (chiffres, décimales)
+        factors: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+            
+            results: Dict[Tuple[int, int, int, int], Money] = {}
+            for money, target_currency in chunk:
+                source, target = money.currency.ordinal, target_currency.ordinal
+                key = (money._units, money._exp, source, target)
+                result = results.get(key)
+                if result is None:
+                    if source == target:
+                        result = Money._new(money._units, money._exp, target_currency)
+                    else:
+                        factor = factors.get((source, target))
+                        if factor is None:
+                            rate = snapshot._resolve_rate(money.currency, target_currency)
+                            if rate is None:
+                                raise ValueError(
+                                    f"Impossible de convertir {money.currency.code} vers "
+                                    f"{target_currency.code}. Taux de change non disponible."
+                                )
+                            factor = factors[(source, target)] = _decimal_digits(rate)
+                        result = money._times(factor[0], factor[1], target_currency)
+                    results[key] = result
+                yield result
+    
+    def _resolve_rate(self, from_currency: Currency, to_currency: Currency, 
+                      at: Optional[datetime] = None) -> Optional[Decimal]:
+        """
+        Détermine le taux à appliquer pour une conversion.
+        
+        Utilise le taux croisé du plus court chemin dans le graphe des taux
+        (le taux direct s'il existe), calculé une fois par devise source puis
+        mis en cache. Pour une date de valeur, le chemin est calculé sur les
+        taux applicables à cette date, sans mise en cache.
+        
+        Args:
+            from_currency: Devise source
+            to_currency: Devise cible
+            at: Date de valeur (défaut: taux les plus récents)
+            
+        Returns:
+            Taux de conversion, ou None si la conversion n'est pas possible
+        """
+        table = self._table
+        source = from_currency.ordinal
+        if at is not None:
+            history = table.history.get(source, _NO_RATES).get(to_currency.ordinal)
+            direct = history.at(at) if history is not None else None
+            if direct is not None:
+                return direct.rate
+            return _CrossRates(source, table.matrix_at(at)).rates.get(to_currency.ordinal)
+        
+        cross = table.cross_rates.get(source)
+        if cross is None:
+            cross = table.cross_rates[source] = _CrossRates(source, table.matrix)
+        return cross.rates.get(to_currency.ordinal)
+    
+    def _iter_rates(self) -> Iterator[ExchangeRate]:
+        """Parcourt tous les taux de change enregistrés."""
+        for rates in self._table.rates_by_source.values():
+            yield from rates.values()
+    
+    def list_available_currencies(self) -> AbstractSet[Currency]:
+        """
+        Liste toutes les devises disponibles pour conversion.
+        
+        Returns:
+            Vue en lecture seule de l'ensemble des devises disponibles
+        """
+        return self._table.currencies.keys()
+    
+    def get_all_rates_for_currency(self, currency: Currency) -> Mapping[Currency, ExchangeRate]:
+        """
+        Récupère tous les taux de change depuis une devise donnée.
+        
+        Args:
+            currency: Devise source
+            
+        Returns:
+            Vue en lecture seule des taux de change disponibles
+        """
+        rates = self._table.rates_by_source.get(currency.ordinal)
+        if rates is None:
+            return _NO_RATES
+        return MappingProxyType(rates)
+
+
+class RateSnapshot(_RateQueries):
+    """
+    Version figée des taux d'un convertisseur.
+    
+    Toutes les conversions faites avec un même instantané utilisent les
+    mêmes taux, même si le convertisseur est mis à jour entre-temps.
+    """
+    
+    __slots__ = ('_table',)
+    
+    def __init__(self, table: _RateTable):
+        """
+        Initialise l'instantané.
         
-        converted_amount = money.amount * exchange_rate.rate
-        return Money(converted_amount, pivot_currency)
+        Args:
+            table: Version de la table des taux à figer
+        """
+        self._table = table
+    
+    def __repr__(self) -> str:
+        return f"RateSnapshot(version={self._table.version})"
+
+
+class PairConverter:
+    """
+    Conversion d'une paire de devises liée à son taux (voir pair()).
+    
+    Le taux est conservé avec la version de table dont il provient; un
+    appel ne coûte qu'une comparaison de version, une multiplication et la
+    construction du Money résultat. Version, taux et taux décomposé forment
+    un seul tuple, remplacé d'un bloc: un appel concurrent à une nouvelle
+    résolution lit l'ancien tuple ou le nouveau, jamais un mélange.
+    """
+    
+    __slots__ = ('_rates', '_source', '_target', '_binding')
     
-    def _get_rate_key(self, from_currency: Currency, to_currency: Currency) -> str:
+    def __init__(self, rates: _RateQueries, from_currency: Currency, to_currency: Currency):
         """
-        Génère une clé unique pour un taux de change.
+        Initialise le convertisseur de paire.
         
         Args:
+            rates: Convertisseur ou instantané fournissant les taux
             from_currency: Devise source
             to_currency: Devise cible
             
+        Raises:
+            ValueError: Si la conversion n'est pas possible
+        """
+        self._rates = rates
+        self._source = from_currency
+        self._target = to_currency
+        self._bind(rates._table)
+    
+    def _bind(self, table: _RateTable) -> Tuple[_RateTable, Decimal, int, int]:
+        """
+        Résout le taux de la paire dans une version de la table.
+        
+        Args:
+            table: Version de la table des taux
+            
+        Returns:
+            Tuple (table, taux, chiffres, décimales du taux), aussi conservé
+        """
+        if self._source == self._target:
+            rate = Decimal('1')
+        else:
+            rate = RateSnapshot(table)._resolve_rate(self._source, self._target)
+            if rate is None:
+                raise ValueError(
+                    f"Impossible de convertir {self._source.code} vers {self._target.code}. "
+                    f"Taux de change non disponible."
+                )
+        binding = (table, rate) + _decimal_digits(rate)
+        self._binding = binding
+        return binding
+    
+    @property
+    def rate(self) -> Decimal:
+        """Taux de conversion courant de la paire."""
+        binding = self._binding
+        table = self._rates._table
+        if table is not binding[0]:
+            binding = self._bind(table)
+        return binding[1]
+    
+    def __call__(self, money: Money) -> Money:
+        """
+        Convertit un montant de la devise source vers la devise cible.
+        
+        Args:
+            money: Montant dans la devise source
+            
+        Returns:
+            Nouvelle instance Money dans la devise cible
+            
+        Raises:
+            ValueError: Si le montant n'est pas dans la devise source
+        """
+        binding = self._binding
+        table = self._rates._table
+        if table is not binding[0]:
+            binding = self._bind(table)
+        if money.currency != self._source:
+            raise ValueError(
+                f"Montant en {money.currency.code}, attendu en {self._source.code}"
+            )
+        return money._times(binding[2], binding[3], self._target)
+    
+    def __repr__(self) -> str:
+        return f"PairConverter({self._source.code} → {self._target.code}: {self._binding[1]})"
+
+
+class _LiveCurrencies(AbcSet):
+    """Vue en lecture seule des devises de la table courante d'un convertisseur."""
+    
+    __slots__ = ('_converter',)
+    
+    def __init__(self, converter: 'CurrencyConverter'):
+        self._converter = converter
+    
+    def __contains__(self, currency) -> bool:
+        return currency in self._converter._table.currencies
+    
+    def __iter__(self) -> Iterator[Currency]:
+        return iter(self._converter._table.currencies)
+    
+    def __len__(self) -> int:
+        return len(self._converter._table.currencies)
+
+
+class _LiveRates(AbcMapping):
+    """Vue en lecture seule des taux depuis une devise, sur la table courante."""
+    
+    __slots__ = ('_converter', '_source')
+    
+    def __init__(self, converter: 'CurrencyConverter', source: int):
+        self._converter = converter
+        self._source = source
+    
+    def _rates(self) -> Mapping[Currency, ExchangeRate]:
+        return self._converter._table.rates_by_source.get(self._source, _NO_RATES)
+    
+    def __getitem__(self, currency: Currency) -> ExchangeRate:
+        return self._rates()[currency]
+    
+    def __iter__(self) -> Iterator[Currency]:
+        return iter(self._rates())
+    
+    def __len__(self) -> int:
+        return len(self._rates())
+
+
+class CurrencyConverter(_RateQueries):
+    """
+    Convertisseur de devises gérant les taux de change.
+    
+    Les taux sont publiés sous forme de versions immuables: les lectures
+    (convert, get_exchange_rate...) ne prennent aucun verrou et voient
+    toujours une version cohérente, pendant qu'un autre thread met les taux
+    à jour. Les écritures sont sérialisées entre elles.
+    
+    Chaque paire conserve l'historique de ses taux, trié par horodatage,
+    pour les conversions à une date de valeur (convert(..., at=date)).
+    """
+    
+    def __init__(self, history_limit: Optional[int] = 1000):
+        """
+        Initialise le convertisseur avec des taux par défaut.
+        
+        Args:
+            history_limit: Nombre maximal de taux conservés par paire (les
+                plus anciens sont supprimés), ou None pour ne pas limiter
+        """
+        if history_limit is not None and history_limit < 1:
+            raise ValueError("history_limit doit être au moins 1")
+        self.history_limit = history_limit
+        # Version publiée de la table des taux
+        self._table = _RateTable()
+        # Version en préparation pendant une mise à jour groupée
+        self._draft: Optional[_RateTable] = None
+        self._write_lock = RLock()
+        # Mise à jour groupée en cours (voir batch_update)
+        self._batch_depth = 0
+        self._batch_timestamp: Optional[datetime] = None
+        self._pending_changes: List[Tuple[int, int, bool]] = []
+        self._load_default_rates()
+    
+    def _load_default_rates(self) -> None:
+        """
+        Charge des taux de change par défaut (simulés).
+        
+        La table par défaut est construite une seule fois et partagée par
+        toutes les instances.
+        """
+        self._table = _DEFAULT_TABLE
+    
+    def snapshot(self) -> RateSnapshot:
+        """
+        Fige la version courante des taux.
+        
         Returns:
-            Clé sous forme de string
+            Instantané utilisable pour un lot de conversions cohérent
+            
+        Exemple:
+            rates = converter.snapshot()
+            totals = [rates.convert(line, EUR) for line in lines]
+        """
+        return RateSnapshot(self._table)
+    
+    def add_exchange_rate(self, from_currency: Currency, to_currency: Currency, 
+                         rate: Decimal, timestamp: Optional[datetime] = None) -> None:
         """
-        return f"{from_currency.code}_{to_currency.code}"
+        Ajoute ou met à jour un taux de change.
+        
+        Le taux est ajouté à l'historique de la paire; il ne remplace le
+        taux courant que s'il est le plus récent (un taux antidaté ne sert
+        qu'aux conversions à une date de valeur).
+        
+        Args:
+            from_currency: Devise source
+            to_currency: Devise cible
+            rate: Taux de change
+            timestamp: Horodatage (optionnel)
+        """
+        with self._write_lock:
+            exchange_rate = ExchangeRate(from_currency, to_currency, rate, 
+                                         timestamp or self._batch_timestamp)
+            if self._draft is None:
+                self._draft = self._table.copy()
+            change = self._draft.store(exchange_rate, self.history_limit)
+            changes = [change] if change is not None else []
+            
+            if self._batch_depth:
+                self._pending_changes.extend(changes)
+            else:
+                self._publish(changes)
+    
+    def prune_history(self, before: datetime) -> None:
+        """
+        Supprime l'historique des taux antérieur à une date.
+        
+        Le taux applicable à cette date est conservé pour chaque paire, les
+        conversions à partir de cette date restent donc possibles.
+        
+        Args:
+            before: Date limite
+        """
+        with self._write_lock:
+            if self._draft is None:
+                self._draft = self._table.copy()
+            self._draft.prune(before)
+            if not self._batch_depth:
+                self._publish([])
+    
+    def add_exchange_rates(self, rates: Mapping[Tuple[Currency, Currency], Decimal], 
+                           timestamp: Optional[datetime] = None, 
+                           inverse: bool = False) -> None:
+        """
+        Ajoute ou met à jour un ensemble de taux de change en une passe.
+        
+        Tous les taux partagent le même horodatage et sont publiés ensemble
+        dans une seule nouvelle version.
+        
+        Args:
+            rates: Taux par paire {(devise source, devise cible): taux}
+            timestamp: Horodatage commun (défaut: maintenant)
+            inverse: Ajouter aussi les taux inverses (1 / taux)
+        """
+        with self.batch_update(timestamp):
+            for (from_currency, to_currency), rate in rates.items():
+                rate = rate if isinstance(rate, Decimal) else Decimal(str(rate))
+                self.add_exchange_rate(from_currency, to_currency, rate)
+                if inverse and rate != 0:
+                    self.add_exchange_rate(to_currency, from_currency, Decimal('1') / rate)
+    
+    @contextmanager
+    def batch_update(self, timestamp: Optional[datetime] = None) -> Iterator['CurrencyConverter']:
+        """
+        Regroupe plusieurs mises à jour de taux.
+        
+        Dans le bloc, les taux ajoutés sans horodatage partagent le même.
+        Les modifications sont publiées en une seule nouvelle version à la
+        sortie du bloc: jusque-là, les lectures voient la version précédente.
+        Si une exception sort du bloc le plus externe, les modifications
+        sont abandonnées et rien n'est publié. Les autres écritures
+        attendent la fin du bloc.
+        
+        Args:
+            timestamp: Horodatage commun (défaut: maintenant)
+            
+        Exemple:
+            with converter.batch_update():
+                converter.add_exchange_rate(EUR, USD, Decimal('1.08'))
+                converter.add_exchange_rate(EUR, GBP, Decimal('0.85'))
+        """
+        with self._write_lock:
+            outermost = self._batch_depth == 0
+            if outermost:
+                self._batch_timestamp = timestamp or datetime.now()
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                if outermost:
+                    # Abandon de la version en préparation
+                    self._draft = None
+                    self._pending_changes = []
+                raise
+            finally:
+                self._batch_depth -= 1
+                if outermost:
+                    changes, self._pending_changes = self._pending_changes, []
+                    self._batch_timestamp = None
+                    self._publish(changes)
     
-    def list_available_currencies(self) -> set[Currency]:
+    def _publish(self, changes: List[Tuple[int, int, bool]]) -> None:
+        """
+        Publie la version en préparation (verrou d'écriture détenu).
+        
+        Args:
+            changes: Modifications (source, cible, taux déjà existant)
+        """
+        draft, self._draft = self._draft, None
+        if draft is None:
+            return
+        draft.invalidate(changes)
+        draft._owned = None
+        self._table = draft
+    
+    def list_available_currencies(self) -> AbstractSet[Currency]:
         """
         Liste toutes les devises disponibles pour conversion.
         
+        La vue suit les versions publiées ultérieurement.
+        
         Returns:
-            Ensemble des devises disponibles
+            Vue en lecture seule de l'ensemble des devises disponibles
         """
-        currencies = set()
-        for exchange_rate in self._exchange_rates.values():
-            currencies.add(exchange_rate.from_currency)
-            currencies.add(exchange_rate.to_currency)
-        return currencies
+        return _LiveCurrencies(self)
     
-    def get_all_rates_for_currency(self, currency: Currency) -> Dict[Currency, ExchangeRate]:
+    def get_all_rates_for_currency(self, currency: Currency) -> Mapping[Currency, ExchangeRate]:
         """
         Récupère tous les taux de change depuis une devise donnée.
         
+        La vue suit les versions publiées ultérieurement.
+        
         Args:
             currency: Devise source
             
         Returns:
-            Dictionnaire des taux de change disponibles
+            Vue en lecture seule des taux de change disponibles
         """
-        rates = {}
-        for exchange_rate in self._exchange_rates.values():
-            if exchange_rate.from_currency == currency:
-                rates[exchange_rate.to_currency] = exchange_rate
-        return rates
\ No newline at end of file
+        return _LiveRates(self, currency.ordinal)
+
+
+# Table des taux par défaut, partagée par tous les convertisseurs
+_DEFAULT_TABLE = _build_default_table()
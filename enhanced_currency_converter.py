@@ -2,28 +2,122 @@
 Convertisseur de devise amélioré avec taux en temps réel.
 """
 
+import time
 from decimal import Decimal
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from datetime import datetime
-from currency import Currency
-from money import Money
+from currency import Currency, registry
+from money import Money, _decimal_digits
 from currency_converter import ExchangeRate
 from exchange_rate_api import ExchangeRateAPI
 
 
+class LivePairConverter:
+    """
+    Conversion d'une paire de devises liée à son taux en temps réel.
+    
+    Le taux est résolu à nouveau quand le cache du service API change ou
+    que la durée de validité du cache est écoulée. Taux et validité forment
+    un seul tuple, remplacé d'un bloc (voir PairConverter).
+    """
+    
+    __slots__ = ('_api', '_source', '_target', '_binding')
+    
+    def __init__(self, api_service: ExchangeRateAPI, from_currency: Currency, 
+                 to_currency: Currency):
+        """
+        Initialise le convertisseur de paire.
+        
+        Args:
+            api_service: Service fournissant les taux
+            from_currency: Devise source
+            to_currency: Devise cible
+            
+        Raises:
+            ValueError: Si le taux n'est pas disponible
+        """
+        self._api = api_service
+        self._source = from_currency
+        self._target = to_currency
+        self._bind()
+    
+    def _bind(self) -> Tuple[int, float, Decimal, int, int]:
+        """
+        Récupère le taux courant de la paire.
+        
+        Returns:
+            Tuple (génération, expiration, taux, chiffres, décimales du
+            taux), aussi conservé
+        """
+        if self._source == self._target:
+            rate = Decimal('1')
+        else:
+            rate = self._api.get_single_rate(self._source, self._target)
+            if rate is None:
+                raise ValueError(
+                    f"Impossible de récupérer le taux {self._source.code} "
+                    f"vers {self._target.code}"
+                )
+        expires = time.monotonic() + self._api.cache_duration.total_seconds()
+        binding = (self._api.generation, expires, rate) + _decimal_digits(rate)
+        self._binding = binding
+        return binding
+    
+    @property
+    def rate(self) -> Decimal:
+        """Taux de conversion courant de la paire."""
+        binding = self._binding
+        if self._api.generation != binding[0] or time.monotonic() >= binding[1]:
+            binding = self._bind()
+        return binding[2]
+    
+    def __call__(self, money: Money) -> Money:
+        """
+        Convertit un montant de la devise source vers la devise cible.
+        
+        Args:
+            money: Montant dans la devise source
+            
+        Returns:
+            Nouvelle instance Money dans la devise cible
+            
+        Raises:
+            ValueError: Si le montant n'est pas dans la devise source
+        """
+        binding = self._binding
+        if self._api.generation != binding[0] or time.monotonic() >= binding[1]:
+            binding = self._bind()
+        if money.currency != self._source:
+            raise ValueError(
+                f"Montant en {money.currency.code}, attendu en {self._source.code}"
+            )
+        return money._times(binding[3], binding[4], self._target)
+    
+    def __repr__(self) -> str:
+        return f"LivePairConverter({self._source.code} → {self._target.code}: {self._binding[2]})"
+
+
 class EnhancedCurrencyConverter:
     """
     Convertisseur de devise avec taux de change en temps réel.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache=None,
+                 single_base: Optional[str] = None, background_refresh: bool = False):
         """
         Initialise le convertisseur amélioré.
         
         Args:
             api_key: Clé API optionnelle pour certains services
+            cache: Cache des taux (RateCache, SQLiteRateCache...), optionnel
+            single_base: Devise pivot pour une seule requête par durée de
+                cache (voir ExchangeRateAPI), optionnel
+            background_refresh: Actualiser les taux en arrière-plan et
+                servir les taux expirés sans attendre le réseau
         """
-        self.api_service = ExchangeRateAPI(api_key)
+        self.api_service = ExchangeRateAPI(api_key, cache, single_base)
+        if background_refresh:
+            self.api_service.start_background_refresh()
         self._exchange_rates: Dict[str, ExchangeRate] = {}
     
     def convert(self, money: Money, target_currency: Currency, 
@@ -40,13 +134,12 @@ class EnhancedCurrencyConverter:
             Nouvelle instance Money dans la devise cible
         """
         if money.currency == target_currency:
-            return Money(money.amount, target_currency)
+            return Money._new(money._units, money._exp, target_currency)
         
-        if not use_cached:
-            self.api_service.clear_cache()
-        
-        # Récupérer le taux depuis l'API
-        rate = self.api_service.get_single_rate(money.currency, target_currency)
+        # Récupérer le taux depuis l'API (sans cache: requête forcée, qui
+        # met à jour le cache partagé sans le vider)
+        rate = self.api_service.get_single_rate(money.currency, target_currency,
+                                                force=not use_cached)
         
         if rate is None:
             raise ValueError(
@@ -67,8 +160,24 @@ class EnhancedCurrencyConverter:
         self._exchange_rates[key] = exchange_rate
         
         # Effectuer la conversion
-        converted_amount = money.amount * rate
-        return Money(converted_amount, target_currency)
+        digits, places = _decimal_digits(rate)
+        return money._times(digits, places, target_currency)
+    
+    def pair(self, from_currency: Currency, to_currency: Currency) -> LivePairConverter:
+        """
+        Crée un convertisseur dédié à une paire de devises.
+        
+        Args:
+            from_currency: Devise source
+            to_currency: Devise cible
+            
+        Returns:
+            Fonction convertissant un Money de from_currency vers to_currency
+            
+        Raises:
+            ValueError: Si le taux n'est pas disponible
+        """
+        return LivePairConverter(self.api_service, from_currency, to_currency)
     
     def get_current_rate(self, from_currency: Currency, 
                         to_currency: Currency) -> Optional[ExchangeRate]:
@@ -132,14 +241,7 @@ class EnhancedCurrencyConverter:
         Returns:
             Instance de Currency ou None
         """
-        from currency import EUR, USD, GBP, JPY, CHF, CAD, AUD
-        
-        currency_map = {
-            'EUR': EUR, 'USD': USD, 'GBP': GBP,
-            'JPY': JPY, 'CHF': CHF, 'CAD': CAD, 'AUD': AUD
-        }
-        
-        return currency_map.get(code)
+        return registry.get(code)
     
     def _get_rate_key(self, from_currency: Currency, 
                      to_currency: Currency) -> str:
@@ -150,6 +252,10 @@ class EnhancedCurrencyConverter:
         """Retourne des informations sur le cache des taux."""
         return self.api_service.get_cache_info()
     
+    def get_provider_info(self) -> Dict:
+        """Retourne la santé mesurée des APIs de taux."""
+        return self.api_service.get_provider_info()
+    
     def clear_cache(self):
         """Vide le cache des taux de change."""
         self.api_service.clear_cache()
@@ -2,11 +2,59 @@
 Service API pour récupérer les taux de change en temps réel.
 """
 
-import requests
-from typing import Dict, Optional
+import logging
+import queue
+import threading
+import time
+from functools import partial
+from typing import Callable, Dict, List, Optional
 from datetime import datetime, timedelta
-from decimal import Decimal
+from decimal import Context, Decimal
 from currency import Currency
+from http_client import HttpClient, default_client
+from provider_health import ProviderHealth
+from rate_cache import RateCache
+
+
+logger = logging.getLogger(__name__)
+
+def _derive_cross_rates(pivot_rates: Dict[str, Decimal], pivot_code: str, base_code: str,
+                        context: Context) -> Optional[Dict[str, Decimal]]:
+    """
+    Calcule les taux depuis une devise de base à partir des taux d'un pivot.
+    
+    Taux base → X = taux pivot → X / taux pivot → base, divisé dans le
+    contexte fourni (nombre de chiffres significatifs explicite).
+    
+    Args:
+        pivot_rates: Taux depuis le pivot {code_devise: taux}
+        pivot_code: Code de la devise pivot
+        base_code: Code de la devise de base souhaitée
+        context: Contexte Decimal des divisions
+        
+    Returns:
+        Taux depuis la devise de base, ou None si elle est absente
+    """
+    if base_code == pivot_code:
+        return dict(pivot_rates)
+    
+    base_rate = pivot_rates.get(base_code)
+    if not base_rate:
+        return None
+    rates = {code: context.divide(rate, base_rate) for code, rate in pivot_rates.items()}
+    rates.setdefault(pivot_code, context.divide(Decimal(1), base_rate))
+    return rates
+
+
+class _Flight:
+    """Requête en cours, partagée par les appelants d'une même clé."""
+    
+    __slots__ = ('done', 'result', 'error')
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
 
 
 class ExchangeRateAPI:
@@ -14,16 +62,42 @@ class ExchangeRateAPI:
     Service pour récupérer les taux de change depuis des APIs externes.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache=None,
+                 single_base: Optional[str] = None, cross_rate_precision: int = 12,
+                 http_client: Optional[HttpClient] = None,
+                 hedge_delay: Optional[float] = 0.5):
         """
         Initialise le service API.
         
         Args:
             api_key: Clé API optionnelle pour certains services
+            cache: Cache des taux, RateCache ou SQLiteRateCache pour le
+                partager entre processus (défaut: RateCache valide 1 heure)
+            single_base: Devise pivot (ex: "EUR"): une seule requête par
+                durée de cache, les taux des autres bases étant calculés
+                localement (None: une requête par devise de base)
+            cross_rate_precision: Chiffres significatifs des taux croisés
+                calculés localement
+            http_client: Client HTTP (défaut: client partagé du processus)
+            hedge_delay: Délai (s) sans réponse après lequel l'API suivante
+                est interrogée en parallèle (None: seulement après un échec)
         """
         self.api_key = api_key
-        self.cache = {}
-        self.cache_duration = timedelta(hours=1)  # Cache valide 1 heure
+        self.http = http_client if http_client is not None else default_client()
+        self.hedge_delay = hedge_delay
+        self.single_base = single_base
+        # Divisions des taux croisés: précision explicite, arrondi bancaire
+        self.cross_rate_context = Context(prec=cross_rate_precision)
+        self.cache = cache if cache is not None else RateCache(ttl=timedelta(hours=1))
+        # Incrémenté à chaque changement du cache (nouveaux taux, vidage)
+        self.generation = 0
+        self._refresher: Optional[_BackgroundRefresher] = None
+        # Requêtes en cours, par devise interrogée (voir _single_flight)
+        self._flights: Dict[str, _Flight] = {}
+        self._flights_lock = threading.Lock()
+        # Santé mesurée de chaque API, par nom (voir ProviderHealth)
+        self.provider_health: Dict[str, ProviderHealth] = {}
+        self._health_lock = threading.Lock()
         
         # URLs des APIs (par ordre de préférence)
         self.apis = [
@@ -45,42 +119,197 @@ class ExchangeRateAPI:
             }
         ]
     
-    def get_exchange_rates(self, base_currency: Currency) -> Dict[str, Decimal]:
+    @property
+    def cache_duration(self) -> timedelta:
+        """Durée de validité des taux en cache."""
+        return self.cache.ttl
+    
+    @cache_duration.setter
+    def cache_duration(self, duration: timedelta) -> None:
+        self.cache.ttl = duration
+    
+    def get_exchange_rates(self, base_currency: Currency, 
+                           force: bool = False) -> Dict[str, Decimal]:
         """
         Récupère les taux de change pour une devise de base.
         
         Args:
             base_currency: Devise de base
+            force: Interroger les APIs même si le cache est valide (le
+                cache est mis à jour, pas vidé)
             
         Returns:
             Dictionnaire des taux de change {code_devise: taux}
         """
-        cache_key = (f"{base_currency.code}_"
-                      f"{datetime.now().strftime('%Y%m%d%H')}")
-        
-        # Vérifier le cache
-        if cache_key in self.cache:
-            cached_data = self.cache[cache_key]
-            if datetime.now() - cached_data['timestamp'] < self.cache_duration:
-                return cached_data['rates']
+        if not force:
+            # Vérifier le cache
+            rates = self.cache.get(base_currency.code)
+            if rates is not None:
+                return rates
+            
+            # Actualisation en arrière-plan: derniers taux connus tout de suite
+            refresher = self._refresher
+            if refresher is not None:
+                stale = self.cache.get_stale(base_currency.code)
+                if stale is not None:
+                    refresher.request(base_currency.code)
+                    return stale
         
         # Récupérer depuis l'API
-        rates = self._fetch_from_api(base_currency.code)
-        
+        rates = self._refresh(base_currency.code, force)
         if rates:
-            # Mettre en cache
-            self.cache[cache_key] = {
-                'rates': rates,
-                'timestamp': datetime.now()
-            }
             return rates
         
-        # Fallback vers des taux par défaut si API échoue
+        # Si les APIs échouent: derniers taux connus, même expirés,
+        # puis taux par défaut
+        stale = self.cache.get_stale(base_currency.code)
+        if stale is not None:
+            return stale
         return self._get_fallback_rates(base_currency.code)
     
+    def _refresh(self, base_code: str, force: bool = False) -> Optional[Dict[str, Decimal]]:
+        """
+        Récupère les taux d'une devise de base et les met en cache.
+        
+        Les appels simultanés pour une même requête sont regroupés: le
+        premier interroge les APIs, les suivants attendent son résultat (ou
+        son exception). En mode pivot, toutes les bases partagent la
+        requête au pivot. Sauf actualisation forcée, un appel qui trouve
+        les taux en cache en devenant meneur (requête identique terminée
+        depuis son échec de cache) n'interroge pas les APIs.
+        
+        Args:
+            base_code: Code de la devise de base
+            force: Interroger les APIs même si le cache est valide
+            
+        Returns:
+            Taux récupérés ou None si les APIs échouent
+        """
+        if self.single_base:
+            entries = self._single_flight(self.single_base,
+                                          partial(self._fetch_single_base, force=force))
+            if entries is None:
+                return None
+            rates = entries.get(base_code)
+            return rates if rates is not None else self.cache.peek(base_code)
+        return self._single_flight(base_code, partial(self._fetch_and_store, force=force))
+    
+    def _single_flight(self, key: str, fetch: Callable[[str], Optional[Dict]]) -> Optional[Dict]:
+        """
+        Exécute fetch(key), une seule fois à la fois par clé.
+        
+        Args:
+            key: Clé de la requête (code de la devise interrogée)
+            fetch: Fonction de récupération
+            
+        Returns:
+            Résultat de la requête en cours ou lancée par cet appel
+        """
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        
+        try:
+            flight.result = fetch(key)
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+    
+    def _fetch_and_store(self, base_code: str, force: bool = False) -> Optional[Dict[str, Decimal]]:
+        """Récupère les taux d'une devise de base et les met en cache."""
+        if not force:
+            rates = self.cache.peek(base_code)
+            if rates is not None:
+                return rates
+        rates = self._fetch_from_api(base_code)
+        if rates:
+            # Mettre en cache
+            self.cache.put(base_code, rates)
+            self.generation += 1
+        return rates
+    
+    def start_background_refresh(self, interval: float = 60.0,
+                                 refresh_ahead: float = 0.8) -> None:
+        """
+        Active l'actualisation des taux en arrière-plan.
+        
+        Un thread actualise toutes les interval secondes les bases en cache
+        dont l'âge atteint refresh_ahead × durée de validité, avant leur
+        expiration, si elles ont été lues depuis moins d'une durée de
+        validité: les bases délaissées expirent normalement. Une entrée expirée est alors servie immédiatement
+        (« stale-while-revalidate ») et son actualisation est demandée au
+        thread: seule une base jamais récupérée bloque encore l'appelant.
+        
+        Args:
+            interval: Période de vérification (s)
+            refresh_ahead: Fraction de la durée de validité à partir de
+                laquelle une entrée est actualisée
+        """
+        if self._refresher is None:
+            self._refresher = _BackgroundRefresher(self, interval, refresh_ahead)
+    
+    def stop_background_refresh(self) -> None:
+        """Arrête l'actualisation en arrière-plan (sans attendre une requête en cours)."""
+        refresher, self._refresher = self._refresher, None
+        if refresher is not None:
+            refresher.stop()
+    
+    def _fetch_single_base(self, pivot_code: str,
+                           force: bool = False) -> Optional[Dict[str, Dict[str, Decimal]]]:
+        """
+        Récupère les taux du pivot et en déduit toutes les devises de base.
+        
+        Toutes les bases sont mises en cache ensemble, avec la même date de
+        stockage: elles expirent en même temps que les taux du pivot.
+        
+        Args:
+            pivot_code: Code de la devise pivot
+            force: Interroger les APIs même si les taux du pivot sont en cache
+            
+        Returns:
+            Taux par devise de base (vide si ceux du cache sont encore
+            valides), ou None si indisponibles
+        """
+        if not force and self.cache.peek(pivot_code) is not None:
+            return {}
+        pivot_rates = self._fetch_from_api(pivot_code)
+        if not pivot_rates:
+            return None
+        
+        entries = {}
+        for code in set(pivot_rates) | {pivot_code}:
+            rates = _derive_cross_rates(pivot_rates, pivot_code, code,
+                                        self.cross_rate_context)
+            if rates is not None:
+                entries[code] = rates
+        self.cache.put_many(entries)
+        self.generation += 1
+        return entries
+    
     def _fetch_from_api(self, base_code: str) -> Optional[Dict[str, Decimal]]:
         """
-        Récupère les taux depuis les APIs disponibles.
+        Récupère les taux depuis les APIs disponibles, en requêtes couvertes.
+        
+        Les APIs sont classées selon leur santé mesurée (voir
+        _ranked_apis); celles dont le disjoncteur est ouvert sont ignorées.
+        La première est interrogée d'abord; la suivante est lancée en
+        parallèle dès qu'une requête échoue ou que hedge_delay s'écoule sans
+        réponse. La première réponse valide l'emporte: les requêtes encore
+        en cours sont abandonnées (plus de nouvelle tentative) et leurs
+        résultats ignorés.
         
         Args:
             base_code: Code de la devise de base
@@ -88,33 +317,112 @@ class ExchangeRateAPI:
         Returns:
             Dictionnaire des taux ou None si échec
         """
-        for api in self.apis:
-            if api['requires_key'] and not self.api_key:
-                continue
-                
-            try:
-                url = api['url'].format(
-                    base=base_code, 
-                    key=self.api_key if api['requires_key'] else ''
-                )
-                
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                
-                data = response.json()
+        ranked = iter(self._ranked_apis())
+        exhausted = False
+        results: 'queue.Queue' = queue.Queue()
+        cancel = threading.Event()
+        running = 0
+        hedge_at = 0.0
+        
+        try:
+            while True:
+                if not exhausted and (running == 0 or time.monotonic() >= hedge_at):
+                    api = next((api for api in ranked
+                                if self._health_of(api).allow_request()), None)
+                    if api is None:
+                        exhausted = True
+                        continue
+                    threading.Thread(
+                        target=self._query_api_into,
+                        args=(api, base_code, cancel, results),
+                        daemon=True
+                    ).start()
+                    running += 1
+                    hedge_at = (float('inf') if self.hedge_delay is None
+                                else time.monotonic() + self.hedge_delay)
+                    continue
+                if running == 0:
+                    return None
                 
-                # Parser selon l'API
-                if api['name'] == 'exchangerate-api':
-                    return self._parse_exchangerate_api(data)
-                elif api['name'] == 'fixer':
-                    return self._parse_fixer_api(data)
-                elif api['name'] == 'exchangerate-host':
-                    return self._parse_exchangerate_host_api(data)
-                    
-            except Exception as e:
-                print(f"Erreur avec l'API {api['name']}: {e}")
-                continue
+                timeout = None
+                if not exhausted and self.hedge_delay is not None:
+                    timeout = max(0.0, hedge_at - time.monotonic())
+                try:
+                    api, rates, error = results.get(timeout=timeout)
+                except queue.Empty:
+                    continue
+                running -= 1
+                if rates:
+                    return rates
+                logger.warning("Erreur avec l'API %s: %s", api['name'], error or 'réponse invalide')
+                # Échec: l'API suivante est lancée sans attendre
+                hedge_at = 0.0
+        finally:
+            cancel.set()
+    
+    def _health_of(self, api: dict) -> ProviderHealth:
+        """Retourne le suivi de santé d'une API, créé au premier appel."""
+        with self._health_lock:
+            return self.provider_health.setdefault(api['name'], ProviderHealth())
+    
+    def _ranked_apis(self) -> List[dict]:
+        """
+        Classe les APIs utilisables selon leur santé.
+        
+        Disjoncteur fermé d'abord, puis durée attendue d'une réponse valide
+        (latence moyenne / taux de succès); à égalité, l'ordre de self.apis
+        est conservé. Sans mesure, c'est donc l'ordre de préférence.
         
+        Returns:
+            APIs dans l'ordre où les interroger
+        """
+        candidates = [api for api in self.apis if self.api_key or not api['requires_key']]
+        return sorted(candidates, key=lambda api: self._health_of(api).rank())
+    
+    def _query_api_into(self, api: dict, base_code: str, cancel: threading.Event,
+                        results: 'queue.Queue') -> None:
+        """Interroge une API, met à jour sa santé et dépose (api, taux, erreur) dans la file."""
+        health = self._health_of(api)
+        start = time.monotonic()
+        try:
+            rates = self._query_api(api, base_code, cancel)
+        except Exception as e:
+            health.record_failure()
+            results.put((api, None, e))
+            return
+        if rates:
+            health.record_success(time.monotonic() - start)
+        else:
+            health.record_failure()
+        results.put((api, rates, None))
+    
+    def _query_api(self, api: dict, base_code: str,
+                   cancel: Optional[threading.Event] = None) -> Optional[Dict[str, Decimal]]:
+        """
+        Interroge une API et analyse sa réponse.
+        
+        Args:
+            api: Description de l'API (entrée de self.apis)
+            base_code: Code de la devise de base
+            cancel: Événement interrompant les nouvelles tentatives
+            
+        Returns:
+            Dictionnaire des taux ou None si la réponse est invalide
+        """
+        url = api['url'].format(
+            base=base_code, 
+            key=self.api_key if api['requires_key'] else ''
+        )
+        
+        data = self.http.get_json(url, cancel)
+        
+        # Parser selon l'API
+        if api['name'] == 'exchangerate-api':
+            return self._parse_exchangerate_api(data)
+        elif api['name'] == 'fixer':
+            return self._parse_fixer_api(data)
+        elif api['name'] == 'exchangerate-host':
+            return self._parse_exchangerate_host_api(data)
         return None
     
     def _parse_exchangerate_api(self, data: dict) -> Optional[Dict[str, Decimal]]:
@@ -186,36 +494,126 @@ class ExchangeRateAPI:
         # Si devise inconnue, retourner taux vides
         return {}
     
-    def get_single_rate(self, from_currency: Currency, to_currency: Currency) -> Optional[Decimal]:
+    def get_single_rate(self, from_currency: Currency, to_currency: Currency, 
+                        force: bool = False) -> Optional[Decimal]:
         """
         Récupère un taux de change spécifique entre deux devises.
         
         Args:
             from_currency: Devise source
             to_currency: Devise cible
+            force: Interroger les APIs même si le cache est valide
             
         Returns:
             Taux de change ou None si indisponible
         """
-        rates = self.get_exchange_rates(from_currency)
+        rates = self.get_exchange_rates(from_currency, force)
         return rates.get(to_currency.code)
     
     def clear_cache(self):
         """Vide le cache des taux de change."""
         self.cache.clear()
+        self.generation += 1
     
     def get_cache_info(self) -> Dict:
         """
         Retourne des informations sur le cache.
         
         Returns:
-            Informations sur le cache
+            Informations sur le cache (entrées et compteurs hits, misses,
+            evictions, stale_serves), âge des entrées (ages, en secondes),
+            bases expirées (stale_keys) et état de l'actualisation en
+            arrière-plan (background_refresh, None si inactive)
+        """
+        info = self.cache.info()
+        ttl = self.cache_duration.total_seconds()
+        ages = self.cache.ages()
+        info['ages'] = ages
+        info['stale_keys'] = sorted(key for key, age in ages.items() if age >= ttl)
+        refresher = self._refresher
+        info['background_refresh'] = refresher.info() if refresher is not None else None
+        return info
+    
+    def get_provider_info(self) -> Dict[str, Dict]:
         """
+        Retourne la santé mesurée des APIs.
+        
+        Returns:
+            Informations par nom d'API (état du disjoncteur, latence
+            moyenne, taux d'erreur...), dans l'ordre d'interrogation
+        """
+        return {api['name']: self._health_of(api).info() for api in self._ranked_apis()}
+
+
+class _BackgroundRefresher:
+    """Thread d'actualisation des taux d'un ExchangeRateAPI."""
+    
+    def __init__(self, api: ExchangeRateAPI, interval: float, refresh_ahead: float):
+        self.api = api
+        self.interval = interval
+        self.refresh_ahead = refresh_ahead
+        self.refreshes = 0
+        self.failures = 0
+        self.last_refresh: Optional[datetime] = None
+        self._requested = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rate-refresher", daemon=True)
+        self._thread.start()
+    
+    def request(self, base_code: str) -> None:
+        """Demande l'actualisation d'une base dès que possible."""
+        with self._lock:
+            self._requested.add(base_code)
+        self._wake.set()
+    
+    def stop(self) -> None:
+        """Arrête le thread."""
+        self._stopped.set()
+        self._wake.set()
+    
+    def _due(self) -> set:
+        """Bases à actualiser: demandées, ou lues récemment et proches de l'expiration."""
+        with self._lock:
+            bases, self._requested = self._requested, set()
+        ttl = self.api.cache_duration.total_seconds()
+        limit = self.refresh_ahead * ttl
+        # Une entrée non lue depuis une durée de validité n'est plus
+        # actualisée: elle expire, puis l'éviction LRU peut la retirer
+        idle = self.api.cache.idle_times()
+        bases.update(key for key, age in self.api.cache.ages().items()
+                     if age >= limit and idle.get(key, ttl) < ttl)
+        if bases and self.api.single_base:
+            # Une requête au pivot actualise toutes les bases
+            return {self.api.single_base}
+        return bases
+    
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            # Effacé avant le passage: une demande pendant celui-ci le relance
+            self._wake.clear()
+            for base_code in sorted(self._due()):
+                if self._stopped.is_set():
+                    return
+                try:
+                    rates = self.api._refresh(base_code, force=True)
+                except Exception:
+                    rates = None
+                if rates:
+                    self.refreshes += 1
+                    self.last_refresh = datetime.now()
+                else:
+                    self.failures += 1
+            self._wake.wait(self.interval)
+    
+    def info(self) -> Dict:
+        """Retourne l'état de l'actualisation."""
         return {
-            'entries': len(self.cache),
-            'keys': list(self.cache.keys()),
-            'oldest_entry': min(
-                (data['timestamp'] for data in self.cache.values()),
-                default=None
-            )
+            'interval': self.interval,
+            'refresh_ahead': self.refresh_ahead,
+            'refreshes': self.refreshes,
+            'failures': self.failures,
+            'last_refresh': self.last_refresh,
+            'pending': sorted(self._requested),
         } 
\ No newline at end of file
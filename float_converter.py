@@ -0,0 +1,156 @@
+"""
+Conversions approchées en virgule flottante (float64) pour l'analyse.
+"""
+
+from array import array
+from typing import Dict, Iterable, Tuple
+
+from currency import Currency
+from money_array import MoneyArray
+
+
+# Borne de l'erreur relative d'une conversion par rapport au calcul exact
+# en Decimal sur la même valeur d'entrée: arrondi du taux en float (2^-53),
+# du produit (2^-53) et de l'échelle d'unité mineure (2^-53), avec une marge.
+RELATIVE_ERROR_BOUND = 4 * 2.0 ** -53
+
+
+class FloatConverter:
+    """
+    Moteur de conversion approché en float64, adossé à un convertisseur.
+    
+    Les taux et le routage (taux direct ou croisé par le plus court chemin)
+    sont ceux du convertisseur exact; seuls les calculs sont faits en
+    float64. L'erreur relative de chaque montant converti est bornée par
+    RELATIVE_ERROR_BOUND (environ 4,4e-16) par rapport au chemin Decimal,
+    hors conversion initiale des montants en float. À réserver aux tableaux
+    de bord et agrégations: les écritures comptables passent par
+    CurrencyConverter.
+    
+    Exemple:
+        engine = FloatConverter(converter)
+        totals = engine.convert_array(amounts, GBP, EUR)
+    """
+    
+    __slots__ = ('_rates', '_table', '_cache')
+    
+    def __init__(self, rates):
+        """
+        Initialise le moteur.
+        
+        Args:
+            rates: CurrencyConverter ou RateSnapshot fournissant les taux
+        """
+        self._rates = rates
+        self._table = rates._table
+        self._cache: Dict[Tuple[int, int], float] = {}
+    
+    def rate(self, from_currency: Currency, to_currency: Currency) -> float:
+        """
+        Retourne le taux de conversion en float64.
+        
+        Le taux est mis en cache jusqu'à la publication d'une nouvelle
+        version des taux.
+        
+        Args:
+            from_currency: Devise source
+            to_currency: Devise cible
+        
+        Returns:
+            Taux de conversion
+        
+        Raises:
+            ValueError: Si la conversion n'est pas possible
+        """
+        table = self._rates._table
+        if table is not self._table:
+            self._table = table
+            self._cache = {}
+        
+        key = (from_currency.ordinal, to_currency.ordinal)
+        rate = self._cache.get(key)
+        if rate is None:
+            if from_currency == to_currency:
+                rate = 1.0
+            else:
+                exact = self._rates._resolve_rate(from_currency, to_currency)
+                if exact is None:
+                    raise ValueError(
+                        f"Impossible de convertir {from_currency.code} vers {to_currency.code}. "
+                        f"Taux de change non disponible."
+                    )
+                rate = float(exact)
+            self._cache[key] = rate
+        return rate
+    
+    def convert(self, amount: float, from_currency: Currency, to_currency: Currency) -> float:
+        """
+        Convertit un montant.
+        
+        Args:
+            amount: Montant dans la devise source
+            from_currency: Devise source
+            to_currency: Devise cible
+        
+        Returns:
+            Montant approché dans la devise cible
+        """
+        return amount * self.rate(from_currency, to_currency)
+    
+    def convert_array(self, amounts: Iterable[float], from_currency: Currency,
+                      to_currency: Currency) -> array:
+        """
+        Convertit un ensemble de montants d'une même devise.
+        
+        Args:
+            amounts: Montants dans la devise source
+            from_currency: Devise source
+            to_currency: Devise cible
+        
+        Returns:
+            Tableau array('d') des montants convertis
+        """
+        rate = self.rate(from_currency, to_currency)
+        return array('d', [amount * rate for amount in amounts])
+    
+    def convert_money_array(self, amounts: MoneyArray, to_currency: Currency) -> array:
+        """
+        Convertit un MoneyArray multi-devises.
+        
+        Les unités mineures entières sont converties directement: le taux
+        de chaque devise source intègre le passage aux unités principales.
+        
+        Args:
+            amounts: Montants à convertir
+            to_currency: Devise cible
+        
+        Returns:
+            Tableau array('d') des montants convertis (unités principales)
+        """
+        factors = [
+            self.rate(currency, to_currency) / 10 ** currency.minor_unit
+            for currency in amounts._table
+        ]
+        return array('d', [
+            units * factors[position]
+            for units, position in zip(amounts._units, amounts._index)
+        ])
+    
+    def total(self, amounts: MoneyArray, to_currency: Currency) -> float:
+        """
+        Calcule le total approché d'un MoneyArray dans une devise.
+        
+        Les unités sont additionnées exactement par devise: seules la
+        conversion de chaque sous-total et leur somme sont approchées.
+        
+        Args:
+            amounts: Montants à totaliser
+            to_currency: Devise cible
+        
+        Returns:
+            Total approché dans la devise cible
+        """
+        return sum(
+            float(money._units) / 10 ** money._exp * self.rate(currency, to_currency)
+            for currency, money in amounts.sum_by_currency().items()
+        )
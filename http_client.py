@@ -0,0 +1,156 @@
+"""
+Client HTTP partagé: connexions persistantes, nouvelles tentatives et délais.
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Codes HTTP pour lesquels une nouvelle tentative a un sens
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class HttpClient:
+    """
+    Client HTTP à connexions persistantes (keep-alive) avec nouvelles tentatives.
+    
+    Une session requests unique conserve un pool de connexions par hôte,
+    ce qui évite une connexion TCP et une négociation TLS à chaque appel.
+    Les erreurs de connexion (y compris le délai de connexion dépassé) et
+    les réponses 429/5xx sont retentées au plus max_retries fois, après une
+    attente exponentielle avec gigue (« full jitter »): uniforme entre 0 et
+    min(backoff_max, backoff_base × 2^tentative). Un délai de réponse
+    dépassé n'est pas retenté: le serveur a reçu la requête et une
+    nouvelle tentative attendrait de nouveau read_timeout. Aucune
+    tentative ne commence au-delà de total_timeout après le premier envoi.
+    """
+    
+    def __init__(self, pool_size: int = 10, max_retries: int = 2,
+                 connect_timeout: float = 3.05, read_timeout: float = 10.0,
+                 backoff_base: float = 0.25, backoff_max: float = 4.0,
+                 total_timeout: float = 15.0,
+                 sleep: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialise le client.
+        
+        Args:
+            pool_size: Nombre de connexions conservées par hôte
+            max_retries: Nombre maximal de nouvelles tentatives
+            connect_timeout: Délai d'établissement de la connexion (s)
+            read_timeout: Délai d'attente de la réponse (s)
+            backoff_base: Attente de base entre deux tentatives (s)
+            backoff_max: Attente maximale entre deux tentatives (s)
+            total_timeout: Durée au-delà de laquelle aucune nouvelle
+                tentative n'est lancée (s)
+            sleep: Fonction d'attente (remplaçable pour les tests)
+            clock: Horloge monotone en secondes (remplaçable pour les tests)
+        """
+        if max_retries < 0:
+            raise ValueError("max_retries doit être positif ou nul")
+        self.max_retries = max_retries
+        self.timeout = (connect_timeout, read_timeout)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.total_timeout = total_timeout
+        self._sleep = sleep
+        self._clock = clock
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                              max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    def get_json(self, url: str, cancel: Optional[threading.Event] = None) -> dict:
+        """
+        Effectue une requête GET et décode la réponse JSON.
+        
+        Args:
+            url: URL à appeler
+            cancel: Événement qui, une fois levé, interdit toute nouvelle
+                tentative (la requête en cours n'est pas interrompue)
+        
+        Returns:
+            Contenu JSON de la réponse
+        
+        Raises:
+            requests.RequestException: Si toutes les tentatives échouent
+            ValueError: Si la réponse n'est pas du JSON valide
+        """
+        attempt = 0
+        deadline = self._clock() + self.total_timeout
+        while True:
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+            except requests.ReadTimeout:
+                # Délai de réponse dépassé: pas de nouvelle tentative
+                raise
+            except (requests.ConnectionError, requests.Timeout):
+                delay = self._backoff(attempt)
+                if self._last_attempt(attempt, cancel, deadline, delay):
+                    raise
+            else:
+                delay = None
+                if response.status_code in RETRY_STATUSES:
+                    delay = self._retry_after(response)
+                    if delay is None:
+                        delay = self._backoff(attempt)
+                if delay is None or self._last_attempt(attempt, cancel, deadline, delay):
+                    response.raise_for_status()
+                    return response.json()
+                response.close()
+            
+            self._sleep(delay)
+            attempt += 1
+    
+    def _last_attempt(self, attempt: int, cancel: Optional[threading.Event],
+                      deadline: float, delay: float) -> bool:
+        """Indique si aucune nouvelle tentative ne doit suivre celle-ci (après delay)."""
+        return (attempt >= self.max_retries or (cancel is not None and cancel.is_set())
+                or self._clock() + delay >= deadline)
+    
+    def _backoff(self, attempt: int) -> float:
+        """Attente avant la nouvelle tentative numéro attempt + 1."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+    
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        """Attente demandée par l'en-tête Retry-After (en secondes), bornée."""
+        value = response.headers.get('Retry-After', '')
+        if value.isdigit():
+            return min(float(value), self.backoff_max)
+        return None
+    
+    def close(self) -> None:
+        """Ferme les connexions du pool."""
+        self.session.close()
+    
+    def __enter__(self) -> 'HttpClient':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+_default_client: Optional[HttpClient] = None
+_default_lock = threading.Lock()
+
+
+def default_client() -> HttpClient:
+    """
+    Retourne le client HTTP partagé par le processus (créé au premier appel).
+    
+    Returns:
+        Instance partagée de HttpClient
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_lock:
+            if _default_client is None:
+                _default_client = HttpClient()
+    return _default_client
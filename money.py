@@ -1,14 +1,106 @@
-from decimal import Decimal, ROUND_HALF_UP
-from typing import Union
+from decimal import Decimal, Context, ROUND_HALF_UP, MAX_PREC, MAX_EMAX, MIN_EMIN
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from currency import Currency
 
 
+# Contexte sans arrondi pour les changements d'échelle (scaleb) exacts
+_EXACT_CONTEXT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+
+def _decimal_to_units(value: Decimal, minor_unit: int) -> Tuple[int, int]:
+    """
+    Décompose un Decimal en (unités mineures entières, exposant).
+    
+    L'exposant vaut au moins l'unité mineure de la devise et s'étend
+    si le montant porte plus de décimales, afin de rester exact (les
+    zéros finaux au-delà de l'unité mineure sont omis).
+    
+    Args:
+        value: Montant à décomposer
+        minor_unit: Nombre de décimales de l'unité mineure de la devise
+        
+    Returns:
+        Tuple (unités, exposant) tel que montant = unités × 10^-exposant
+        
+    Raises:
+        ValueError: Si le montant n'est pas fini
+    """
+    digits, places = _decimal_digits(value)
+    if places < minor_unit:
+        return digits * 10 ** (minor_unit - places), minor_unit
+    return digits, places
+
+
+def _scale_of(denominator: int) -> Tuple[int, int]:
+    """
+    Retourne (k, 10^k // dénominateur) pour la plus petite puissance 10^k
+    divisible par un dénominateur de la forme 2^a × 5^b (k = max(a, b)).
+    """
+    twos = (denominator & -denominator).bit_length() - 1
+    fives, rest = 0, denominator >> twos
+    while rest > 1:
+        rest //= 5
+        fives += 1
+    exponent = max(twos, fives)
+    return exponent, 10 ** exponent // denominator
+
+
+# Dénominateur -> (multiplicateur, décimales), voir _decimal_digits
+_DIGIT_SCALES: Dict[int, Tuple[int, int]] = {}
+
+
+def _decimal_digits(value: Decimal) -> Tuple[int, int]:
+    """
+    Décompose un facteur Decimal en (chiffres, décimales) exacts.
+    
+    Le nombre de décimales est le plus petit qui représente la valeur
+    exactement. La fraction irréductible du Decimal a un dénominateur
+    2^a × 5^b, dont l'échelle est mémorisée (les taux d'une table n'en
+    ont que quelques-uns).
+    
+    Args:
+        value: Valeur à décomposer
+        
+    Returns:
+        Tuple (chiffres, décimales) tel que valeur = chiffres × 10^-décimales
+        
+    Raises:
+        ValueError: Si la valeur n'est pas finie
+    """
+    try:
+        numerator, denominator = value.as_integer_ratio()
+    except (OverflowError, ValueError):
+        raise ValueError("Le montant doit être un nombre fini") from None
+    scale = _DIGIT_SCALES.get(denominator)
+    if scale is None:
+        places, multiplier = _scale_of(denominator)
+        scale = (multiplier, places)
+        if len(_DIGIT_SCALES) < 4096:
+            _DIGIT_SCALES[denominator] = scale
+    return numerator * scale[0], scale[1]
+
+
+def _shift_half_up(units: int, places: int) -> int:
+    """Divise des unités par 10^places avec arrondi ROUND_HALF_UP."""
+    divisor = 10 ** places
+    quotient, remainder = divmod(abs(units), divisor)
+    if 2 * remainder >= divisor:
+        quotient += 1
+    return quotient if units >= 0 else -quotient
+
+
 class Money:
     """
     Représente une somme d'argent dans une devise spécifique.
-    Utilise Decimal pour éviter les erreurs de précision des flottants.
+    
+    Le montant est stocké sous forme d'unités mineures entières (ex: centimes)
+    associées à un exposant décimal, au moins égal à l'unité mineure de la
+    devise. Les opérations entre montants de même devise se font en
+    arithmétique entière, sans erreur de précision.
     """
     
+    __slots__ = ('_units', '_exp', '_currency')
+    
     def __init__(self, amount: Union[int, float, str, Decimal], currency: Currency):
         """
         Initialise une somme d'argent.
@@ -20,13 +112,108 @@ class Money:
         if not isinstance(currency, Currency):
             raise TypeError("currency doit être une instance de Currency")
         
-        self._amount = Decimal(str(amount))
+        if type(amount) is int:
+            self._units = amount * 10 ** currency.minor_unit
+            self._exp = currency.minor_unit
+        else:
+            if not isinstance(amount, Decimal):
+                amount = Decimal(amount if isinstance(amount, str) else str(amount))
+            self._units, self._exp = _decimal_to_units(amount, currency.minor_unit)
         self._currency = currency
     
+    @classmethod
+    def from_decimal(cls, amount: Decimal, currency: Currency) -> 'Money':
+        """
+        Construit une somme à partir d'un Decimal, sans conversion via str().
+        
+        Constructeur pour les valeurs déjà validées: le type de la devise
+        n'est pas vérifié.
+        
+        Args:
+            amount: Montant Decimal
+            currency: Devise associée
+            
+        Returns:
+            Nouvelle instance Money
+        """
+        money = object.__new__(cls)
+        money._units, money._exp = _decimal_to_units(amount, currency.minor_unit)
+        money._currency = currency
+        return money
+    
+    @classmethod
+    def from_minor_units(cls, units: int, currency: Currency, 
+                         exponent: Optional[int] = None) -> 'Money':
+        """
+        Construit une somme à partir d'un nombre entier d'unités mineures.
+        
+        Args:
+            units: Nombre d'unités (ex: 1050 pour 10,50 EUR)
+            currency: Devise associée
+            exponent: Nombre de décimales des unités (défaut: unité mineure
+                de la devise)
+            
+        Returns:
+            Nouvelle instance Money
+        """
+        minor_unit = currency.minor_unit
+        if exponent is None or exponent == minor_unit:
+            return cls._new(units, minor_unit, currency)
+        if exponent < minor_unit:
+            return cls._new(units * 10 ** (minor_unit - exponent), minor_unit, currency)
+        return cls._new(units, exponent, currency)
+    
+    @classmethod
+    def _new(cls, units: int, exp: int, currency: Currency) -> 'Money':
+        """Construit une instance à partir de valeurs internes déjà validées."""
+        money = object.__new__(cls)
+        money._units = units
+        money._exp = exp
+        money._currency = currency
+        return money
+    
+    @classmethod
+    def sum(cls, items: Iterable['Money'], 
+            currency: Optional[Currency] = None) -> 'Money':
+        """
+        Additionne des montants de même devise sans objet intermédiaire.
+        
+        Args:
+            items: Montants à additionner (liste, générateur...)
+            currency: Devise du résultat si items est vide
+            
+        Returns:
+            Instance Money du total
+            
+        Raises:
+            ValueError: Si les devises diffèrent, ou si items est vide
+                sans devise précisée
+        """
+        accumulator = MoneyAccumulator()
+        accumulator.update(items)
+        
+        if not accumulator:
+            if currency is None:
+                raise ValueError("Impossible d'additionner une séquence vide sans devise")
+            return cls._new(0, currency.minor_unit, currency)
+        
+        total = accumulator.total()
+        if not isinstance(total, Money):
+            raise ValueError(
+                f"Opération impossible entre devises différentes: "
+                f"{', '.join(c.code for c in total)}"
+            )
+        if currency is not None and total._currency != currency:
+            raise ValueError(
+                f"Opération impossible entre devises différentes: "
+                f"{total._currency.code} et {currency.code}"
+            )
+        return total
+    
     @property
     def amount(self) -> Decimal:
         """Retourne le montant."""
-        return self._amount
+        return Decimal(self._units).scaleb(-self._exp, _EXACT_CONTEXT)
     
     @property
     def currency(self) -> Currency:
@@ -43,53 +230,68 @@ class Money:
         Returns:
             Nouvelle instance Money avec montant arrondi
         """
-        rounded_amount = self._amount.quantize(
-            Decimal('0.1') ** decimal_places,
-            rounding=ROUND_HALF_UP
-        )
-        return Money(rounded_amount, self._currency)
+        if decimal_places >= self._exp:
+            return self
+        
+        units = _shift_half_up(self._units, self._exp - decimal_places)
+        exp = max(self._currency.minor_unit, decimal_places)
+        return self._new(units * 10 ** (exp - decimal_places), exp, self._currency)
     
     def __eq__(self, other) -> bool:
         """Égalité entre deux objets Money."""
         if not isinstance(other, Money):
             return False
-        return self._amount == other._amount and self._currency == other._currency
+        if self._currency != other._currency:
+            return False
+        a, b, _ = self._aligned(other)
+        return a == b
     
     def __lt__(self, other) -> bool:
         """Comparaison inférieur (<)."""
         self._check_same_currency(other)
-        return self._amount < other._amount
+        a, b, _ = self._aligned(other)
+        return a < b
     
     def __le__(self, other) -> bool:
         """Comparaison inférieur ou égal (<=)."""
         self._check_same_currency(other)
-        return self._amount <= other._amount
+        a, b, _ = self._aligned(other)
+        return a <= b
     
     def __gt__(self, other) -> bool:
         """Comparaison supérieur (>)."""
         self._check_same_currency(other)
-        return self._amount > other._amount
+        a, b, _ = self._aligned(other)
+        return a > b
     
     def __ge__(self, other) -> bool:
         """Comparaison supérieur ou égal (>=)."""
         self._check_same_currency(other)
-        return self._amount >= other._amount
+        a, b, _ = self._aligned(other)
+        return a >= b
     
     def __add__(self, other) -> 'Money':
         """Addition de deux objets Money de même devise."""
         self._check_same_currency(other)
-        return Money(self._amount + other._amount, self._currency)
+        a, b, exp = self._aligned(other)
+        return self._new(a + b, exp, self._currency)
     
     def __sub__(self, other) -> 'Money':
         """Soustraction de deux objets Money de même devise."""
         self._check_same_currency(other)
-        return Money(self._amount - other._amount, self._currency)
+        a, b, exp = self._aligned(other)
+        return self._new(a - b, exp, self._currency)
     
     def __mul__(self, factor: Union[int, float, Decimal]) -> 'Money':
         """Multiplication par un facteur numérique."""
-        if not isinstance(factor, (int, float, Decimal)):
+        if isinstance(factor, int):
+            return self._new(self._units * factor, self._exp, self._currency)
+        if isinstance(factor, float):
+            factor = Decimal(str(factor))
+        elif not isinstance(factor, Decimal):
             raise TypeError("Le facteur doit être numérique")
-        return Money(self._amount * Decimal(str(factor)), self._currency)
+        digits, places = _decimal_digits(factor)
+        return self._new(self._units * digits, self._exp + places, self._currency)
     
     def __truediv__(self, divisor: Union[int, float, Decimal]) -> 'Money':
         """Division par un diviseur numérique."""
@@ -97,12 +299,57 @@ class Money:
             raise TypeError("Le diviseur doit être numérique")
         if divisor == 0:
             raise ZeroDivisionError("Division par zéro")
-        return Money(self._amount / Decimal(str(divisor)), self._currency)
+        if isinstance(divisor, float):
+            divisor = Decimal(str(divisor))
+        elif isinstance(divisor, int):
+            quotient, remainder = divmod(self._units, divisor)
+            if not remainder:
+                return self._new(quotient, self._exp, self._currency)
+        return self._scaled(Decimal(self._units) / divisor)
+    
+    def _times(self, digits: int, places: int, currency: Currency) -> 'Money':
+        """
+        Multiplie le montant par digits × 10^-places, sans passer par Decimal.
+        
+        Les unités sont multipliées par les chiffres du facteur et les
+        exposants s'additionnent: le résultat est exact.
+        
+        Args:
+            digits: Chiffres du facteur (voir _decimal_digits)
+            places: Nombre de décimales du facteur
+            currency: Devise du résultat
+            
+        Returns:
+            Nouvelle instance Money
+        """
+        units = self._units * digits
+        exp = self._exp + places
+        if exp < currency.minor_unit:
+            units *= 10 ** (currency.minor_unit - exp)
+            exp = currency.minor_unit
+        return self._new(units, exp, currency)
+    
+    def _scaled(self, units: Decimal) -> 'Money':
+        """
+        Construit le résultat d'une division calculée sur les unités.
+        
+        Args:
+            units: Résultat exprimé en unités de self (montant × 10^exposant)
+            
+        Returns:
+            Nouvelle instance Money
+        """
+        new_units, extra = _decimal_digits(units)
+        return self._new(new_units, self._exp + extra, self._currency)
     
     def __str__(self) -> str:
         """Représentation textuelle formatée."""
         # Arrondi à 2 décimales pour l'affichage
-        rounded_amount = self._amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        if self._exp > 2:
+            units = _shift_half_up(self._units, self._exp - 2)
+        else:
+            units = self._units * 10 ** (2 - self._exp)
+        rounded_amount = Decimal(units).scaleb(-2, _EXACT_CONTEXT)
         
         if self._currency.symbol:
             return f"{rounded_amount} {self._currency.symbol}"
@@ -110,7 +357,20 @@ class Money:
     
     def __repr__(self) -> str:
         """Représentation technique."""
-        return f"Money(amount={self._amount}, currency={self._currency.code})"
+        return f"Money(amount={self.amount}, currency={self._currency.code})"
+    
+    def _aligned(self, other: 'Money') -> Tuple[int, int, int]:
+        """
+        Ramène deux montants au même exposant.
+        
+        Returns:
+            Tuple (unités de self, unités de other, exposant commun)
+        """
+        if self._exp == other._exp:
+            return self._units, other._units, self._exp
+        if self._exp > other._exp:
+            return self._units, other._units * 10 ** (self._exp - other._exp), self._exp
+        return self._units * 10 ** (other._exp - self._exp), other._units, other._exp
     
     def _check_same_currency(self, other: 'Money') -> None:
         """Vérifie que deux objets Money ont la même devise."""
@@ -120,4 +380,107 @@ class Money:
             raise ValueError(
                 f"Opération impossible entre devises différentes: "
                 f"{self._currency.code} et {other._currency.code}"
-            ) 
\ No newline at end of file
+            )
+
+
+class MoneyAccumulator:
+    """
+    Totalisateur de montants, avec un total courant par devise.
+    
+    Les totaux sont tenus en unités entières: ajouter un montant n'alloue
+    aucun objet Money. Accepte les générateurs, ce qui permet de totaliser
+    de très gros volumes en mémoire constante.
+    """
+    
+    __slots__ = ('_totals', '_last_currency', '_last_total')
+    
+    def __init__(self, items: Iterable[Money] = ()):
+        """
+        Initialise le totalisateur.
+        
+        Args:
+            items: Montants à ajouter dès la création (optionnel)
+        """
+        # Devise -> [unités, exposant]
+        self._totals: Dict[Currency, List[int]] = {}
+        self._last_currency: Optional[Currency] = None
+        self._last_total: Optional[List[int]] = None
+        self.update(items)
+    
+    def add(self, money: Money) -> None:
+        """
+        Ajoute un montant au total de sa devise.
+        
+        Args:
+            money: Montant à ajouter
+        """
+        if not isinstance(money, Money):
+            raise TypeError("Opération possible uniquement entre objets Money")
+        
+        currency = money._currency
+        if currency is self._last_currency:
+            total = self._last_total
+        else:
+            total = self._totals.get(currency)
+            if total is None:
+                total = self._totals[currency] = [0, money._exp]
+            self._last_currency = currency
+            self._last_total = total
+        
+        exp = money._exp
+        if exp == total[1]:
+            total[0] += money._units
+        elif exp < total[1]:
+            total[0] += money._units * 10 ** (total[1] - exp)
+        else:
+            total[0] = total[0] * 10 ** (exp - total[1]) + money._units
+            total[1] = exp
+    
+    def update(self, items: Iterable[Money]) -> None:
+        """
+        Ajoute une suite de montants.
+        
+        Args:
+            items: Montants à ajouter (liste, générateur...)
+        """
+        add = self.add
+        for money in items:
+            add(money)
+    
+    def totals(self) -> Dict[Currency, Money]:
+        """
+        Retourne le total de chaque devise.
+        
+        Returns:
+            Dictionnaire {devise: total}
+        """
+        return {
+            currency: Money._new(units, exp, currency)
+            for currency, (units, exp) in self._totals.items()
+        }
+    
+    def total(self) -> Union[Money, Dict[Currency, Money]]:
+        """
+        Retourne le total accumulé.
+        
+        Returns:
+            Un Money si une seule devise a été vue, sinon un dictionnaire
+            {devise: total}
+            
+        Raises:
+            ValueError: Si aucun montant n'a été ajouté
+        """
+        if not self._totals:
+            raise ValueError("Aucun montant à totaliser")
+        
+        totals = self.totals()
+        if len(totals) == 1:
+            return next(iter(totals.values()))
+        return totals
+    
+    def __bool__(self) -> bool:
+        return bool(self._totals)
+    
+    def __len__(self) -> int:
+        """Nombre de devises distinctes."""
+        return len(self._totals)
@@ -0,0 +1,289 @@
+"""
+Tableau de montants en stockage colonne pour les traitements par lots.
+"""
+
+from array import array
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+from currency import Currency
+from money import Money, _decimal_digits, _shift_half_up
+
+
+def _integer_factor(digits: int, places: int) -> Tuple[int, int, int]:
+    """
+    Prépare la multiplication exacte d'unités par digits × 10^-places.
+    
+    Args:
+        digits: Chiffres du facteur
+        places: Décimales du facteur (négatif pour un facteur entier × 10^n)
+        
+    Returns:
+        Tuple (multiplicateur, demi-diviseur, diviseur): le résultat arrondi
+        (ROUND_HALF_UP) de u × facteur est (u × multiplicateur + demi) //
+        diviseur pour un produit positif, son opposé sinon
+    """
+    if places <= 0:
+        return digits * 10 ** -places, 0, 1
+    divisor = 10 ** places
+    return digits, divisor // 2, divisor
+
+
+def _multiply_half_up(units: array, multiplier: int, half: int, divisor: int) -> List[int]:
+    """Multiplie des unités par un facteur préparé (_integer_factor), arrondi ROUND_HALF_UP."""
+    if divisor == 1:
+        return [u * multiplier for u in units]
+    return [
+        (u * multiplier + half) // divisor if u * multiplier >= 0
+        else -((half - u * multiplier) // divisor)
+        for u in units
+    ]
+
+
+class MoneyArray:
+    """
+    Tableau de montants stocké par colonnes.
+    
+    Les montants sont conservés en unités mineures entières (int64) dans une
+    colonne, et la devise de chaque ligne dans une seconde colonne d'indices
+    vers une table de devises. Les opérations s'appliquent à tout le tableau
+    sans créer d'objet Money intermédiaire.
+    
+    Chaque ligne est exprimée dans l'unité mineure de sa devise: les
+    résultats sont identiques à ceux du chemin scalaire Money suivi d'un
+    arrondi à l'unité mineure (ex: converter.convert(m, USD).round(2)).
+    """
+    
+    __slots__ = ('_units', '_index', '_table')
+    
+    def __init__(self, units: Iterable[int], currencies: Iterable[Currency]):
+        """
+        Initialise un tableau à partir de colonnes.
+        
+        Args:
+            units: Montants en unités mineures (ex: centimes)
+            currencies: Devise de chaque ligne
+        
+        Raises:
+            ValueError: Si les colonnes n'ont pas la même longueur
+            OverflowError: Si un montant dépasse la capacité int64
+        """
+        self._units = array('q', units)
+        self._table: List[Currency] = []
+        self._index = array('H')
+        
+        positions: Dict[Currency, int] = {}
+        for currency in currencies:
+            if not isinstance(currency, Currency):
+                raise TypeError("currency doit être une instance de Currency")
+            position = positions.get(currency)
+            if position is None:
+                position = positions[currency] = len(self._table)
+                self._table.append(currency)
+            self._index.append(position)
+        
+        if len(self._index) != len(self._units):
+            raise ValueError("Les colonnes montants et devises doivent avoir la même longueur")
+    
+    @classmethod
+    def _from_columns(cls, units: array, index: array, table: List[Currency]) -> 'MoneyArray':
+        """Construit un tableau à partir de colonnes déjà validées."""
+        result = object.__new__(cls)
+        result._units = units
+        result._index = index
+        result._table = table
+        return result
+    
+    @classmethod
+    def from_money(cls, items: Iterable[Money]) -> 'MoneyArray':
+        """
+        Construit un tableau à partir d'objets Money.
+        
+        Args:
+            items: Montants à stocker
+        
+        Returns:
+            Nouveau MoneyArray
+        
+        Raises:
+            ValueError: Si un montant est plus précis que l'unité mineure
+        """
+        units = []
+        currencies = []
+        for money in items:
+            minor_unit = money.currency.minor_unit
+            if money._exp > minor_unit:
+                rounded = money.round(minor_unit)
+                if rounded != money:
+                    raise ValueError(
+                        f"Montant plus précis que l'unité mineure de "
+                        f"{money.currency.code}: {money.amount}"
+                    )
+                money = rounded
+            units.append(money._units * 10 ** (minor_unit - money._exp))
+            currencies.append(money.currency)
+        return cls(units, currencies)
+    
+    @property
+    def currencies(self) -> List[Currency]:
+        """Retourne les devises présentes dans le tableau."""
+        return [self._table[position] for position in sorted(set(self._index))]
+    
+    def __len__(self) -> int:
+        return len(self._units)
+    
+    def __getitem__(self, position: int) -> Money:
+        currency = self._table[self._index[position]]
+        return Money._new(self._units[position], currency.minor_unit, currency)
+    
+    def __iter__(self) -> Iterator[Money]:
+        table = self._table
+        new = Money._new
+        for units, position in zip(self._units, self._index):
+            currency = table[position]
+            yield new(units, currency.minor_unit, currency)
+    
+    def __repr__(self) -> str:
+        return f"MoneyArray(size={len(self)}, currencies={[c.code for c in self.currencies]})"
+    
+    def __add__(self, other: 'MoneyArray') -> 'MoneyArray':
+        """Addition ligne à ligne de deux tableaux de mêmes devises."""
+        self._check_same_currencies(other)
+        units = array('q', map(int.__add__, self._units, other._units))
+        return self._from_columns(units, self._index, self._table)
+    
+    def __sub__(self, other: 'MoneyArray') -> 'MoneyArray':
+        """Soustraction ligne à ligne de deux tableaux de mêmes devises."""
+        self._check_same_currencies(other)
+        units = array('q', map(int.__sub__, self._units, other._units))
+        return self._from_columns(units, self._index, self._table)
+    
+    def scale(self, factor: Union[int, float, Decimal]) -> 'MoneyArray':
+        """
+        Multiplie tous les montants par un facteur.
+        
+        Le résultat est calculé en arithmétique entière exacte puis arrondi
+        (ROUND_HALF_UP) à l'unité mineure, comme (money * factor).round(minor_unit).
+        
+        Args:
+            factor: Facteur numérique
+        
+        Returns:
+            Nouveau MoneyArray
+        """
+        if isinstance(factor, int):
+            units = array('q', [u * factor for u in self._units])
+            return self._from_columns(units, self._index, self._table)
+        if not isinstance(factor, (float, Decimal)):
+            raise TypeError("Le facteur doit être numérique")
+        
+        if isinstance(factor, float):
+            factor = Decimal(str(factor))
+        units = array('q', _multiply_half_up(self._units, *_integer_factor(*_decimal_digits(factor))))
+        return self._from_columns(units, self._index, self._table)
+    
+    __mul__ = scale
+    
+    def round(self, decimal_places: int = 2) -> 'MoneyArray':
+        """
+        Arrondit tous les montants au nombre de décimales spécifié.
+        
+        Args:
+            decimal_places: Nombre de décimales (défaut: 2)
+        
+        Returns:
+            Nouveau MoneyArray
+        """
+        shifts = [max(currency.minor_unit - decimal_places, 0) for currency in self._table]
+        if not any(shifts):
+            return self
+        
+        units = array('q', [
+            _shift_half_up(u, shifts[position]) * 10 ** shifts[position]
+            for u, position in zip(self._units, self._index)
+        ])
+        return self._from_columns(units, self._index, self._table)
+    
+    def sum_by_currency(self) -> Dict[Currency, Money]:
+        """
+        Calcule la somme des montants pour chaque devise.
+        
+        Returns:
+            Dictionnaire {devise: total}
+        """
+        if len(self._table) == 1:
+            totals = [sum(self._units)]
+        else:
+            totals = [0] * len(self._table)
+            for units, position in zip(self._units, self._index):
+                totals[position] += units
+        
+        present = set(self._index)
+        return {
+            currency: Money._new(totals[position], currency.minor_unit, currency)
+            for position, currency in enumerate(self._table)
+            if position in present
+        }
+    
+    def convert(self, converter, target_currency: Currency) -> 'MoneyArray':
+        """
+        Convertit tout le tableau vers une devise cible.
+        
+        Le taux est résolu et décomposé une seule fois par devise source
+        auprès du convertisseur; chaque ligne est calculée en arithmétique
+        entière exacte puis arrondie (ROUND_HALF_UP) à l'unité mineure de la
+        devise cible.
+        
+        Args:
+            converter: CurrencyConverter fournissant les taux
+            target_currency: Devise cible
+        
+        Returns:
+            Nouveau MoneyArray dans la devise cible
+        
+        Raises:
+            ValueError: Si un taux n'est pas disponible
+        """
+        target_minor = target_currency.minor_unit
+        # Facteur entier préparé par devise source (voir _integer_factor)
+        plans = []
+        for currency in self._table:
+            if currency == target_currency:
+                plans.append((1, 0, 1))
+                continue
+            rate = converter._resolve_rate(currency, target_currency)
+            if rate is None:
+                raise ValueError(
+                    f"Impossible de convertir {currency.code} vers {target_currency.code}. "
+                    f"Taux de change non disponible."
+                )
+            digits, places = _decimal_digits(rate)
+            plans.append(_integer_factor(digits, places + currency.minor_unit - target_minor))
+        
+        if len(plans) == 1:
+            units = array('q', _multiply_half_up(self._units, *plans[0]))
+        else:
+            units = array('q', [
+                (u * multiplier + half) // divisor if u * multiplier >= 0
+                else -((half - u * multiplier) // divisor)
+                for u, (multiplier, half, divisor) in zip(self._units, map(plans.__getitem__,
+                                                                           self._index))
+            ])
+        
+        return self._from_columns(units, array('H', bytes(2 * len(units))), [target_currency])
+    
+    def _check_same_currencies(self, other: 'MoneyArray') -> None:
+        """Vérifie que deux tableaux ont la même devise à chaque ligne."""
+        if not isinstance(other, MoneyArray):
+            raise TypeError("Opération possible uniquement entre objets MoneyArray")
+        if len(self) != len(other):
+            raise ValueError("Les tableaux doivent avoir la même longueur")
+        if self._table is other._table and self._index is other._index:
+            return
+        
+        for row, (a, b) in enumerate(zip(self._index, other._index)):
+            if self._table[a] != other._table[b]:
+                raise ValueError(
+                    f"Opération impossible entre devises différentes à la ligne {row}: "
+                    f"{self._table[a].code} et {other._table[b].code}"
+                )
@@ -0,0 +1,166 @@
+"""
+Santé des fournisseurs de taux: latence, taux d'erreur et disjoncteur.
+"""
+
+import time
+from collections import deque
+from threading import Lock
+from typing import Callable, Dict, Optional
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class ProviderHealth:
+    """
+    Suivi de la santé d'un fournisseur, avec disjoncteur (« circuit breaker »).
+    
+    La latence est une moyenne mobile exponentielle des requêtes réussies;
+    le taux d'erreur porte sur les window dernières requêtes. Après
+    failure_threshold échecs consécutifs, le disjoncteur s'ouvre: le
+    fournisseur n'est plus interrogé pendant cooldown secondes. Une seule
+    requête d'essai est ensuite autorisée (demi-ouvert): son succès referme
+    le disjoncteur, son échec le rouvre pour une nouvelle période.
+    Utilisable depuis plusieurs threads.
+    """
+    
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 30.0,
+                 window: int = 20, smoothing: float = 0.2,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialise le suivi.
+        
+        Args:
+            failure_threshold: Échecs consécutifs ouvrant le disjoncteur
+            cooldown: Durée d'ouverture avant une requête d'essai (s)
+            window: Nombre de requêtes prises en compte pour le taux d'erreur
+            smoothing: Poids d'une nouvelle mesure dans la latence moyenne
+            clock: Horloge monotone en secondes (remplaçable pour les tests)
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold doit être au moins 1")
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.smoothing = smoothing
+        self._clock = clock
+        self._lock = Lock()
+        self._outcomes: deque = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self.latency: Optional[float] = None
+        self.consecutive_failures = 0
+        self.requests = 0
+        self.failures = 0
+    
+    @property
+    def state(self) -> str:
+        """État du disjoncteur (CLOSED, OPEN ou HALF_OPEN)."""
+        with self._lock:
+            return self._current_state()
+    
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.cooldown:
+            return HALF_OPEN
+        return self._state
+    
+    @property
+    def error_rate(self) -> float:
+        """Proportion d'échecs parmi les dernières requêtes."""
+        with self._lock:
+            return self._error_rate()
+    
+    def _error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+    
+    def allow_request(self) -> bool:
+        """
+        Indique si le fournisseur peut être interrogé, et réserve l'essai.
+        
+        En demi-ouvert, seul le premier appel obtient la requête d'essai;
+        les suivants sont refusés jusqu'à son résultat.
+        
+        Returns:
+            True si la requête peut être envoyée
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probing:
+                self._state = HALF_OPEN
+                self._probing = True
+                return True
+            return False
+    
+    def record_success(self, latency: float) -> None:
+        """
+        Enregistre une requête réussie et referme le disjoncteur.
+        
+        Args:
+            latency: Durée de la requête (s)
+        """
+        with self._lock:
+            self._record(True)
+            self.latency = latency if self.latency is None else (
+                self.smoothing * latency + (1 - self.smoothing) * self.latency
+            )
+            self.consecutive_failures = 0
+            self._state = CLOSED
+            self._probing = False
+    
+    def record_failure(self) -> None:
+        """Enregistre un échec, en ouvrant le disjoncteur au besoin."""
+        with self._lock:
+            self._record(False)
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self._probing or self.consecutive_failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._probing = False
+    
+    def _record(self, success: bool) -> None:
+        self._outcomes.append(success)
+        self.requests += 1
+    
+    def rank(self) -> tuple:
+        """
+        Clé de tri des fournisseurs, du plus au moins intéressant.
+        
+        Disjoncteur fermé d'abord, puis demi-ouvert, puis ouvert; à état
+        égal, durée attendue d'une réponse valide: latence moyenne divisée
+        par le taux de succès. Un fournisseur jamais mesuré passe après
+        les fournisseurs mesurés.
+        
+        Returns:
+            Tuple comparable (état, durée attendue)
+        """
+        with self._lock:
+            state = self._current_state()
+            if self.latency is None:
+                expected = float('inf')
+            else:
+                expected = self.latency / max(1 - self._error_rate(), 0.1)
+        return ((CLOSED, HALF_OPEN, OPEN).index(state), expected)
+    
+    def info(self) -> Dict:
+        """
+        Retourne l'état et les statistiques du fournisseur.
+        
+        Returns:
+            Informations sur le fournisseur
+        """
+        with self._lock:
+            return {
+                'state': self._current_state(),
+                'latency': self.latency,
+                'error_rate': self._error_rate(),
+                'consecutive_failures': self.consecutive_failures,
+                'requests': self.requests,
+                'failures': self.failures,
+            }
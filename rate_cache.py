@@ -0,0 +1,534 @@
+"""
+Cache des taux de change récupérés auprès des APIs.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+from threading import Lock, RLock, local
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+class _CacheEntry:
+    """Taux d'une devise de base avec leur date de stockage et de dernière lecture."""
+    
+    __slots__ = ('rates', 'stored_at', 'stored_clock', 'used_clock')
+    
+    def __init__(self, rates: Dict[str, Decimal], stored_at: datetime, stored_clock: float,
+                 used_clock: float):
+        self.rates = rates
+        self.stored_at = stored_at
+        self.stored_clock = stored_clock
+        self.used_clock = used_clock
+
+
+class RateCache:
+    """
+    Cache borné des taux par devise de base, avec durée de vie et éviction LRU.
+    
+    Chaque entrée expire ttl après son propre stockage (horloge monotone). Au-delà de
+    max_entries, l'entrée la moins récemment utilisée est supprimée. Une
+    entrée expirée reste disponible pour get_stale (taux périmés servis
+    quand les APIs échouent) jusqu'à son remplacement ou son éviction.
+    La date de dernière lecture de chaque clé survit à ses remplacements
+    (voir idle_times). Utilisable depuis plusieurs threads.
+    """
+    
+    def __init__(self, max_entries: int = 256, ttl: timedelta = timedelta(hours=1),
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialise le cache.
+        
+        Args:
+            max_entries: Nombre maximal d'entrées
+            ttl: Durée de validité d'une entrée
+            clock: Horloge monotone en secondes (remplaçable pour les tests)
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries doit être au moins 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: 'OrderedDict[str, _CacheEntry]' = OrderedDict()
+        self._lock = RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_serves = 0
+    
+    def get(self, key: str) -> Optional[Dict[str, Decimal]]:
+        """
+        Retourne les taux en cache s'ils sont encore valides.
+        
+        Args:
+            key: Clé de l'entrée (code de la devise de base)
+        
+        Returns:
+            Taux ou None si absents ou expirés
+        """
+        with self._lock:
+            now = self._clock()
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.used_clock = now
+            if entry is None or self._expired(entry, now):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.rates
+    
+    def peek(self, key: str) -> Optional[Dict[str, Decimal]]:
+        """
+        Retourne les taux valides sans compter d'accès (ni succès, ni échec).
+        
+        Args:
+            key: Clé de l'entrée
+        
+        Returns:
+            Taux ou None si absents ou expirés
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry, self._clock()):
+                return None
+            return entry.rates
+    
+    def get_stale(self, key: str) -> Optional[Dict[str, Decimal]]:
+        """
+        Retourne les derniers taux connus, même expirés.
+        
+        Args:
+            key: Clé de l'entrée
+        
+        Returns:
+            Taux ou None si absents
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry.used_clock = now = self._clock()
+            if self._expired(entry, now):
+                self.stale_serves += 1
+            return entry.rates
+    
+    def put(self, key: str, rates: Dict[str, Decimal]) -> None:
+        """
+        Enregistre des taux, en évinçant au besoin l'entrée la moins utilisée.
+        
+        Args:
+            key: Clé de l'entrée
+            rates: Taux à enregistrer
+        """
+        self.put_many({key: rates})
+    
+    def put_many(self, entries: Dict[str, Dict[str, Decimal]]) -> None:
+        """
+        Enregistre plusieurs entrées avec la même date de stockage.
+        
+        Args:
+            entries: Taux par clé
+        """
+        with self._lock:
+            stored_at, stored_clock = datetime.now(), self._clock()
+            for key, rates in entries.items():
+                previous = self._entries.get(key)
+                used_clock = stored_clock if previous is None else previous.used_clock
+                self._entries[key] = _CacheEntry(rates, stored_at, stored_clock, used_clock)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def _expired(self, entry: _CacheEntry, now: float) -> bool:
+        """Indique si une entrée a dépassé sa durée de validité."""
+        return now - entry.stored_clock >= self.ttl.total_seconds()
+    
+    def clear(self) -> None:
+        """Supprime toutes les entrées (les compteurs sont conservés)."""
+        with self._lock:
+            self._entries.clear()
+    
+    def keys(self) -> List[str]:
+        """Retourne les clés présentes, de la moins à la plus récemment utilisée."""
+        with self._lock:
+            return list(self._entries)
+    
+    def ages(self) -> Dict[str, float]:
+        """
+        Retourne l'âge de chaque entrée.
+        
+        Returns:
+            Secondes écoulées depuis le stockage, par clé
+        """
+        with self._lock:
+            now = self._clock()
+            return {key: now - entry.stored_clock for key, entry in self._entries.items()}
+    
+    def idle_times(self) -> Dict[str, float]:
+        """
+        Retourne le temps écoulé depuis la dernière lecture de chaque entrée.
+        
+        Une lecture est un appel à get ou get_stale, même sans résultat
+        valide; une entrée jamais lue compte depuis son premier stockage.
+        
+        Returns:
+            Secondes écoulées depuis la dernière lecture, par clé
+        """
+        with self._lock:
+            now = self._clock()
+            return {key: now - entry.used_clock for key, entry in self._entries.items()}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+    
+    def info(self) -> Dict:
+        """
+        Retourne l'état et les statistiques du cache.
+        
+        Returns:
+            Informations sur le cache
+        """
+        with self._lock:
+            now = self._clock()
+            return {
+                'entries': len(self._entries),
+                'keys': list(self._entries),
+                'oldest_entry': min(
+                    (entry.stored_at for entry in self._entries.values()),
+                    default=None
+                ),
+                'expired_entries': sum(1 for entry in self._entries.values()
+                                       if self._expired(entry, now)),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'stale_serves': self.stale_serves,
+            }
+
+
+def default_cache_path() -> str:
+    """
+    Retourne l'emplacement par défaut du cache persistant.
+    
+    Returns:
+        Chemin dans le répertoire de cache de l'utilisateur
+        ($XDG_CACHE_HOME ou ~/.cache)
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'currency_converter', 'rates.sqlite3')
+
+
+class SQLiteRateCache:
+    """
+    Cache des taux persistant sur disque (SQLite), partagé entre processus.
+    
+    Même interface que RateCache: durée de vie par entrée, éviction LRU et
+    compteurs, ces derniers étant eux aussi conservés dans le fichier.
+    Les dates sont mesurées en temps réel (time.time), seul commun à
+    plusieurs processus. Chaque thread utilise sa propre connexion; le
+    journal WAL permet les lectures pendant qu'un autre processus écrit.
+    
+    Les lectures (get, get_stale, peek) n'écrivent pas dans le fichier:
+    les dates de dernière lecture et les compteurs sont accumulés en
+    mémoire et écrits par lots, avec la prochaine écriture ou au plus tard
+    flush_interval secondes après la précédente. Les autres instances les
+    voient donc avec ce retard (voir flush et close).
+    """
+    
+    _COUNTERS = ('hits', 'misses', 'evictions', 'stale_serves')
+    
+    def __init__(self, path: Optional[str] = None, max_entries: int = 256,
+                 ttl: timedelta = timedelta(hours=1), clock: Callable[[], float] = time.time,
+                 flush_interval: float = 60.0):
+        """
+        Initialise le cache et crée le fichier au besoin.
+        
+        Args:
+            path: Fichier SQLite (défaut: default_cache_path())
+            max_entries: Nombre maximal d'entrées
+            ttl: Durée de validité d'une entrée
+            clock: Horloge en secondes depuis l'epoch (remplaçable pour les tests)
+            flush_interval: Délai maximal en secondes avant l'écriture des
+                dates de lecture et compteurs accumulés par les lectures
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries doit être au moins 1")
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self._clock = clock
+        
+        # Connexion de chaque thread, et toutes les connexions pour close()
+        self._local = local()
+        self._connections: List[sqlite3.Connection] = []
+        # Lectures pas encore écrites: date de dernière lecture par clé et compteurs
+        self._pending_lock = Lock()
+        self._pending_used: Dict[str, float] = {}
+        self._pending_counts = dict.fromkeys(self._COUNTERS, 0)
+        self._flushed_at = clock()
+        
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        with connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rates ("
+                "base TEXT PRIMARY KEY, rates TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            connection.executemany(
+                "INSERT OR IGNORE INTO counters VALUES (?, 0)",
+                [(name,) for name in self._COUNTERS]
+            )
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Retourne la connexion du thread courant, ouverte au premier appel."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            # Une connexion n'est pas réutilisable après un fork
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._local.connection, self._local.pid = connection, os.getpid()
+            with self._pending_lock:
+                self._connections.append(connection)
+        return connection
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Ouvre une transaction d'écriture, validée (ou annulée) à la sortie.
+        
+        Les lectures accumulées y sont écrites en premier.
+        """
+        connection = self._connection()
+        with connection:
+            self._write_pending(connection)
+            yield connection
+    
+    def _write_pending(self, connection: sqlite3.Connection) -> None:
+        """Écrit les dates de lecture et compteurs accumulés par les lectures."""
+        with self._pending_lock:
+            used, self._pending_used = self._pending_used, {}
+            counts, self._pending_counts = self._pending_counts, dict.fromkeys(self._COUNTERS, 0)
+            self._flushed_at = self._clock()
+        if used:
+            connection.executemany(
+                "UPDATE rates SET used_at = MAX(used_at, ?) WHERE base = ?",
+                [(used_at, key) for key, used_at in used.items()]
+            )
+        counts = [(value, name) for name, value in counts.items() if value]
+        if counts:
+            connection.executemany("UPDATE counters SET value = value + ? WHERE name = ?", counts)
+    
+    def _record_read(self, now: float, key: Optional[str], counter: Optional[str]) -> None:
+        """
+        Note une lecture, écrite par lot si flush_interval est écoulé.
+        
+        Args:
+            now: Date de la lecture
+            key: Clé lue (None si absente du cache)
+            counter: Compteur à incrémenter (None pour aucun)
+        """
+        with self._pending_lock:
+            if key is not None:
+                self._pending_used[key] = now
+            if counter is not None:
+                self._pending_counts[counter] += 1
+            due = now - self._flushed_at >= self.flush_interval
+        if due:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Écrit immédiatement les dates de lecture et compteurs accumulés."""
+        with self._transaction():
+            pass
+    
+    def close(self) -> None:
+        """Écrit les lectures accumulées et ferme les connexions de tous les threads."""
+        self.flush()
+        with self._pending_lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = local()
+    
+    @staticmethod
+    def _decode(payload: str) -> Dict[str, Decimal]:
+        return {code: Decimal(rate) for code, rate in json.loads(payload).items()}
+    
+    def get(self, key: str) -> Optional[Dict[str, Decimal]]:
+        """
+        Retourne les taux en cache s'ils sont encore valides.
+        
+        Args:
+            key: Clé de l'entrée (code de la devise de base)
+            
+        Returns:
+            Taux ou None si absents ou expirés
+        """
+        now = self._clock()
+        row = self._connection().execute(
+            "SELECT rates, stored_at FROM rates WHERE base = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] <= now - self.ttl.total_seconds():
+            self._record_read(now, key if row is not None else None, 'misses')
+            return None
+        self._record_read(now, key, 'hits')
+        return self._decode(row[0])
+    
+    def peek(self, key: str) -> Optional[Dict[str, Decimal]]:
+        """
+        Retourne les taux valides sans compter d'accès (ni succès, ni échec).
+        
+        Args:
+            key: Clé de l'entrée
+            
+        Returns:
+            Taux ou None si absents ou expirés
+        """
+        row = self._connection().execute(
+            "SELECT rates FROM rates WHERE base = ? AND stored_at > ?",
+            (key, self._clock() - self.ttl.total_seconds())
+        ).fetchone()
+        return self._decode(row[0]) if row is not None else None
+    
+    def get_stale(self, key: str) -> Optional[Dict[str, Decimal]]:
+        """
+        Retourne les derniers taux connus, même expirés.
+        
+        Args:
+            key: Clé de l'entrée
+            
+        Returns:
+            Taux ou None si absents
+        """
+        now = self._clock()
+        row = self._connection().execute(
+            "SELECT rates, stored_at FROM rates WHERE base = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        stale = row[1] <= now - self.ttl.total_seconds()
+        self._record_read(now, key, 'stale_serves' if stale else None)
+        return self._decode(row[0])
+    
+    def put(self, key: str, rates: Dict[str, Decimal]) -> None:
+        """
+        Enregistre des taux, en évinçant au besoin les entrées les moins utilisées.
+        
+        Args:
+            key: Clé de l'entrée
+            rates: Taux à enregistrer
+        """
+        self.put_many({key: rates})
+    
+    def put_many(self, entries: Dict[str, Dict[str, Decimal]]) -> None:
+        """
+        Enregistre plusieurs entrées en une transaction.
+        
+        Args:
+            entries: Taux par clé
+        """
+        now = self._clock()
+        rows = [
+            (key, json.dumps({code: str(rate) for code, rate in rates.items()}), now, now)
+            for key, rates in entries.items()
+        ]
+        with self._transaction() as connection:
+            # Un remplacement conserve la date de dernière lecture
+            connection.executemany(
+                "INSERT INTO rates VALUES (?, ?, ?, ?) ON CONFLICT(base) DO UPDATE "
+                "SET rates = excluded.rates, stored_at = excluded.stored_at", rows
+            )
+            evicted = connection.execute(
+                "DELETE FROM rates WHERE base IN ("
+                "SELECT base FROM rates ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+            if evicted:
+                connection.execute(
+                    "UPDATE counters SET value = value + ? WHERE name = 'evictions'", (evicted,)
+                )
+    
+    def clear(self) -> None:
+        """Supprime toutes les entrées (les compteurs sont conservés)."""
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM rates")
+    
+    def keys(self) -> List[str]:
+        """Retourne les clés présentes, de la moins à la plus récemment utilisée."""
+        with self._transaction() as connection:
+            return [row[0] for row in connection.execute("SELECT base FROM rates ORDER BY used_at")]
+    
+    def ages(self) -> Dict[str, float]:
+        """
+        Retourne l'âge de chaque entrée.
+        
+        Returns:
+            Secondes écoulées depuis le stockage, par clé
+        """
+        now = self._clock()
+        with self._transaction() as connection:
+            return {base: now - stored_at
+                    for base, stored_at in connection.execute("SELECT base, stored_at FROM rates")}
+    
+    def idle_times(self) -> Dict[str, float]:
+        """
+        Retourne le temps écoulé depuis la dernière lecture de chaque entrée.
+        
+        Returns:
+            Secondes écoulées depuis la dernière lecture, par clé
+        """
+        now = self._clock()
+        with self._transaction() as connection:
+            return {base: now - used_at
+                    for base, used_at in connection.execute("SELECT base, used_at FROM rates")}
+    
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM rates").fetchone()[0]
+    
+    def __contains__(self, key: str) -> bool:
+        return self._connection().execute(
+            "SELECT 1 FROM rates WHERE base = ?", (key,)
+        ).fetchone() is not None
+    
+    def info(self) -> Dict:
+        """
+        Retourne l'état et les statistiques du cache.
+        
+        Returns:
+            Informations sur le cache (mêmes clés que RateCache.info, plus path)
+        """
+        limit = self._clock() - self.ttl.total_seconds()
+        with self._transaction() as connection:
+            rows = connection.execute("SELECT base, stored_at FROM rates ORDER BY used_at").fetchall()
+            counters = dict(connection.execute("SELECT name, value FROM counters"))
+        info = {
+            'entries': len(rows),
+            'keys': [base for base, _ in rows],
+            'oldest_entry': min(
+                (datetime.fromtimestamp(stored_at) for _, stored_at in rows),
+                default=None
+            ),
+            'expired_entries': sum(1 for _, stored_at in rows if stored_at <= limit),
+            'max_entries': self.max_entries,
+            'path': self.path,
+        }
+        info.update((name, counters.get(name, 0)) for name in self._COUNTERS)
+        return info
@@ -0,0 +1,189 @@
+"""
+Contrôle de cohérence des taux de change (taux directs, inverses et croisés).
+"""
+
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from currency import Currency
+
+
+@dataclass(frozen=True)
+class RateInconsistency:
+    """
+    Taux direct en désaccord avec le taux implicite des autres taux.
+    
+    Le taux implicite est celui du chemin entre les deux devises dans un
+    arbre couvrant du graphe des taux. Le cycle formé par le taux direct et
+    ce chemin rapporte (1 + deviation) par unité quand deviation > 0; quand
+    deviation < 0, c'est le cycle inverse qui rapporte 1 / (1 + deviation)
+    (voir profitable_cycle).
+    
+    Le taux désigné n'est pas forcément le taux erroné: un taux faux de
+    l'arbre couvrant fait apparaître comme incohérents tous les taux hors
+    de l'arbre dont le cycle l'emprunte. Un taux présent dans les cycles
+    de plusieurs incohérences est le suspect le plus probable.
+    """
+    from_currency: Currency
+    to_currency: Currency
+    rate: Decimal  # Taux direct enregistré
+    implied_rate: Optional[float]  # Taux implicite (None pour un taux non positif)
+    deviation: float  # Écart relatif taux / taux implicite - 1
+    cycle: Tuple[Currency, ...] = field(default=())  # from, to, ..., from
+    
+    def __str__(self) -> str:
+        path = " → ".join(currency.code for currency in self.cycle)
+        return (f"{self.from_currency.code} → {self.to_currency.code}: {self.rate} "
+                f"(implicite {self.implied_rate}, écart {self.deviation:+.3e}) [{path}]")
+    
+    @property
+    def profitable_cycle(self) -> Tuple[Currency, ...]:
+        """Cycle parcouru dans le sens qui rapporte (vide pour un taux non positif)."""
+        return self.cycle if self.deviation > 0 else self.cycle[::-1]
+
+
+@dataclass(frozen=True)
+class ConsistencyReport:
+    """
+    Résultat d'un contrôle de cohérence des taux.
+    """
+    checked: int  # Nombre de taux contrôlés
+    tolerance: float  # Écart relatif toléré
+    inconsistencies: Tuple[RateInconsistency, ...] = field(default=())
+    
+    @property
+    def is_consistent(self) -> bool:
+        """Indique si tous les taux sont cohérents à la tolérance près."""
+        return not self.inconsistencies
+    
+    @property
+    def arbitrage_cycles(self) -> List[Tuple[Currency, ...]]:
+        """Cycles de conversion rapportant plus que la tolérance, dans le sens qui rapporte."""
+        return [item.profitable_cycle for item in self.inconsistencies if item.cycle]
+
+
+def check_rate_consistency(rates, tolerance: float = 1e-6) -> ConsistencyReport:
+    """
+    Vérifie que les taux directs, inverses et croisés concordent.
+    
+    Au lieu de comparer chaque triangle de devises (O(n³) en Decimal), le
+    contrôle attribue à chaque devise un potentiel log(taux) le long d'un
+    arbre couvrant calculé par parcours en largeur, puis compare en une
+    passe chaque taux direct à la différence de potentiel de ses devises:
+    log(taux) - (φ[cible] - φ[source]). Tous les taux sont cohérents si et
+    seulement si ces résidus sont nuls, ce qui coûte O(nombre de taux) en
+    flottants. Chaque résidu au-delà de la tolérance est rapporté avec le
+    cycle qu'il ferme dans l'arbre, quel que soit son signe. Seuls les taux
+    hors de l'arbre peuvent être désignés (voir RateInconsistency).
+    
+    Args:
+        rates: CurrencyConverter ou RateSnapshot à contrôler
+        tolerance: Écart relatif toléré (ex: 1e-6)
+    
+    Returns:
+        Rapport des taux incohérents
+    
+    Raises:
+        ValueError: Si la tolérance n'est pas positive
+    """
+    if not tolerance > 0:
+        raise ValueError("La tolérance doit être positive")
+    
+    # Arêtes (source, cible, log(taux)) sur des indices compacts
+    index: Dict[Currency, int] = {}
+    currencies: List[Currency] = []
+    edges: List[Tuple[int, int, float]] = []
+    exchange_rates = []
+    invalid: List[RateInconsistency] = []
+    checked = 0
+    for exchange_rate in rates._iter_rates():
+        checked += 1
+        for currency in (exchange_rate.from_currency, exchange_rate.to_currency):
+            if currency not in index:
+                index[currency] = len(currencies)
+                currencies.append(currency)
+        if exchange_rate.rate <= 0:
+            invalid.append(RateInconsistency(exchange_rate.from_currency,
+                                             exchange_rate.to_currency,
+                                             exchange_rate.rate, None, -1.0))
+            continue
+        edges.append((index[exchange_rate.from_currency], index[exchange_rate.to_currency],
+                      math.log(exchange_rate.rate)))
+        exchange_rates.append(exchange_rate)
+    
+    # Arbre couvrant (graphe non orienté) et potentiels
+    adjacency: List[List[Tuple[int, float]]] = [[] for _ in currencies]
+    for source, target, log_rate in edges:
+        adjacency[source].append((target, log_rate))
+        adjacency[target].append((source, -log_rate))
+    
+    potential: List[Optional[float]] = [None] * len(currencies)
+    parent: List[int] = list(range(len(currencies)))
+    depth: List[int] = [0] * len(currencies)
+    for root in range(len(currencies)):
+        if potential[root] is not None:
+            continue
+        potential[root] = 0.0
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            for neighbour, log_rate in adjacency[node]:
+                if potential[neighbour] is None:
+                    potential[neighbour] = potential[node] + log_rate
+                    parent[neighbour] = node
+                    depth[neighbour] = depth[node] + 1
+                    queue.append(neighbour)
+    
+    # Résidus de tous les taux en une passe
+    limit = math.log1p(tolerance)
+    residuals = [log_rate - (potential[target] - potential[source])
+                 for source, target, log_rate in edges]
+    
+    for position, residual in enumerate(residuals):
+        if abs(residual) <= limit:
+            continue
+        source, target, log_rate = edges[position]
+        exchange_rate = exchange_rates[position]
+        cycle = _tree_cycle(source, target, parent, depth)
+        invalid.append(RateInconsistency(
+            exchange_rate.from_currency,
+            exchange_rate.to_currency,
+            exchange_rate.rate,
+            math.exp(log_rate - residual),
+            math.expm1(residual),
+            tuple(currencies[node] for node in cycle),
+        ))
+    
+    return ConsistencyReport(checked, tolerance, tuple(invalid))
+
+
+def _tree_cycle(source: int, target: int, parent: List[int], depth: List[int]) -> List[int]:
+    """
+    Cycle formé par l'arête source → cible et le chemin de l'arbre cible → source.
+    
+    Args:
+        source: Devise source de l'arête
+        target: Devise cible de l'arête
+        parent: Parent de chaque devise dans l'arbre couvrant
+        depth: Profondeur de chaque devise dans l'arbre couvrant
+    
+    Returns:
+        Devises du cycle, de la source à la source
+    """
+    up, down = [target], [source]
+    a, b = target, source
+    while depth[a] > depth[b]:
+        a = parent[a]
+        up.append(a)
+    while depth[b] > depth[a]:
+        b = parent[b]
+        down.append(b)
+    while a != b:
+        a, b = parent[a], parent[b]
+        up.append(a)
+        down.append(b)
+    # Ancêtre commun présent à la fin des deux chemins
+    return [source] + up + down[-2::-1]
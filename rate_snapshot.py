@@ -0,0 +1,284 @@
+"""
+Format binaire compact des taux de change, chargé par projection mémoire (mmap).
+
+Structure du fichier (petit-boutiste):
+
+    En-tête       magic b"CCRS", version du format, nombre de devises,
+                  nombre de taux, position des taux
+    Devises       code, unité mineure, code numérique, nom et symbole
+    Taux          enregistrements de taille fixe triés par (source, cible):
+                  indices des devises dans la table ci-dessus, taux en
+                  virgule fixe décimale (mantisse int64 × 10^-exposant) et
+                  horodatage (microsecondes depuis 1970-01-01, int64)
+
+Les lectures ponctuelles (RateSnapshotFile.get) décodent directement les
+pages projetées, que partagent les processus d'un même hôte qui ouvrent le
+même fichier. Le chargement dans un convertisseur (load_into) en fait en
+revanche une copie privée: chaque taux est décodé et ajouté à la table du
+convertisseur.
+"""
+
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from decimal import Context, Decimal
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from currency import Currency, registry
+from currency_converter import ExchangeRate
+
+
+MAGIC = b"CCRS"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIIQ")  # magic, version, réservé, devises, taux, position des taux
+_CURRENCY = struct.Struct("<3sBHBB")  # code, unité mineure, numérique, long. nom, long. symbole
+_RECORD = struct.Struct("<HHbxxxqq")  # source, cible, exposant, mantisse, horodatage
+_KEY = struct.Struct("<HH")  # début d'un enregistrement: (source, cible)
+
+# Précision des taux: 18 chiffres significatifs tiennent dans un int64
+_RATE_CONTEXT = Context(prec=18)
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def write_rate_snapshot(rates, path: str) -> int:
+    """
+    Écrit les taux courants d'un convertisseur dans un fichier binaire.
+    
+    Le fichier est écrit à côté de sa destination puis renommé, pour que
+    les lecteurs ne voient jamais un fichier partiel. Les taux sont
+    arrondis à 18 chiffres significatifs et les horodatages sont stockés
+    tels quels (heure locale naïve) à la microseconde.
+    
+    Args:
+        rates: CurrencyConverter ou RateSnapshot à enregistrer
+        path: Chemin du fichier
+    
+    Returns:
+        Nombre de taux écrits
+    """
+    index: Dict[Currency, int] = {}
+    currencies: List[Currency] = []
+    records: List[Tuple[int, int, int, int, int]] = []
+    for exchange_rate in rates._iter_rates():
+        for currency in (exchange_rate.from_currency, exchange_rate.to_currency):
+            if currency not in index:
+                index[currency] = len(currencies)
+                currencies.append(currency)
+        exponent, mantissa = _encode_rate(exchange_rate.rate)
+        timestamp = (exchange_rate.timestamp - _EPOCH) // _MICROSECOND
+        records.append((index[exchange_rate.from_currency], index[exchange_rate.to_currency],
+                        exponent, mantissa, timestamp))
+    records.sort()
+    
+    table = bytearray()
+    for currency in currencies:
+        name = currency.name.encode("utf-8")
+        symbol = (currency.symbol or "").encode("utf-8")
+        table += _CURRENCY.pack(currency.code.encode("ascii"), currency.minor_unit,
+                                currency.numeric or 0, len(name), len(symbol))
+        table += name + symbol
+    
+    # Enregistrements alignés sur 8 octets
+    records_offset = _HEADER.size + len(table)
+    records_offset += -records_offset % 8
+    
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "wb") as handle:
+            handle.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(currencies),
+                                      len(records), records_offset))
+            handle.write(table)
+            handle.write(bytes(records_offset - _HEADER.size - len(table)))
+            for record in records:
+                handle.write(_RECORD.pack(*record))
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return len(records)
+
+
+def _encode_rate(rate: Decimal) -> Tuple[int, int]:
+    """
+    Convertit un taux en (exposant, mantisse) avec taux = mantisse × 10^-exposant.
+    
+    Raises:
+        ValueError: Si le taux n'est pas représentable
+    """
+    sign, digits, exponent = _RATE_CONTEXT.plus(rate).as_tuple()
+    if not isinstance(exponent, int) or not -128 <= -exponent <= 127:
+        raise ValueError(f"Taux non représentable dans le format binaire: {rate}")
+    mantissa = int("".join(map(str, digits)))
+    return -exponent, -mantissa if sign else mantissa
+
+
+class RateSnapshotFile:
+    """
+    Fichier de taux binaire projeté en mémoire, en lecture seule.
+    
+    Seuls l'en-tête et la table des devises sont décodés à l'ouverture; un
+    taux n'est décodé que lorsqu'il est lu (get, itération, load_into).
+    
+    Exemple:
+        with RateSnapshotFile("rates.bin") as snapshot:
+            snapshot.load_into(converter)
+    """
+    
+    def __init__(self, path: str):
+        """
+        Ouvre et projette un fichier de taux.
+        
+        Args:
+            path: Chemin du fichier
+        
+        Raises:
+            ValueError: Si le fichier n'est pas un fichier de taux valide
+        """
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse_header()
+        except (ValueError, struct.error) as error:
+            self._map.close()
+            raise ValueError(f"Fichier de taux invalide {path}: {error}") from None
+    
+    def _parse_header(self) -> None:
+        """Décode l'en-tête et la table des devises."""
+        magic, version, _, currency_count, record_count, records_offset = \
+            _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError("signature absente")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"version {version} non supportée")
+        if records_offset + record_count * _RECORD.size > len(self._map):
+            raise ValueError("fichier tronqué")
+        
+        self._currencies: List[Currency] = []
+        self._positions: Dict[Currency, int] = {}
+        offset = _HEADER.size
+        for position in range(currency_count):
+            code, minor_unit, numeric, name_size, symbol_size = \
+                _CURRENCY.unpack_from(self._map, offset)
+            offset += _CURRENCY.size
+            name = self._map[offset:offset + name_size].decode("utf-8")
+            offset += name_size
+            symbol = self._map[offset:offset + symbol_size].decode("utf-8") or None
+            offset += symbol_size
+            
+            code = code.decode("ascii")
+            currency = registry.get(code) or Currency(code, name, symbol, minor_unit,
+                                                      numeric or None)
+            self._currencies.append(currency)
+            self._positions[currency] = position
+        
+        self._count = record_count
+        self._offset = records_offset
+        # Clés (source, cible) des enregistrements, lues à la demande
+        self._keys = _RecordKeys(self._map, records_offset, record_count)
+    
+    @property
+    def currencies(self) -> List[Currency]:
+        """Devises présentes dans le fichier."""
+        return list(self._currencies)
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def _decode(self, position: int) -> ExchangeRate:
+        """Décode l'enregistrement à une position."""
+        source, target, exponent, mantissa, timestamp = \
+            _RECORD.unpack_from(self._map, self._offset + position * _RECORD.size)
+        return ExchangeRate(self._currencies[source], self._currencies[target],
+                            Decimal(mantissa).scaleb(-exponent),
+                            _EPOCH + timestamp * _MICROSECOND)
+    
+    def get(self, from_currency: Currency, to_currency: Currency) -> Optional[ExchangeRate]:
+        """
+        Recherche un taux par dichotomie, sans décoder les autres.
+        
+        Args:
+            from_currency: Devise source
+            to_currency: Devise cible
+        
+        Returns:
+            Taux de change ou None si absent du fichier
+        """
+        source = self._positions.get(from_currency)
+        target = self._positions.get(to_currency)
+        if source is None or target is None:
+            return None
+        position = bisect_left(self._keys, (source, target))
+        if position < self._count and self._keys[position] == (source, target):
+            return self._decode(position)
+        return None
+    
+    def __iter__(self) -> Iterator[ExchangeRate]:
+        for position in range(self._count):
+            yield self._decode(position)
+    
+    def load_into(self, converter) -> int:
+        """
+        Ajoute tous les taux du fichier à un convertisseur, en une version.
+        
+        Les horodatages du fichier sont conservés: ses taux remplacent les
+        taux par défaut, mais un taux plus récent déjà ajouté au
+        convertisseur reste le taux courant de sa paire.
+        
+        Ce n'est pas une projection sans copie: tous les enregistrements
+        sont décodés et copiés dans la table du convertisseur, propre au
+        processus. Le coût est proportionnel au nombre de taux (de l'ordre
+        de 0,2 s pour 25 000 paires); pour quelques paires, get évite ce
+        chargement.
+        
+        Args:
+            converter: CurrencyConverter à alimenter
+        
+        Returns:
+            Nombre de taux chargés
+        """
+        currencies = self._currencies
+        records = memoryview(self._map)[self._offset:self._offset + self._count * _RECORD.size]
+        try:
+            with converter.batch_update():
+                for source, target, exponent, mantissa, timestamp in _RECORD.iter_unpack(records):
+                    converter.add_exchange_rate(currencies[source], currencies[target],
+                                                Decimal(mantissa).scaleb(-exponent),
+                                                _EPOCH + timestamp * _MICROSECOND)
+        finally:
+            records.release()
+        return self._count
+    
+    def close(self) -> None:
+        """Libère la projection mémoire."""
+        self._map.close()
+    
+    def __enter__(self) -> 'RateSnapshotFile':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def __repr__(self) -> str:
+        return f"RateSnapshotFile(currencies={len(self._currencies)}, rates={self._count})"
+
+
+class _RecordKeys:
+    """Séquence des clés (source, cible) des enregistrements, pour bisect."""
+    
+    __slots__ = ('_map', '_offset', '_count')
+    
+    def __init__(self, buffer: mmap.mmap, offset: int, count: int):
+        self._map = buffer
+        self._offset = offset
+        self._count = count
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, position: int) -> Tuple[int, int]:
+        return _KEY.unpack_from(self._map, self._offset + position * _RECORD.size)
@@ -3,13 +3,37 @@
 Tests unitaires pour le convertisseur de devise.
 """
 
+import io
+import json
+import os
+import pickle
+import random
+import tempfile
+import threading
+import time
 import unittest
-from decimal import Decimal
-from datetime import datetime
+from unittest import mock
+from collections.abc import Mapping, Set as AbstractSet
+from contextlib import redirect_stdout
+from decimal import Decimal, localcontext
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
-from currency import Currency, EUR, USD, GBP, JPY
-from money import Money
-from currency_converter import CurrencyConverter, ExchangeRate
+import requests
+
+import currency as currency_module
+from currency import Currency, CurrencyRegistry, registry, EUR, USD, GBP, JPY
+from money import Money, MoneyAccumulator
+from money_array import MoneyArray
+from currency_converter import CurrencyConverter, ExchangeRate, RateSnapshot
+from enhanced_currency_converter import EnhancedCurrencyConverter
+from rate_consistency import check_rate_consistency
+from rate_snapshot import RateSnapshotFile, write_rate_snapshot
+from float_converter import FloatConverter, RELATIVE_ERROR_BOUND
+from rate_cache import RateCache, SQLiteRateCache
+from exchange_rate_api import ExchangeRateAPI
+from http_client import HttpClient
+from provider_health import ProviderHealth, CLOSED, OPEN, HALF_OPEN
 
 
 class TestCurrency(unittest.TestCase):
@@ -63,6 +87,21 @@ class TestCurrency(unittest.TestCase):
         self.assertEqual(str(eur_with_symbol), "Euro (EUR) - €")
         self.assertEqual(str(eur_without_symbol), "Euro (EUR)")
     
+    def test_currency_pickle_recomputes_ordinal(self):
+        """Test du numéro interne recalculé au dépicklage (autre processus)."""
+        currency = Currency("QQB", "Test Coin", "Q", 8)
+        data = pickle.dumps(currency)
+        
+        # Autre processus: le numéro de la devise est attribué à une autre
+        with mock.patch.dict(currency_module._ORDINALS, {"XBT": currency.ordinal}, clear=True):
+            restored = pickle.loads(data)
+            self.assertEqual(restored.ordinal, currency_module._ORDINALS["QQB"])
+            self.assertNotEqual(restored.ordinal, currency.ordinal)
+        
+        self.assertEqual(restored, currency)
+        self.assertEqual((restored.name, restored.symbol, restored.minor_unit),
+                         ("Test Coin", "Q", 8))
+    
     def test_predefined_currencies(self):
         """Test des devises prédéfinies."""
         self.assertEqual(EUR.code, "EUR")
@@ -71,6 +110,47 @@ class TestCurrency(unittest.TestCase):
         self.assertEqual(JPY.code, "JPY")
 
 
+class TestCurrencyRegistry(unittest.TestCase):
+    """Tests pour le registre ISO 4217."""
+    
+    def test_lookup_by_code_and_number(self):
+        """Test de recherche par code alphabétique et numérique."""
+        self.assertIs(registry.get("EUR"), EUR)
+        self.assertIs(registry["USD"], USD)
+        self.assertIs(registry.get_by_number(978), EUR)
+        self.assertIs(registry.get_by_number(392), JPY)
+        self.assertIsNone(registry.get("XYZ"))
+        self.assertIsNone(registry.get_by_number(1))
+    
+    def test_full_iso_table(self):
+        """Test de couverture de la table ISO 4217."""
+        self.assertGreater(len(registry), 150)
+        self.assertIn("SEK", registry)
+        self.assertEqual(registry["JPY"].minor_unit, 0)
+        self.assertEqual(registry["BHD"].minor_unit, 3)
+        self.assertEqual(registry["CLF"].minor_unit, 4)
+    
+    def test_ordinal(self):
+        """Test des numéros internes, stables par code."""
+        self.assertEqual(Currency("EUR", "Euro").ordinal, EUR.ordinal)
+        self.assertNotEqual(EUR.ordinal, USD.ordinal)
+        self.assertEqual(Currency("xts", "Test").ordinal, Currency("XTS", "Test").ordinal)
+    
+    def test_intern(self):
+        """Test d'internement des devises."""
+        local = CurrencyRegistry()
+        btc = Currency("BTC", "Bitcoin", "₿")
+        
+        self.assertIs(local.intern(btc), btc)
+        self.assertIs(local.intern(Currency("BTC", "Bitcoin")), btc)
+        self.assertIs(registry.intern(Currency("EUR", "Euro")), EUR)
+    
+    def test_equality_by_code(self):
+        """Test d'égalité par code ISO."""
+        self.assertEqual(Currency("EUR", "Euro"), EUR)
+        self.assertEqual(hash(Currency("EUR", "Euro")), hash(EUR))
+
+
 class TestMoney(unittest.TestCase):
     """Tests pour la classe Money."""
     
@@ -175,6 +255,10 @@ class TestMoney(unittest.TestCase):
         result_decimal = money * Decimal('0.5')
         self.assertEqual(result_decimal.amount, Decimal('50'))
         
+        # Produit exact, sans arrondi à la précision du contexte Decimal
+        large = Money("12345678901234567890.12", self.eur) * Decimal('1.000000000000000001')
+        self.assertEqual(large.amount, Decimal('12345678901234567902.46567890123456789012'))
+        
         # Type invalide
         with self.assertRaises(TypeError):
             money * "invalid"
@@ -191,6 +275,10 @@ class TestMoney(unittest.TestCase):
         result_float = money / 4.0
         self.assertEqual(result_float.amount, Decimal('25'))
         
+        # Division inexacte: quotient au contexte Decimal
+        self.assertEqual((Money(1, self.eur) / 3).amount, Decimal(100) / 3 / 100)
+        self.assertEqual((Money("-10.50", self.eur) / -7).amount, Decimal('1.50'))
+        
         # Division par zéro
         with self.assertRaises(ZeroDivisionError):
             money / 0
@@ -215,6 +303,61 @@ class TestMoney(unittest.TestCase):
         rounded_four = money.round(4)
         self.assertEqual(rounded_four.amount, Decimal('123.4568'))
     
+    def test_money_rounding_half_up_negative(self):
+        """Test d'arrondi ROUND_HALF_UP sur des montants négatifs."""
+        self.assertEqual(Money("-2.345", self.eur).round(2).amount, Decimal('-2.35'))
+        self.assertEqual(Money("-2.344", self.eur).round(2).amount, Decimal('-2.34'))
+    
+    def test_money_minor_units_storage(self):
+        """Test du stockage compact en unités mineures."""
+        money = Money("12.5", self.eur)
+        self.assertFalse(hasattr(money, '__dict__'))
+        self.assertEqual(money._units, 1250)
+        self.assertEqual(money._exp, 2)
+        
+        yen = Money(500, JPY)
+        self.assertEqual(yen._units, 500)
+        self.assertEqual(yen._exp, 0)
+        
+        # Plus de décimales que l'unité mineure: l'exposant s'étend
+        precise = Money("0.0001", self.eur)
+        self.assertEqual(precise.amount, Decimal('0.0001'))
+        self.assertEqual(precise._exp, 4)
+    
+    def test_money_arithmetic_mixed_exponents(self):
+        """Test d'arithmétique entre montants d'exposants différents."""
+        a = Money("1.005", self.eur)
+        b = Money("2.10", self.eur)
+        
+        self.assertEqual((a + b).amount, Decimal('3.105'))
+        self.assertEqual((b - a).amount, Decimal('1.095'))
+        self.assertTrue(a < b)
+        self.assertEqual(Money("2.1", self.eur), Money("2.1000", self.eur))
+    
+    def test_money_fast_constructors(self):
+        """Test des constructeurs rapides."""
+        money = Money.from_decimal(Decimal('12.345'), self.eur)
+        self.assertEqual(money, Money("12.345", self.eur))
+        self.assertEqual(money.amount, Decimal('12.345'))
+        
+        self.assertEqual(Money.from_minor_units(1050, self.eur).amount, Decimal('10.50'))
+        self.assertEqual(Money.from_minor_units(1050, self.eur, 3).amount, Decimal('1.050'))
+        self.assertEqual(Money.from_minor_units(105, self.eur, 1).amount, Decimal('10.5'))
+        self.assertEqual(Money.from_minor_units(500, JPY).amount, Decimal('500'))
+        self.assertEqual(Money.from_decimal(Decimal('1E+3'), JPY).amount, Decimal('1000'))
+        self.assertEqual(Money.from_decimal(Decimal('0.125'), self.eur).amount, Decimal('0.125'))
+        self.assertEqual(Money.from_decimal(Decimal('-7.5E-4'), self.eur).amount, Decimal('-0.00075'))
+        self.assertEqual(Money(Decimal('2.5000'), self.eur).amount, Decimal('2.50'))
+        with self.assertRaises(ValueError):
+            Money.from_decimal(Decimal('sNaN'), self.eur)
+    
+    def test_money_non_finite_amount(self):
+        """Test de rejet des montants non finis."""
+        with self.assertRaises(ValueError):
+            Money(float('inf'), self.eur)
+        with self.assertRaises(ValueError):
+            Money("NaN", self.eur)
+    
     def test_money_string_representation(self):
         """Test de représentation textuelle."""
         money_with_symbol = Money(100, self.eur)
@@ -283,6 +426,241 @@ class TestCurrencyConverter(unittest.TestCase):
         self.assertIsNotNone(rate)
         self.assertEqual(rate.rate, Decimal('0.000023'))
     
+    def test_add_exchange_rates_bulk(self):
+        """Test d'ajout groupé de taux avec horodatage commun et inverses."""
+        sek = Currency("SEK", "Swedish Krona")
+        nok = Currency("NOK", "Norwegian Krone")
+        stamp = datetime(2024, 1, 1, 12, 0, 0)
+        
+        self.converter.add_exchange_rates(
+            {(EUR, sek): Decimal('11.20'), (EUR, nok): '11.50'},
+            timestamp=stamp, inverse=True
+        )
+        
+        for pair in ((EUR, sek), (sek, EUR), (EUR, nok), (nok, EUR)):
+            rate = self.converter.get_exchange_rate(*pair)
+            self.assertEqual(rate.timestamp, stamp)
+        self.assertEqual(self.converter.get_exchange_rate(nok, EUR).rate,
+                         Decimal('1') / Decimal('11.50'))
+        self.assertEqual(self.converter.convert(Money(1, sek), nok).currency, nok)
+    
+    def test_batch_update_defers_invalidation(self):
+        """Test du report de l'invalidation des taux croisés."""
+        self.converter.convert(Money(1, GBP), USD)
+        
+        with self.converter.batch_update():
+            self.converter.add_exchange_rate(EUR, USD, Decimal('2'))
+            with self.converter.batch_update():
+                self.converter.add_exchange_rate(GBP, EUR, Decimal('1'))
+            # Invalidation reportée jusqu'à la sortie du bloc externe
+            self.assertIn(GBP.ordinal, self.converter._table.cross_rates)
+        
+        self.assertEqual(self.converter.convert(Money(1, GBP), USD).amount, Decimal('2'))
+    
+    def test_batch_update_rolls_back_on_error(self):
+        """Test de l'abandon d'un lot interrompu par une exception."""
+        version = self.converter.version
+        
+        with self.assertRaises(RuntimeError):
+            with self.converter.batch_update():
+                self.converter.add_exchange_rate(EUR, USD, Decimal('2'))
+                raise RuntimeError("interruption")
+        
+        self.assertEqual(self.converter.version, version)
+        self.assertEqual(self.converter.get_exchange_rate(EUR, USD).rate, Decimal('1.0850'))
+        
+        # Le lot suivant ne reprend pas les modifications abandonnées
+        with self.converter.batch_update():
+            self.converter.add_exchange_rate(EUR, GBP, Decimal('0.9'))
+        self.assertEqual(self.converter.version, version + 1)
+        self.assertEqual(self.converter.get_exchange_rate(EUR, USD).rate, Decimal('1.0850'))
+        self.assertEqual(self.converter.get_exchange_rate(EUR, GBP).rate, Decimal('0.9'))
+    
+    def test_snapshot_pins_rate_version(self):
+        """Test de l'instantané figeant une version des taux."""
+        snapshot = self.converter.snapshot()
+        self.assertIsInstance(snapshot, RateSnapshot)
+        
+        with self.converter.batch_update():
+            self.converter.add_exchange_rate(EUR, USD, Decimal('2'))
+            # Rien n'est publié avant la sortie du bloc
+            self.assertEqual(self.converter.version, snapshot.version)
+        
+        self.assertEqual(self.converter.version, snapshot.version + 1)
+        self.assertEqual(self.converter.convert(Money(1, EUR), USD).amount, Decimal('2'))
+        self.assertEqual(snapshot.convert(Money(1, EUR), USD).amount, Decimal('1.0850'))
+        self.assertEqual(snapshot.get_exchange_rate(EUR, USD).rate, Decimal('1.0850'))
+    
+    def test_concurrent_reads_see_consistent_rates(self):
+        """Test de cohérence des conversions pendant des mises à jour."""
+        # GBP -> EUR -> USD vaut toujours 1 si les deux taux sont lus ensemble
+        self.converter.add_exchange_rates({(GBP, EUR): Decimal('0.5'), 
+                                           (EUR, USD): Decimal('2')})
+        done = threading.Event()
+        
+        def refresh():
+            for i in range(500):
+                factor = Decimal(2 if i % 2 else 4)
+                self.converter.add_exchange_rates({(GBP, EUR): 1 / factor, 
+                                                   (EUR, USD): factor})
+            done.set()
+        
+        writer = threading.Thread(target=refresh)
+        writer.start()
+        amounts = set()
+        while not done.is_set():
+            amounts.add(self.converter.convert(Money(1, GBP), USD).amount)
+        writer.join()
+        
+        self.assertEqual(amounts, {Decimal('1')})
+    
+    def test_convert_many(self):
+        """Test de la conversion par lots."""
+        amounts = [Money(10, EUR), Money(5, GBP), Money(10, EUR), Money(3, USD)]
+        converted = list(self.converter.convert_many(iter(amounts), USD, chunk_size=3))
+        
+        self.assertEqual(converted, [self.converter.convert(m, USD) for m in amounts])
+        # Montants identiques d'un même lot convertis une seule fois
+        self.assertIs(converted[0], converted[2])
+        self.assertEqual(converted[3].currency, USD)
+    
+    def test_convert_pairs(self):
+        """Test de la conversion par lots vers plusieurs devises."""
+        pairs = [(Money(10, EUR), USD), (Money(10, EUR), GBP), (Money(1, USD), EUR)]
+        converted = list(self.converter.convert_pairs(pairs))
+        self.assertEqual(converted, [self.converter.convert(m, t) for m, t in pairs])
+        
+        # Les taux sont figés au début de la conversion
+        results = self.converter.convert_pairs((Money(1, EUR), USD) for _ in range(3))
+        first = next(results)
+        self.converter.add_exchange_rate(EUR, USD, Decimal('2'))
+        self.assertEqual([first] + list(results), [Money('1.0850', USD)] * 3)
+        
+        btc = Currency("BTC", "Bitcoin")
+        with self.assertRaises(ValueError):
+            list(self.converter.convert_pairs([(Money(1, EUR), btc)]))
+    
+    def test_pair_converter(self):
+        """Test du convertisseur lié à une paire de devises."""
+        gbp_to_usd = self.converter.pair(GBP, USD)
+        money = Money("12.34", GBP)
+        self.assertEqual(gbp_to_usd(money), self.converter.convert(money, USD))
+        
+        # Nouvelle version des taux: le taux croisé est résolu à nouveau
+        self.converter.add_exchange_rate(GBP, USD, Decimal('1.25'))
+        self.assertEqual(gbp_to_usd.rate, Decimal('1.25'))
+        self.assertEqual(gbp_to_usd(Money(2, GBP)).amount, Decimal('2.50'))
+        
+        with self.assertRaises(ValueError):
+            gbp_to_usd(Money(1, EUR))
+        with self.assertRaises(ValueError):
+            self.converter.pair(EUR, Currency("BTC", "Bitcoin"))
+    
+    def test_historical_rates(self):
+        """Test des conversions à une date de valeur."""
+        day = datetime(2024, 3, 1)
+        self.converter.add_exchange_rate(GBP, USD, Decimal('1.20'), day)
+        self.converter.add_exchange_rate(GBP, USD, Decimal('1.30'), day + timedelta(days=2))
+        # Taux antidaté: complète l'historique sans remplacer le taux courant
+        self.converter.add_exchange_rate(GBP, USD, Decimal('1.25'), day + timedelta(days=1))
+        
+        self.assertEqual(self.converter.get_exchange_rate(GBP, USD).rate, Decimal('1.30'))
+        at = day + timedelta(days=1, hours=12)
+        self.assertEqual(self.converter.get_exchange_rate(GBP, USD, at=at).rate, Decimal('1.25'))
+        self.assertEqual(self.converter.convert(Money(10, GBP), USD, at=at).amount,
+                         Decimal('12.50'))
+        self.assertIsNone(self.converter.get_exchange_rate(GBP, USD, at=day - timedelta(days=1)))
+        
+        # Conversion via pivot avec les taux applicables à la date
+        self.converter.add_exchange_rate(EUR, GBP, Decimal('0.5'), day)
+        self.assertEqual(self.converter.convert(Money(1, EUR), USD, at=at).amount,
+                         Decimal('0.625'))
+        with self.assertRaises(ValueError):
+            self.converter.convert(Money(1, EUR), USD, at=day - timedelta(days=1))
+    
+    def test_backdated_rate_replaces_default(self):
+        """Test d'un taux daté antérieur au chargement qui remplace le taux par défaut."""
+        self.converter.add_exchange_rate(EUR, USD, Decimal('2'), timestamp=datetime(2024, 1, 1))
+        self.assertEqual(self.converter.convert(Money(10, EUR), USD), Money(20, USD))
+        
+        self.converter.add_exchange_rates({(EUR, GBP): Decimal('0.5')},
+                                          timestamp=datetime(2020, 6, 1))
+        self.assertEqual(self.converter.get_exchange_rate(EUR, GBP).rate, Decimal('0.5'))
+        # Les taux par défaut ne s'appliquent à aucune date de valeur
+        self.assertIsNone(self.converter.get_exchange_rate(EUR, JPY, at=datetime(2024, 1, 1)))
+    
+    def test_default_rates_timestamp(self):
+        """Test de l'horodatage des taux par défaut (date de chargement)."""
+        exchange_rate = self.converter.get_exchange_rate(EUR, USD)
+        self.assertLessEqual(exchange_rate.timestamp, datetime.now())
+        self.assertGreater(exchange_rate.timestamp, datetime.now() - timedelta(days=1))
+        self.assertNotIn('0001-01-01', repr(exchange_rate))
+    
+    def test_aware_timestamp(self):
+        """Test d'un horodatage avec fuseau horaire, ramené à l'heure locale."""
+        moment = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+        local = moment.astimezone().replace(tzinfo=None)
+        self.converter.add_exchange_rate(EUR, USD, Decimal('2'), timestamp=moment)
+        self.converter.add_exchange_rate(EUR, USD, Decimal('3'), timestamp=local + timedelta(hours=1))
+        
+        self.assertEqual(self.converter.get_exchange_rate(EUR, USD).rate, Decimal('3'))
+        exchange_rate = self.converter.get_exchange_rate(EUR, USD, at=moment)
+        self.assertEqual(exchange_rate.rate, Decimal('2'))
+        self.assertEqual(exchange_rate.timestamp, local)
+        self.assertIsNone(exchange_rate.timestamp.tzinfo)
+    
+    def test_history_retention(self):
+        """Test de la limitation et de l'élagage de l'historique."""
+        converter = CurrencyConverter(history_limit=3)
+        day = datetime(2024, 3, 1)
+        for i in range(5):
+            converter.add_exchange_rate(GBP, USD, Decimal(i + 1), day + timedelta(days=i))
+        
+        self.assertIsNone(converter.get_exchange_rate(GBP, USD, at=day + timedelta(days=1)))
+        self.assertEqual(converter.get_exchange_rate(GBP, USD, at=day + timedelta(days=2)).rate,
+                         Decimal('3'))
+        
+        snapshot = converter.snapshot()
+        converter.prune_history(day + timedelta(days=3, hours=1))
+        self.assertIsNone(converter.get_exchange_rate(GBP, USD, at=day + timedelta(days=2)))
+        self.assertEqual(converter.get_exchange_rate(GBP, USD, at=day + timedelta(days=3, hours=2)).rate,
+                         Decimal('4'))
+        # La version figée n'est pas affectée
+        self.assertEqual(snapshot.get_exchange_rate(GBP, USD, at=day + timedelta(days=2)).rate,
+                         Decimal('3'))
+    
+    def test_default_rates_are_shared_copy_on_write(self):
+        """Test du partage de la table par défaut entre convertisseurs."""
+        other = CurrencyConverter()
+        self.assertIs(self.converter._table, other._table)
+        
+        other.add_exchange_rate(EUR, USD, Decimal('2'))
+        self.assertIsNot(self.converter._table, other._table)
+        self.assertEqual(other.get_exchange_rate(EUR, USD).rate, Decimal('2'))
+        self.assertEqual(self.converter.get_exchange_rate(EUR, USD).rate, Decimal('1.0850'))
+    
+    def test_update_copies_only_touched_row(self):
+        """Test du partage des lignes non modifiées entre versions."""
+        day = datetime(2024, 3, 1)
+        self.converter.add_exchange_rate(GBP, USD, Decimal('1.25'), day)
+        self.converter.add_exchange_rate(GBP, JPY, Decimal('190'), day)
+        self.converter.add_exchange_rate(USD, JPY, Decimal('150'), day)
+        snapshot = self.converter.snapshot()
+        
+        self.converter.add_exchange_rate(GBP, USD, Decimal('1.30'), day + timedelta(days=1))
+        table, frozen = self.converter._table, snapshot._table
+        self.assertIs(table.history[USD.ordinal], frozen.history[USD.ordinal])
+        self.assertIs(table.matrix[USD.ordinal], frozen.matrix[USD.ordinal])
+        self.assertIs(table.history[GBP.ordinal][JPY.ordinal],
+                      frozen.history[GBP.ordinal][JPY.ordinal])
+        self.assertIsNot(table.history[GBP.ordinal], frozen.history[GBP.ordinal])
+        # La version figée n'est pas affectée
+        self.assertEqual(snapshot.get_exchange_rate(GBP, USD).rate, Decimal('1.25'))
+        self.assertEqual(snapshot.get_exchange_rate(GBP, USD, at=day + timedelta(days=2)).rate,
+                         Decimal('1.25'))
+        self.assertEqual(CurrencyConverter().convert(Money(1, EUR), USD).amount,
+                         Decimal('1.0850'))
+    
     def test_get_exchange_rate(self):
         """Test de récupération de taux de change."""
         # Taux existant
@@ -325,6 +703,67 @@ class TestCurrencyConverter(unittest.TestCase):
         self.assertEqual(money_sek.currency, sek)
         self.assertEqual(money_usd.currency, USD)
     
+    def test_convert_multi_hop(self):
+        """Test de conversion par un chemin de plusieurs taux."""
+        sek = Currency("SEK", "Swedish Krona")
+        nok = Currency("NOK", "Norwegian Krone")
+        self.converter.add_exchange_rate(USD, sek, Decimal('10'))
+        self.converter.add_exchange_rate(sek, nok, Decimal('2'))
+        
+        # EUR -> USD -> SEK -> NOK
+        converted = self.converter.convert(Money(1, EUR), nok)
+        self.assertEqual(converted.amount, Decimal('1.0850') * 10 * 2)
+        
+        with self.assertRaises(ValueError):
+            self.converter.convert(Money(1, nok), EUR)
+    
+    def test_cross_rates_follow_updates(self):
+        """Test de mise à jour des taux croisés après modification d'un taux."""
+        sek = Currency("SEK", "Swedish Krona")
+        self.converter.add_exchange_rate(sek, EUR, Decimal('0.1'))
+        self.assertEqual(self.converter.convert(Money(10, sek), USD).amount,
+                         Decimal('1.0850'))
+        
+        # Mise à jour d'un taux du chemin
+        self.converter.add_exchange_rate(sek, EUR, Decimal('0.2'))
+        self.assertEqual(self.converter.convert(Money(10, sek), USD).amount,
+                         Decimal('2.1700'))
+        
+        # Un taux direct raccourcit le chemin
+        self.converter.add_exchange_rate(sek, USD, Decimal('0.5'))
+        self.assertEqual(self.converter.convert(Money(10, sek), USD).amount,
+                         Decimal('5'))
+        
+        # Un taux hors du chemin ne change rien
+        self.converter.add_exchange_rate(EUR, USD, Decimal('2'))
+        self.assertEqual(self.converter.convert(Money(10, sek), USD).amount,
+                         Decimal('5'))
+    
+    def test_cross_rates_independent_of_query_history(self):
+        """Test de taux croisés identiques avec ou sans calculs intermédiaires."""
+        currencies = [registry[code] for code in
+                      ("EUR", "USD", "GBP", "JPY", "CAD", "SEK", "NOK", "CHF", "AUD", "PLN")]
+        rng = random.Random(7)
+        incremental = CurrencyConverter()
+        added = []
+        for _ in range(60):
+            source, target = rng.sample(currencies, 2)
+            rate = Decimal(rng.randint(1, 2000)) / 100
+            incremental.add_exchange_rate(source, target, rate)
+            added.append((source, target, rate))
+            # Calcul intermédiaire: met en cache les arbres de parcours
+            for origin in currencies:
+                incremental._resolve_rate(origin, target)
+        
+        rebuilt = CurrencyConverter()
+        for source, target, rate in added:
+            rebuilt.add_exchange_rate(source, target, rate)
+        for origin in currencies:
+            for target in currencies:
+                self.assertEqual(incremental._resolve_rate(origin, target),
+                                 rebuilt._resolve_rate(origin, target),
+                                 f"{origin.code} -> {target.code}")
+    
     def test_convert_unavailable_rate(self):
         """Test de conversion avec taux non disponible."""
         btc = Currency("BTC", "Bitcoin")
@@ -337,7 +776,7 @@ class TestCurrencyConverter(unittest.TestCase):
         """Test de liste des devises disponibles."""
         currencies = self.converter.list_available_currencies()
         
-        self.assertIsInstance(currencies, set)
+        self.assertIsInstance(currencies, AbstractSet)
         self.assertTrue(len(currencies) > 0)
         
         # Vérifier que EUR et USD sont présents
@@ -349,13 +788,27 @@ class TestCurrencyConverter(unittest.TestCase):
         """Test de récupération de tous les taux pour une devise."""
         eur_rates = self.converter.get_all_rates_for_currency(EUR)
         
-        self.assertIsInstance(eur_rates, dict)
+        self.assertIsInstance(eur_rates, Mapping)
         self.assertTrue(len(eur_rates) > 0)
         
         # Vérifier qu'USD est dans les taux depuis EUR
         target_currencies = [c.code for c in eur_rates.keys()]
         self.assertIn("USD", target_currencies)
     
+    def test_rate_views_are_live_and_read_only(self):
+        """Test des vues en lecture seule sur les index de taux."""
+        currencies = self.converter.list_available_currencies()
+        eur_rates = self.converter.get_all_rates_for_currency(EUR)
+        sek = Currency("SEK", "Swedish Krona")
+        
+        self.assertEqual(len(self.converter.get_all_rates_for_currency(sek)), 0)
+        self.converter.add_exchange_rate(EUR, sek, Decimal('11.20'))
+        
+        self.assertIn(sek, currencies)
+        self.assertEqual(eur_rates[sek].rate, Decimal('11.20'))
+        with self.assertRaises(TypeError):
+            eur_rates[sek] = None
+    
     def test_precision_handling(self):
         """Test de gestion de la précision dans les conversions."""
         money = Money("123.456789", EUR)
@@ -372,6 +825,887 @@ class TestCurrencyConverter(unittest.TestCase):
         self.assertLessEqual(decimal_places, 2)
 
 
+class TestMoneyAccumulator(unittest.TestCase):
+    """Tests pour Money.sum et MoneyAccumulator."""
+    
+    def test_money_sum(self):
+        """Test de Money.sum sur une liste et un générateur."""
+        items = [Money("1.10", EUR), Money("2.005", EUR), Money(3, EUR)]
+        
+        self.assertEqual(Money.sum(items), Money("6.105", EUR))
+        self.assertEqual(Money.sum(Money(i, USD) for i in range(1001)), Money(500500, USD))
+        self.assertEqual(Money.sum([], EUR), Money(0, EUR))
+    
+    def test_money_sum_errors(self):
+        """Test des erreurs de Money.sum."""
+        with self.assertRaises(ValueError):
+            Money.sum([])
+        with self.assertRaises(ValueError):
+            Money.sum([Money(1, EUR), Money(1, USD)])
+        with self.assertRaises(TypeError):
+            Money.sum([Money(1, EUR), 1])
+    
+    def test_accumulator_mixed_currencies(self):
+        """Test du totalisateur avec plusieurs devises."""
+        accumulator = MoneyAccumulator([Money(1, EUR), Money(2, USD)])
+        accumulator.add(Money("0.5", EUR))
+        accumulator.update(iter([Money(100, JPY)]))
+        
+        self.assertEqual(len(accumulator), 3)
+        self.assertEqual(accumulator.total(), {
+            EUR: Money("1.5", EUR), USD: Money(2, USD), JPY: Money(100, JPY),
+        })
+    
+    def test_accumulator_single_currency(self):
+        """Test du totalisateur avec une seule devise."""
+        accumulator = MoneyAccumulator()
+        with self.assertRaises(ValueError):
+            accumulator.total()
+        
+        accumulator.add(Money(5, GBP))
+        accumulator.add(Money(5, Currency("GBP", "British Pound")))
+        self.assertEqual(accumulator.total(), Money(10, GBP))
+
+
+class TestMoneyArray(unittest.TestCase):
+    """Tests pour la classe MoneyArray."""
+    
+    def setUp(self):
+        """Configuration des tests."""
+        self.converter = CurrencyConverter()
+        self.items = [
+            Money("10.05", EUR), Money("2500", JPY), Money("-3.33", USD),
+            Money("0.01", EUR), Money("99.99", GBP), Money("7", JPY),
+        ]
+        self.array = MoneyArray.from_money(self.items)
+    
+    def test_roundtrip(self):
+        """Test de construction et de lecture."""
+        self.assertEqual(len(self.array), len(self.items))
+        self.assertEqual(list(self.array), self.items)
+        self.assertEqual(self.array[1], Money(2500, JPY))
+    
+    def test_from_money_rejects_sub_minor_precision(self):
+        """Test de rejet des montants plus précis que l'unité mineure."""
+        with self.assertRaises(ValueError):
+            MoneyArray.from_money([Money("1.005", EUR)])
+    
+    def test_add_and_sub(self):
+        """Test d'addition et soustraction ligne à ligne."""
+        total = self.array + self.array
+        self.assertEqual(list(total), [m + m for m in self.items])
+        self.assertEqual(list(total - self.array), self.items)
+        
+        other = MoneyArray.from_money([Money(1, USD)] * len(self.items))
+        with self.assertRaises(ValueError):
+            self.array + other
+    
+    def test_scale_and_round_match_scalar(self):
+        """Test de cohérence avec Money pour la multiplication et l'arrondi."""
+        for factor in (3, 1.5, Decimal('0.3333')):
+            expected = [(m * factor).round(m.currency.minor_unit) for m in self.items]
+            self.assertEqual(list(self.array.scale(factor)), expected)
+        
+        self.assertEqual(list(self.array.round(0)), [m.round(0) for m in self.items])
+    
+    def test_sum_by_currency(self):
+        """Test des sommes par devise."""
+        totals = self.array.sum_by_currency()
+        
+        self.assertEqual(totals[EUR], Money("10.06", EUR))
+        self.assertEqual(totals[JPY], Money(2507, JPY))
+        self.assertEqual(set(totals), {EUR, JPY, USD, GBP})
+    
+    def test_convert_matches_scalar(self):
+        """Test de cohérence avec CurrencyConverter.convert."""
+        for target in (USD, JPY, EUR):
+            converted = self.array.convert(self.converter, target)
+            expected = [
+                self.converter.convert(m, target).round(target.minor_unit)
+                for m in self.items
+            ]
+            self.assertEqual(list(converted), expected)
+        
+        btc = Currency("BTC", "Bitcoin")
+        with self.assertRaises(ValueError):
+            self.array.convert(self.converter, btc)
+    
+    def test_exact_beyond_decimal_context(self):
+        """Test des produits de plus de 28 chiffres, calculés exactement."""
+        units = [9_007_199_254_740_993, -9_007_199_254_740_993, -5, 5]
+        amounts = MoneyArray(units, [EUR] * len(units))
+        # Juste sous 1/2: arrondi à 28 chiffres, le produit tomberait sur ,5
+        factor = Decimal('0.' + '4' + '9' * 29)
+        expected = [(m * factor).round(2) for m in amounts]
+        self.assertEqual(expected[0], Money.from_minor_units(4_503_599_627_370_496, EUR))
+        self.assertEqual(list(amounts.scale(factor)), expected)
+        self.assertEqual(list(amounts.scale(Decimal('0.1'))),
+                         [Money.from_minor_units(u, EUR) for u in
+                          (900_719_925_474_099, -900_719_925_474_099, -1, 1)])
+        
+        self.converter.add_exchange_rate(EUR, GBP, factor)
+        mixed = MoneyArray(units + [1], [EUR] * len(units) + [GBP])
+        expected = [self.converter.convert(m, GBP).round(2) for m in mixed]
+        self.assertEqual(list(mixed.convert(self.converter, GBP)), expected)
+
+
+class TestRateConsistency(unittest.TestCase):
+    """Tests du contrôle de cohérence des taux."""
+    
+    def setUp(self):
+        """Configuration des tests."""
+        self.converter = CurrencyConverter()
+    
+    def test_default_rates_are_consistent(self):
+        """Test des taux par défaut (directs et inverses)."""
+        report = check_rate_consistency(self.converter)
+        self.assertTrue(report.is_consistent)
+        self.assertEqual(report.checked, 12)
+        self.assertEqual(report.arbitrage_cycles, [])
+    
+    def test_detects_arbitrage_cycle(self):
+        """Test de détection d'un taux croisé incohérent."""
+        self.converter.add_exchange_rate(GBP, USD, Decimal('1.40'))
+        report = check_rate_consistency(self.converter.snapshot())
+        
+        self.assertFalse(report.is_consistent)
+        [issue] = report.inconsistencies
+        self.assertEqual((issue.from_currency, issue.to_currency), (GBP, USD))
+        self.assertAlmostEqual(issue.implied_rate, 1.0850 / 0.8320)
+        self.assertGreater(issue.deviation, 0.07)
+        self.assertEqual(report.arbitrage_cycles, [(GBP, USD, EUR, GBP)])
+        
+        # Écart inférieur à la tolérance
+        self.assertTrue(check_rate_consistency(self.converter, tolerance=0.1).is_consistent)
+    
+    def test_arbitrage_cycle_below_implied_rate(self):
+        """Test d'un taux direct inférieur au taux implicite (cycle inverse)."""
+        self.converter.add_exchange_rate(GBP, USD, Decimal('1.20'))
+        report = check_rate_consistency(self.converter)
+        
+        [issue] = report.inconsistencies
+        self.assertLess(issue.deviation, -0.07)
+        self.assertEqual(issue.cycle, (GBP, USD, EUR, GBP))
+        # Le cycle inverse rapporte: GBP → EUR → USD, puis USD → GBP à 1 / 1,20
+        self.assertEqual(report.arbitrage_cycles, [(GBP, EUR, USD, GBP)])
+    
+    def test_invalid_inputs(self):
+        """Test des taux non positifs et de la tolérance."""
+        self.converter.add_exchange_rate(GBP, JPY, Decimal('0'))
+        [issue] = check_rate_consistency(self.converter).inconsistencies
+        self.assertIsNone(issue.implied_rate)
+        with self.assertRaises(ValueError):
+            check_rate_consistency(self.converter, tolerance=0)
+
+
+class TestFloatConverter(unittest.TestCase):
+    """Tests du moteur de conversion approché."""
+    
+    def setUp(self):
+        """Configuration des tests."""
+        self.converter = CurrencyConverter()
+        self.engine = FloatConverter(self.converter)
+    
+    def test_error_bound_against_decimal(self):
+        """Test de la borne d'erreur par rapport au calcul exact."""
+        generator = random.Random(17)
+        amounts = [generator.uniform(-1e9, 1e9) for _ in range(1000)]
+        exact_rate = self.converter._resolve_rate(GBP, JPY)
+        
+        converted = self.engine.convert_array(amounts, GBP, JPY)
+        with localcontext() as context:
+            context.prec = 60
+            for amount, approx in zip(amounts, converted):
+                exact = Decimal(amount) * exact_rate
+                self.assertLessEqual(abs(Decimal(approx) - exact),
+                                     abs(exact) * Decimal(RELATIVE_ERROR_BOUND))
+    
+    def test_money_array_and_rate_updates(self):
+        """Test de conversion d'un MoneyArray et du suivi des taux."""
+        amounts = MoneyArray([1000, 250, 99], [EUR, USD, JPY])
+        converted = self.engine.convert_money_array(amounts, EUR)
+        
+        for money, approx in zip(amounts, converted):
+            exact = self.converter.convert(money, EUR).amount
+            self.assertAlmostEqual(approx, float(exact), delta=abs(float(exact)) * 1e-15)
+        self.assertAlmostEqual(self.engine.total(amounts, EUR), sum(converted))
+        
+        self.converter.add_exchange_rate(USD, EUR, Decimal('0.5'))
+        self.assertEqual(self.engine.convert(10.0, USD, EUR), 5.0)
+        with self.assertRaises(ValueError):
+            self.engine.rate(EUR, Currency("BTC", "Bitcoin"))
+
+
+class TestRateSnapshotFile(unittest.TestCase):
+    """Tests du format binaire des taux."""
+    
+    def setUp(self):
+        """Configuration des tests."""
+        self.converter = CurrencyConverter()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "rates.bin")
+    
+    def test_round_trip(self):
+        """Test d'écriture puis de lecture d'un fichier de taux."""
+        xts = Currency("ZZZ", "Test Currency", "T", minor_unit=3)
+        stamp = datetime(2024, 5, 17, 9, 30, 12, 345678)
+        self.converter.add_exchange_rate(EUR, xts, Decimal('1') / Decimal('3'), stamp)
+        self.assertEqual(write_rate_snapshot(self.converter, self.path), 13)
+        
+        with RateSnapshotFile(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 13)
+            self.assertEqual(snapshot.get(EUR, USD).rate, Decimal('1.0850'))
+            self.assertIsNone(snapshot.get(USD, GBP))
+            
+            rate = snapshot.get(EUR, xts)
+            self.assertEqual(rate.rate, Decimal('0.333333333333333333'))
+            self.assertEqual(rate.timestamp, stamp)
+            self.assertEqual(rate.to_currency.minor_unit, 3)
+            
+            converter = CurrencyConverter()
+            snapshot.load_into(converter)
+            self.assertEqual(converter.get_exchange_rate(EUR, xts).rate, rate.rate)
+    
+    def test_older_snapshot_replaces_default_rates(self):
+        """Test du chargement d'un fichier plus ancien que les taux par défaut."""
+        self.converter.add_exchange_rate(EUR, USD, Decimal('1.5'), datetime(2024, 1, 1))
+        write_rate_snapshot(self.converter, self.path)
+        
+        converter = CurrencyConverter()
+        with RateSnapshotFile(self.path) as snapshot:
+            snapshot.load_into(converter)
+        self.assertEqual(converter.get_exchange_rate(EUR, USD).rate, Decimal('1.5'))
+        self.assertEqual(converter.convert(Money(100, EUR), USD), Money(150, USD))
+        self.assertEqual(converter.get_exchange_rate(EUR, GBP).rate, Decimal('0.8320'))
+    
+    def test_invalid_file(self):
+        """Test d'ouverture d'un fichier qui n'est pas un fichier de taux."""
+        with open(self.path, "wb") as handle:
+            handle.write(b"not a rate file at all")
+        with self.assertRaises(ValueError):
+            RateSnapshotFile(self.path)
+
+
+class TestRateCache(unittest.TestCase):
+    """Tests du cache des taux (durée de vie et LRU)."""
+    
+    def setUp(self):
+        """Configuration des tests."""
+        self.now = 0.0
+        self.cache = RateCache(max_entries=2, ttl=timedelta(seconds=60),
+                               clock=lambda: self.now)
+    
+    def test_ttl_per_entry(self):
+        """Test de l'expiration propre à chaque entrée."""
+        self.cache.put("EUR", {"USD": Decimal('1.08')})
+        self.now = 30.0
+        self.cache.put("USD", {"EUR": Decimal('0.92')})
+        self.now = 61.0
+        
+        self.assertIsNone(self.cache.get("EUR"))
+        self.assertEqual(self.cache.get("USD"), {"EUR": Decimal('0.92')})
+        self.assertEqual(self.cache.get_stale("EUR"), {"USD": Decimal('1.08')})
+        
+        info = self.cache.info()
+        self.assertEqual((info['hits'], info['misses'], info['stale_serves']), (1, 1, 1))
+        self.assertEqual(info['expired_entries'], 1)
+    
+    def test_lru_eviction(self):
+        """Test de l'éviction de l'entrée la moins récemment utilisée."""
+        self.cache.put("EUR", {})
+        self.cache.put("USD", {})
+        self.cache.get("EUR")
+        self.cache.put("GBP", {})
+        
+        self.assertEqual(self.cache.keys(), ["EUR", "GBP"])
+        self.assertEqual(self.cache.info()['evictions'], 1)
+    
+    def test_idle_times(self):
+        """Test du suivi de la dernière lecture, conservée au remplacement."""
+        self.cache.put("EUR", {})
+        self.now = 10.0
+        self.cache.get("EUR")
+        self.now = 30.0
+        self.cache.put("EUR", {"USD": Decimal('1.08')})
+        self.cache.put("USD", {})
+        self.now = 40.0
+        
+        self.assertEqual(self.cache.idle_times(), {"EUR": 30.0, "USD": 10.0})
+        self.assertEqual(self.cache.ages(), {"EUR": 10.0, "USD": 10.0})
+
+
+class TestSQLiteRateCache(unittest.TestCase):
+    """Tests du cache persistant partagé entre processus."""
+    
+    def setUp(self):
+        """Configuration des tests."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cache", "rates.sqlite3")
+        self.now = 1_700_000_000.0
+    
+    def _open(self, **options):
+        return SQLiteRateCache(self.path, ttl=timedelta(seconds=60),
+                               clock=lambda: self.now, **options)
+    
+    def test_shared_between_instances(self):
+        """Test du partage des taux et compteurs entre deux instances."""
+        self._open().put("EUR", {"USD": Decimal('1.0850')})
+        
+        other = self._open()
+        self.assertEqual(other.get("EUR"), {"USD": Decimal('1.0850')})
+        self.now += 61
+        self.assertIsNone(other.get("EUR"))
+        self.assertEqual(other.get_stale("EUR"), {"USD": Decimal('1.0850')})
+        
+        # Les lectures sont écrites par lots
+        other.flush()
+        info = self._open().info()
+        self.assertEqual(info['keys'], ["EUR"])
+        self.assertEqual((info['hits'], info['misses'], info['stale_serves']), (1, 1, 1))
+        
+        other.clear()
+        self.assertEqual(len(self._open()), 0)
+    
+    def test_lru_eviction_and_concurrent_writers(self):
+        """Test de l'éviction et d'écritures concurrentes."""
+        def write(code):
+            cache = self._open(max_entries=3)
+            for _ in range(5):
+                cache.put(code, {"EUR": Decimal('1')})
+                cache.get(code)
+        
+        threads = [threading.Thread(target=write, args=(code,))
+                   for code in ("USD", "GBP", "JPY", "CHF")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        info = self._open(max_entries=3).info()
+        self.assertEqual(info['entries'], 3)
+        self.assertGreaterEqual(info['evictions'], 1)
+    
+    def test_idle_times(self):
+        """Test du suivi de la dernière lecture, conservée au remplacement."""
+        cache = self._open()
+        cache.put("EUR", {})
+        self.now += 10
+        cache.get_stale("EUR")
+        self.now += 20
+        cache.put("EUR", {"USD": Decimal('1.08')})
+        self.now += 10
+        
+        self.assertEqual(cache.idle_times(), {"EUR": 30.0})
+        self.assertEqual(cache.ages(), {"EUR": 10.0})
+    
+    def test_reads_written_in_batches(self):
+        """Test des lectures accumulées puis écrites après flush_interval."""
+        cache = self._open(flush_interval=30)
+        cache.put("EUR", {"USD": Decimal('1.08')})
+        self.addCleanup(cache.close)
+        other = self._open()
+        self.addCleanup(other.close)
+        
+        with mock.patch.object(cache, '_transaction', wraps=cache._transaction) as transaction:
+            for _ in range(3):
+                self.now += 5
+                cache.get("EUR")
+            cache.get("GBP")
+            self.assertEqual(transaction.call_count, 0)
+            self.assertEqual(other.info()['hits'], 0)
+            self.assertEqual(other.idle_times(), {"EUR": 15.0})
+            
+            self.now += 20
+            cache.get("EUR")
+            self.assertEqual(transaction.call_count, 1)
+        info = other.info()
+        self.assertEqual((info['hits'], info['misses']), (4, 1))
+        self.assertEqual(other.idle_times(), {"EUR": 0.0})
+    
+    def test_connection_per_thread(self):
+        """Test de la réutilisation d'une connexion par thread."""
+        cache = self._open()
+        self.addCleanup(cache.close)
+        connection = cache._connection()
+        cache.put("EUR", {})
+        cache.get("EUR")
+        self.assertIs(cache._connection(), connection)
+        
+        other_thread = []
+        thread = threading.Thread(target=lambda: other_thread.append(cache._connection()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other_thread[0], connection)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Fournisseur local: statuts de server.statuses dans l'ordre, après server.delay."""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def do_GET(self):
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        self.server.clients.append(self.client_address)
+        time.sleep(self.server.delay)
+        body = json.dumps({'result': 'success', 'status': status,
+                           'rates': {'USD': 1.1}}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+
+def _start_stub_server(test_case):
+    """Démarre un fournisseur local, arrêté à la fin du test."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    server.statuses = []
+    server.clients = []
+    server.delay = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    test_case.addCleanup(server.server_close)
+    test_case.addCleanup(server.shutdown)
+    return server
+
+
+class TestHttpClient(unittest.TestCase):
+    """Tests du client HTTP contre un serveur local."""
+    
+    def setUp(self):
+        """Configuration des tests."""
+        self.server = _start_stub_server(self)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/latest"
+        self.delays = []
+        self.client = HttpClient(max_retries=2, sleep=self.delays.append)
+        self.addCleanup(self.client.close)
+    
+    def test_retries_then_succeeds(self):
+        """Test des nouvelles tentatives sur 503 avec attente bornée."""
+        self.server.statuses = [503, 503]
+        self.assertEqual(self.client.get_json(self.url)['status'], 200)
+        self.assertEqual(len(self.delays), 2)
+        self.assertTrue(0 <= self.delays[0] <= 0.25 and 0 <= self.delays[1] <= 0.5)
+    
+    def test_gives_up_after_max_retries(self):
+        """Test de l'abandon après max_retries et sans nouvelle tentative sur 404."""
+        self.server.statuses = [503, 503, 503]
+        with self.assertRaises(requests.HTTPError):
+            self.client.get_json(self.url)
+        self.assertEqual(len(self.server.clients), 3)
+        
+        self.server.statuses = [404]
+        with self.assertRaises(requests.HTTPError):
+            self.client.get_json(self.url)
+        self.assertEqual(len(self.server.clients), 4)
+    
+    def test_keep_alive_reuses_connection(self):
+        """Test de la réutilisation de la connexion entre les appels."""
+        for _ in range(3):
+            self.client.get_json(self.url)
+        self.assertEqual(len(set(self.server.clients)), 1)
+    
+    def test_read_timeout_not_retried(self):
+        """Test de l'abandon immédiat sur délai de réponse dépassé."""
+        client = HttpClient(max_retries=2, read_timeout=0.1, sleep=self.delays.append)
+        self.addCleanup(client.close)
+        self.server.delay = 0.3
+        with self.assertRaises(requests.ReadTimeout):
+            client.get_json(self.url)
+        self.assertEqual(len(self.server.clients), 1)
+        self.assertEqual(self.delays, [])
+    
+    def test_total_timeout_caps_retries(self):
+        """Test de l'abandon quand l'attente dépasserait total_timeout."""
+        now = [0.0]
+        
+        def sleep(delay):
+            self.delays.append(delay)
+            now[0] += 20
+        
+        client = HttpClient(max_retries=5, total_timeout=15, sleep=sleep, clock=lambda: now[0])
+        self.addCleanup(client.close)
+        self.server.statuses = [503, 503, 503]
+        with self.assertRaises(requests.HTTPError):
+            client.get_json(self.url)
+        self.assertEqual(len(self.server.clients), 2)
+        self.assertEqual(len(self.delays), 1)
+
+
+class TestExchangeRateAPI(unittest.TestCase):
+    """Tests du service de taux (APIs simulées)."""
+    
+    def setUp(self):
+        """Configuration des tests."""
+        self.now = 0.0
+        self.api = ExchangeRateAPI(cache=RateCache(ttl=timedelta(seconds=60),
+                                                   clock=lambda: self.now))
+        self.responses = [{'USD': Decimal('1.10')}]
+        self.fetches = []
+        self.api._fetch_from_api = self._fake_fetch
+    
+    def _fake_fetch(self, base_code):
+        self.fetches.append(base_code)
+        return self.responses.pop(0) if self.responses else None
+    
+    def test_cache_hit_and_stale_serve(self):
+        """Test du cache puis des taux périmés quand l'API échoue."""
+        self.assertEqual(self.api.get_single_rate(EUR, USD), Decimal('1.10'))
+        self.assertEqual(self.api.get_single_rate(EUR, USD), Decimal('1.10'))
+        self.assertEqual(self.fetches, ['EUR'])
+        
+        # Entrée expirée et API en échec: derniers taux connus
+        self.now = 120.0
+        self.assertEqual(self.api.get_single_rate(EUR, USD), Decimal('1.10'))
+        self.assertEqual(self.fetches, ['EUR', 'EUR'])
+        
+        info = self.api.get_cache_info()
+        self.assertEqual(info['keys'], ['EUR'])
+        self.assertEqual((info['hits'], info['misses'], info['stale_serves']), (1, 2, 1))
+    
+    def test_fallback_rates(self):
+        """Test des taux par défaut quand les APIs échouent, sans cache."""
+        self.responses = []
+        rates = self.api.get_exchange_rates(USD)
+        self.assertNotIn('USD', rates)
+        self.assertEqual(rates['GBP'], Decimal('0.8320') / Decimal('1.0850'))
+        self.assertEqual(self.api.get_exchange_rates(EUR)['USD'], Decimal('1.0850'))
+    
+    def _wait_for_refreshes(self, count):
+        deadline = time.monotonic() + 5
+        while (self.api.get_cache_info()['background_refresh']['refreshes'] < count
+               and time.monotonic() < deadline):
+            time.sleep(0.01)
+        self.assertEqual(self.api.get_cache_info()['background_refresh']['refreshes'], count)
+    
+    def test_background_refresh(self):
+        """Test de l'actualisation anticipée et des taux expirés servis sans attente."""
+        gate = threading.Event()
+        gate.set()
+        fetch = self._fake_fetch
+        
+        def gated_fetch(base_code):
+            gate.wait(5)
+            return fetch(base_code)
+        
+        self.api._fetch_from_api = gated_fetch
+        self.responses = [{'USD': Decimal('1.10')}, {'USD': Decimal('1.20')},
+                          {'USD': Decimal('1.30')}]
+        self.assertEqual(self.api.get_single_rate(EUR, USD), Decimal('1.10'))
+        
+        # À 80 % de la durée de validité: actualisation avant expiration
+        self.now = 50.0
+        self.api.start_background_refresh(interval=3600, refresh_ahead=0.8)
+        self.addCleanup(self.api.stop_background_refresh)
+        self._wait_for_refreshes(1)
+        self.assertEqual(self.api.get_single_rate(EUR, USD), Decimal('1.20'))
+        
+        # Entrée expirée, réseau bloqué: taux périmés servis immédiatement
+        gate.clear()
+        self.now = 200.0
+        self.assertEqual(self.api.get_single_rate(EUR, USD), Decimal('1.20'))
+        self.assertEqual(self.api.get_cache_info()['stale_keys'], ['EUR'])
+        
+        gate.set()
+        self._wait_for_refreshes(2)
+        self.assertEqual(self.api.get_single_rate(EUR, USD), Decimal('1.30'))
+        info = self.api.get_cache_info()
+        self.assertEqual(info['stale_keys'], [])
+        self.assertEqual(info['ages'], {'EUR': 0.0})
+    
+    def test_background_refresh_skips_idle_entries(self):
+        """Test de l'expiration des entrées qui ne sont plus lues."""
+        self.api.get_single_rate(EUR, USD)
+        self.api.start_background_refresh(interval=3600, refresh_ahead=0.8)
+        self.addCleanup(self.api.stop_background_refresh)
+        refresher = self.api._refresher
+        
+        self.now = 50.0
+        self.assertEqual(refresher._due(), {'EUR'})
+        self.api.cache.put('EUR', {'USD': Decimal('1.20')})
+        
+        # Actualisée mais plus lue depuis une durée de validité: laissée expirer
+        self.now = 100.0
+        self.assertEqual(refresher._due(), set())
+        
+        # Une nouvelle lecture la rend de nouveau éligible
+        self.assertEqual(self.api.get_single_rate(EUR, USD), Decimal('1.20'))
+        self.now = 140.0
+        self.assertEqual(refresher._due(), {'EUR'})
+
+
+class _StubProviders:
+    """Client HTTP simulé: comportement par fournisseur, appels enregistrés."""
+    
+    def __init__(self, behaviours):
+        self.behaviours = behaviours
+        self.calls = []
+        self.release = threading.Event()
+    
+    def get_json(self, url, cancel=None):
+        name = next(name for name in self.behaviours if name in url)
+        self.calls.append(name)
+        behaviour = self.behaviours[name]
+        if behaviour == 'hang':
+            self.release.wait(5)
+            return {}
+        if behaviour == 'fail':
+            raise requests.ConnectionError("refusée")
+        return {'result': 'success', 'success': True, 'rates': {'USD': behaviour}}
+
+
+class TestHedgedFetch(unittest.TestCase):
+    """Tests des requêtes couvertes vers plusieurs fournisseurs."""
+    
+    def _api(self, behaviours, hedge_delay):
+        self.http = _StubProviders(behaviours)
+        self.addCleanup(self.http.release.set)
+        return ExchangeRateAPI(api_key='key', http_client=self.http, hedge_delay=hedge_delay)
+    
+    def test_slow_primary_is_hedged(self):
+        """Test du lancement du fournisseur suivant après hedge_delay."""
+        api = self._api({'er-api': 'hang', 'fixer': 1.25, 'exchangerate.host': 1.5}, 0.05)
+        start = time.monotonic()
+        self.assertEqual(api._fetch_from_api('EUR'), {'USD': Decimal('1.25')})
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(self.http.calls, ['er-api', 'fixer'])
+    
+    def test_failure_launches_next_immediately(self):
+        """Test du passage au fournisseur suivant sur échec, sans attendre."""
+        api = self._api({'er-api': 'fail', 'fixer': 'fail', 'exchangerate.host': 1.5}, None)
+        with self.assertLogs('exchange_rate_api', 'WARNING') as logs:
+            self.assertEqual(api._fetch_from_api('EUR'), {'USD': Decimal('1.5')})
+        self.assertEqual(self.http.calls, ['er-api', 'fixer', 'exchangerate.host'])
+        self.assertEqual(len(logs.records), 2)
+        self.assertIn("Erreur avec l'API exchangerate-api", logs.output[0])
+        
+        api = self._api({'er-api': 'fail', 'fixer': 'fail', 'exchangerate.host': 'fail'}, None)
+        with self.assertLogs('exchange_rate_api', 'WARNING'), \
+                redirect_stdout(io.StringIO()) as out:
+            self.assertIsNone(api._fetch_from_api('EUR'))
+        # Le code de bibliothèque n'écrit pas sur la sortie standard
+        self.assertEqual(out.getvalue(), '')
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Tests du regroupement des requêtes simultanées d'une même base."""
+    
+    def setUp(self):
+        """Configuration des tests."""
+        self.server = _start_stub_server(self)
+        self.server.delay = 0.2
+        client = HttpClient(max_retries=0)
+        self.addCleanup(client.close)
+        self.api = ExchangeRateAPI(http_client=client, hedge_delay=None)
+        self.api.apis = [{
+            'name': 'exchangerate-api',
+            'url': f"http://127.0.0.1:{self.server.server_address[1]}/latest/{{base}}",
+            'requires_key': False
+        }]
+    
+    def _run_concurrently(self, count):
+        """Appelle get_single_rate(EUR, USD) depuis count threads à la fois."""
+        barrier = threading.Barrier(count)
+        results = []
+        
+        def worker():
+            barrier.wait()
+            try:
+                results.append(self.api.get_single_rate(EUR, USD))
+            except Exception as error:
+                results.append(error)
+        
+        threads = [threading.Thread(target=worker) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        return results
+    
+    def test_concurrent_misses_share_one_request(self):
+        """Test d'une seule requête pour 50 échecs de cache simultanés."""
+        results = self._run_concurrently(50)
+        self.assertEqual(results, [Decimal('1.1')] * 50)
+        self.assertEqual(len(self.server.clients), 1)
+        self.assertEqual(self.api.get_cache_info()['keys'], ['EUR'])
+    
+    def test_error_is_shared(self):
+        """Test de la transmission de l'erreur du premier appel aux autres."""
+        def failing_put(key, rates):
+            raise RuntimeError("cache indisponible")
+        
+        self.api.cache.put = failing_put
+        results = self._run_concurrently(10)
+        self.assertEqual(len(results), 10)
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(len(self.server.clients), 1)
+    
+    def test_late_leader_rechecks_cache(self):
+        """Test d'un appel devenu meneur après la fin de la requête précédente."""
+        self.server.delay = 0
+        self.assertEqual(self.api.get_single_rate(EUR, USD), Decimal('1.1'))
+        
+        # Échec de cache antérieur à la mise en cache: pas de nouvelle requête
+        self.assertEqual(self.api._refresh('EUR'), {'USD': Decimal('1.1')})
+        self.assertEqual(len(self.server.clients), 1)
+        
+        # L'actualisation forcée interroge toujours le fournisseur
+        self.api._refresh('EUR', force=True)
+        self.assertEqual(len(self.server.clients), 2)
+
+
+class TestProviderHealth(unittest.TestCase):
+    """Tests du suivi de santé et du disjoncteur des fournisseurs."""
+    
+    def setUp(self):
+        """Configuration des tests."""
+        self.now = 0.0
+        self.health = ProviderHealth(failure_threshold=2, cooldown=30, clock=lambda: self.now)
+    
+    def test_circuit_breaker_cycle(self):
+        """Test ouverture, essai unique en demi-ouvert, puis fermeture."""
+        self.health.record_failure()
+        self.assertEqual(self.health.state, CLOSED)
+        self.health.record_failure()
+        self.assertEqual(self.health.state, OPEN)
+        self.assertFalse(self.health.allow_request())
+        
+        self.now = 30.0
+        self.assertEqual(self.health.state, HALF_OPEN)
+        self.assertTrue(self.health.allow_request())
+        self.assertFalse(self.health.allow_request())
+        self.health.record_failure()
+        self.assertEqual(self.health.state, OPEN)
+        
+        self.now = 60.0
+        self.assertTrue(self.health.allow_request())
+        self.health.record_success(0.2)
+        self.assertEqual(self.health.state, CLOSED)
+        self.assertAlmostEqual(self.health.error_rate, 0.75)
+        self.assertEqual(self.health.rank(), (0, 0.2 / 0.25))
+
+
+class TestAdaptiveProviderOrder(unittest.TestCase):
+    """Tests de l'ordre d'interrogation des fournisseurs selon leur santé."""
+    
+    def setUp(self):
+        """Configuration des tests."""
+        self.now = 0.0
+        self.http = _StubProviders({'er-api': 'fail', 'fixer': 'fail', 'exchangerate.host': 1.5})
+        self.api = ExchangeRateAPI(api_key='key', http_client=self.http, hedge_delay=None)
+        for api in self.api.apis:
+            self.api.provider_health[api['name']] = ProviderHealth(
+                failure_threshold=2, cooldown=30, clock=lambda: self.now
+            )
+    
+    def _fetch(self):
+        self.http.calls = []
+        return self.api._fetch_from_api('EUR')
+    
+    def test_healthy_provider_first_and_dead_ones_skipped(self):
+        """Test du classement mesuré et des disjoncteurs ouverts ignorés."""
+        self.assertEqual(self._fetch(), {'USD': Decimal('1.5')})
+        self.assertEqual(self.http.calls, ['er-api', 'fixer', 'exchangerate.host'])
+        
+        # Le fournisseur mesuré sain passe en tête
+        self.assertEqual(self._fetch(), {'USD': Decimal('1.5')})
+        self.assertEqual(self.http.calls, ['exchangerate.host'])
+        
+        # Tous en échec: les disjoncteurs s'ouvrent, plus aucune requête
+        self.http.behaviours['exchangerate.host'] = 'fail'
+        self.assertIsNone(self._fetch())
+        self.assertEqual(self.http.calls, ['exchangerate.host', 'er-api', 'fixer'])
+        self.assertIsNone(self._fetch())
+        self.assertEqual(self.http.calls, ['exchangerate.host'])
+        self.assertIsNone(self._fetch())
+        self.assertEqual(self.http.calls, [])
+        
+        # Après la période d'ouverture: une requête d'essai par fournisseur
+        self.now = 30.0
+        self.http.behaviours['er-api'] = 1.1
+        self.assertEqual(self._fetch(), {'USD': Decimal('1.1')})
+        self.assertEqual(self.http.calls, ['exchangerate.host', 'er-api'])
+        providers = self.api.get_provider_info()
+        self.assertEqual(list(providers), ['exchangerate-api', 'fixer', 'exchangerate-host'])
+        self.assertEqual([info['state'] for info in providers.values()],
+                         [CLOSED, HALF_OPEN, OPEN])
+
+
+class TestSingleBaseMode(unittest.TestCase):
+    """Tests du mode pivot unique du service de taux."""
+    
+    def setUp(self):
+        """Configuration des tests."""
+        self.api = ExchangeRateAPI(single_base="EUR")
+        self.fetches = []
+        self.api._fetch_from_api = self._fake_fetch
+    
+    def _fake_fetch(self, base_code):
+        self.fetches.append(base_code)
+        return {'EUR': Decimal('1'), 'USD': Decimal('1.0850'), 'GBP': Decimal('0.8320')}
+    
+    def test_one_fetch_for_every_base(self):
+        """Test du calcul local des taux de toutes les bases."""
+        self.assertEqual(self.api.get_single_rate(GBP, USD), Decimal('1.30408653846'))
+        self.assertEqual(self.api.get_single_rate(USD, EUR), Decimal('0.921658986175'))
+        self.assertEqual(self.api.get_single_rate(EUR, GBP), Decimal('0.8320'))
+        
+        self.assertEqual(self.fetches, ['EUR'])
+        self.assertEqual(sorted(self.api.get_cache_info()['keys']), ['EUR', 'GBP', 'USD'])
+    
+    def test_late_leader_rechecks_cache(self):
+        """Test d'un appel devenu meneur après la requête au pivot."""
+        self.api.get_single_rate(EUR, GBP)
+        self.assertEqual(self.api._refresh('USD')['GBP'], Decimal('0.766820276498'))
+        self.assertEqual(self.fetches, ['EUR'])
+
+
+class TestEnhancedCurrencyConverter(unittest.TestCase):
+    """Tests du convertisseur en temps réel (API simulée)."""
+    
+    def setUp(self):
+        """Configuration des tests."""
+        self.converter = EnhancedCurrencyConverter()
+        self.api = self.converter.api_service
+        self.fetches = []
+        self.api._fetch_from_api = self._fake_fetch
+        self.usd_rate = Decimal('1.10')
+    
+    def _fake_fetch(self, base_code):
+        self.fetches.append(base_code)
+        return {'USD': self.usd_rate, 'EUR': Decimal('1')}
+    
+    def test_pair_converter_rebinds_on_refresh(self):
+        """Test du convertisseur de paire suivant le cache de l'API."""
+        eur_to_usd = self.converter.pair(EUR, USD)
+        self.assertEqual(eur_to_usd(Money(10, EUR)), Money(11, USD))
+        self.assertEqual(eur_to_usd(Money(20, EUR)), Money(22, USD))
+        self.assertEqual(self.fetches, ['EUR'])
+        
+        self.usd_rate = Decimal('1.20')
+        self.converter.clear_cache()
+        self.assertEqual(eur_to_usd(Money(10, EUR)), Money(12, USD))
+        self.assertEqual(self.fetches, ['EUR', 'EUR'])
+    
+    def test_convert_without_cache_keeps_shared_cache(self):
+        """Test d'une conversion sans cache: requête forcée, cache conservé."""
+        self.converter.convert(Money(10, USD), EUR)
+        self.converter.convert(Money(10, EUR), USD)
+        
+        self.usd_rate = Decimal('1.20')
+        self.assertEqual(self.converter.convert(Money(10, EUR), USD, use_cached=False),
+                         Money(12, USD))
+        self.assertEqual(self.fetches, ['USD', 'EUR', 'EUR'])
+        # Les taux des autres devises restent en cache
+        self.assertEqual(self.api.cache.keys(), ['USD', 'EUR'])
+        self.converter.convert(Money(10, USD), EUR)
+        self.assertEqual(self.fetches, ['USD', 'EUR', 'EUR'])
+
+
 class TestIntegration(unittest.TestCase):
     """Tests d'intégration du système complet."""
     